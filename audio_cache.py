@@ -0,0 +1,224 @@
+"""Size-capped on-disk cache of played tracks as Opus files."""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+from config import (
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_MAX_BYTES,
+    AUDIO_CACHE_MAX_TRACK_SECONDS,
+    AUDIO_CACHE_CONCURRENCY,
+    AUDIO_CACHE_BITRATE,
+)
+from extraction_cache import canonical_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".opus"
+PARTIAL_SUFFIX = ".part"
+
+FFMPEG_EXECUTABLE = "ffmpeg"
+
+
+class AudioCache:
+    """
+    Stores played tracks as local Opus files so later plays skip YouTube entirely.
+
+    A track is transcoded in the background by a separate FFmpeg process the
+    first time it plays (stream-copied if the source is already Opus). Files
+    are named by the track's canonical video ID. Total size stays under
+    max_bytes by evicting the least recently played files, and play order
+    survives restarts through file modification times.
+    """
+
+    def __init__(
+        self,
+        directory: str = AUDIO_CACHE_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        max_track_seconds: int = AUDIO_CACHE_MAX_TRACK_SECONDS,
+        concurrency: int = AUDIO_CACHE_CONCURRENCY
+    ):
+        """
+        Initialize the cache and index files already on disk.
+
+        Args:
+            directory: Directory for cached files
+            max_bytes: Total size cap
+            max_track_seconds: Longer tracks (and live streams) are not cached
+            concurrency: Maximum tracks transcoded at once
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_track_seconds = max_track_seconds
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._files: OrderedDict = OrderedDict()  # filename -> size, least recently played first
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.stored = 0
+        self.evictions = 0
+        self.failures = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Index cached files by last play time and remove leftovers of interrupted transcodes."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(PARTIAL_SUFFIX):
+                os.remove(entry.path)
+            elif entry.name.endswith(CACHE_SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._files[name] = size
+            self.total_bytes += size
+        self._evict()
+        logger.info(f"Audio cache: {len(self._files)} track(s), {self.total_bytes / 2**20:.0f} MiB in {self.directory}")
+
+    def _filename(self, url: str) -> Optional[str]:
+        key = canonical_key(url)
+        return hashlib.sha1(key.encode()).hexdigest() + CACHE_SUFFIX if key else None
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        Get the local file for a track.
+
+        Args:
+            url: Track URL
+
+        Returns:
+            Path of the cached Opus file, or None if the track isn't cached
+        """
+        name = self._filename(url)
+        size = self._files.get(name) if name else None
+        if size is None:
+            self.misses += 1
+            return None
+
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)  # Persist play order for the next start
+        except FileNotFoundError:
+            self._files.pop(name)
+            self.total_bytes -= size
+            self.misses += 1
+            return None
+        self._files.move_to_end(name)
+        self.hits += 1
+        self.bytes_saved += size
+        return path
+
+    def populate(self, url: str, info: Dict[str, Any]) -> None:
+        """
+        Cache a track in the background if it's eligible and not cached yet.
+
+        Args:
+            url: Track URL
+            info: Its extraction info ('url' is the stream URL)
+        """
+        name = self._filename(url)
+        duration = info.get('duration')
+        if not name or name in self._files or name in self._pending or not info.get('url'):
+            return
+        if not duration or duration > self.max_track_seconds:
+            return  # Live streams and very long tracks
+        self._pending.add(name)
+        task = asyncio.create_task(self._transcode(name, info['url'], info.get('acodec'), duration))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _transcode(self, name: str, stream_url: str, acodec: Optional[str], duration: float) -> None:
+        """Fetch a stream into a cached Opus file (FFmpeg runs as a separate process)."""
+        path = os.path.join(self.directory, name)
+        partial = path + PARTIAL_SUFFIX
+        codec = ['-c:a', 'copy'] if acodec == 'opus' else ['-c:a', 'libopus', '-b:a', AUDIO_CACHE_BITRATE]
+        args = [
+            FFMPEG_EXECUTABLE, '-nostdin', '-loglevel', 'error',
+            '-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5',
+            '-i', stream_url, '-vn', '-map_metadata', '-1', *codec, '-f', 'opus', partial,
+        ]
+        process = None
+        try:
+            async with self._semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+                )
+                # Generous: fetching is normally much faster than real time
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=max(120, duration * 2))
+            if process.returncode != 0:
+                raise RuntimeError(stderr.decode(errors='replace').strip()[-200:] or f"exit {process.returncode}")
+            size = os.path.getsize(partial)
+            os.replace(partial, path)
+        except asyncio.CancelledError:
+            if process and process.returncode is None:
+                process.kill()
+            self._remove(partial)
+            raise
+        except Exception as e:
+            if process and process.returncode is None:
+                process.kill()
+            self._remove(partial)
+            self.failures += 1
+            logger.warning(f"Failed to cache audio {name}: {e}")
+            return
+        finally:
+            self._pending.discard(name)
+
+        self._files[name] = size
+        self.total_bytes += size
+        self.stored += 1
+        logger.debug(f"Cached audio {name} ({size / 2**20:.1f} MiB)")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently played files until the cache fits its size cap."""
+        while self.total_bytes > self.max_bytes and self._files:
+            name, size = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            # Unlinking is safe even if the file is playing right now
+            self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Cancel in-progress transcodes (their partial files are removed)."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with cached tracks and bytes, hits, misses, hit rate, bytes not
+            re-fetched thanks to hits, tracks stored, evictions, failed transcodes
+            and transcodes in progress
+        """
+        lookups = self.hits + self.misses
+        return {
+            "tracks": len(self._files),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "failures": self.failures,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,93 @@
+"""Benchmark: per-thread memory footprint of conversation history.
+
+Compares the original representation (a list of {"role", "content"} dicts per
+thread) with ThreadHistory ring buffers, with and without cold compression.
+
+Usage: python benchmarks/context_memory.py [--channels 10000] [--messages 12]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from message_store import ThreadHistory, get_compressor  # noqa: E402
+
+WORDS = (
+    "anna the bot queue play reminder song tonight lol what why how is are was "
+    "music channel server please thanks okay sure maybe later tomorrow meeting"
+).split()
+
+
+def make_history(rng: random.Random, messages: int) -> list:
+    """Generate one thread's history with chat-sized messages."""
+    history = []
+    for i in range(messages):
+        length = rng.randint(4, 60)
+        history.append({
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": " ".join(rng.choice(WORDS) for _ in range(length)),
+        })
+    return history
+
+
+def measure(build) -> int:
+    """Return bytes allocated by build() and still alive afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # Round-trip through JSON like a real load, so every string is a distinct object
+    raw = json.loads(json.dumps({
+        str(1_000_000_000_000_000 + i): make_history(rng, args.messages)
+        for i in range(args.channels)
+    }))
+    payload = json.dumps(raw)
+
+    def dict_lists():
+        return json.loads(payload)
+
+    def ring_buffers():
+        return {tid: ThreadHistory(args.messages, msgs) for tid, msgs in json.loads(payload).items()}
+
+    def ring_buffers_packed():
+        compressor = get_compressor("zlib")
+        contexts = ring_buffers()
+        for history in contexts.values():
+            history.pack(compressor)
+        return contexts
+
+    print(f"{args.channels} channels x {args.messages} messages")
+    print(f"{'representation':<28}{'total MiB':>12}{'bytes/thread':>16}")
+    baseline = None
+    for name, build in (
+        ("list of dicts (before)", dict_lists),
+        ("ring buffer + slots", ring_buffers),
+        ("ring buffer, zlib packed", ring_buffers_packed),
+    ):
+        total = measure(build)
+        per_thread = total / args.channels
+        baseline = baseline or per_thread
+        print(f"{name:<28}{total / 2**20:>12.1f}{per_thread:>16.0f}  ({per_thread / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
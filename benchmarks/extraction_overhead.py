@@ -0,0 +1,113 @@
+"""Benchmark: per-extraction overhead of a fresh YoutubeDL per call vs pooled instances.
+
+Runs the same lookups --rounds times each way with the bot's YDL_OPTIONS:
+  fresh    with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl: ydl.extract_info(...)
+  pooled   the same extraction on an instance borrowed from YoutubeDLPool
+
+Lookups are the --url and --search arguments (searches become ytsearch1:
+queries), which need network access. With --local, a tiny audio file is
+served over HTTP on 127.0.0.1 instead and search lookups are skipped, which
+isolates yt-dlp's own setup cost from network latency.
+
+Usage: python benchmarks/extraction_overhead.py [--rounds 10] [--url URL ...] [--search TERMS ...]
+       python benchmarks/extraction_overhead.py --local [--rounds 50]
+"""
+
+import argparse
+import http.server
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import yt_dlp  # noqa: E402
+from music_manager import YDL_OPTIONS  # noqa: E402
+from youtube_dl_pool import YoutubeDLPool  # noqa: E402
+
+DEFAULT_URLS = ["https://www.youtube.com/watch?v=dQw4w9WgXcQ"]
+DEFAULT_SEARCHES = ["aespa whiplash"]
+
+
+def serve_local_file() -> str:
+    """Serve a small MP3 on 127.0.0.1 and return its URL."""
+    directory = tempfile.mkdtemp(prefix="extraction-bench-")
+    with open(os.path.join(directory, "track.mp3"), "wb") as f:
+        f.write(b"ID3" + b"\0" * 8192)
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, as real CDNs do
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            pass  # Clients closing kept-alive connections
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/track.mp3"
+
+
+def time_lookups(extract, lookup: str, rounds: int) -> list:
+    """Milliseconds per extraction, after one untimed warm-up call."""
+    extract(lookup)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        extract(lookup)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--url", action="append", help="URL to extract (repeatable)")
+    parser.add_argument("--search", action="append", help="search terms for ytsearch1: (repeatable)")
+    parser.add_argument("--local", action="store_true", help="extract a file served on 127.0.0.1; no network needed")
+    args = parser.parse_args()
+
+    options = {**YDL_OPTIONS, 'socket_timeout': 15}
+    if args.local:
+        lookups = [("url", serve_local_file())]
+    else:
+        lookups = [("url", url) for url in args.url or DEFAULT_URLS]
+        lookups += [("ytsearch1", f"ytsearch1:{terms}") for terms in args.search or DEFAULT_SEARCHES]
+
+    def fresh(lookup):
+        with yt_dlp.YoutubeDL(options) as ydl:
+            return ydl.extract_info(lookup, download=False)
+
+    pool = YoutubeDLPool(options)
+
+    def pooled(lookup):
+        with pool.acquire() as ydl:
+            return ydl.extract_info(lookup, download=False)
+
+    print(f"{args.rounds} extraction(s) per lookup and mode\n")
+    print(f"{'kind':<11}{'mode':<8}{'mean ms':>10}{'p50 ms':>10}{'min ms':>10}  lookup")
+    for kind, lookup in lookups:
+        for mode, extract in (("fresh", fresh), ("pooled", pooled)):
+            try:
+                samples = time_lookups(extract, lookup, args.rounds)
+            except yt_dlp.utils.DownloadError as e:
+                print(f"{kind:<11}{mode:<8}{'failed':>10}  {lookup} ({str(e).splitlines()[0][:80]})")
+                break
+            print(
+                f"{kind:<11}{mode:<8}{statistics.mean(samples):>10.1f}{statistics.median(samples):>10.1f}"
+                f"{min(samples):>10.1f}  {lookup}"
+            )
+    print(f"\npool: {pool.get_stats()}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
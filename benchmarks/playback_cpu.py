@@ -0,0 +1,124 @@
+"""Benchmark: CPU cost per playing stream for each playback mode.
+
+Generates --seconds of stereo audio as WebM/Opus (the format YouTube serves
+for bestaudio), then plays it through each mode as fast as possible,
+encoding frames the way discord.py's player thread does for non-Opus
+sources:
+  pcm+norm   FFmpegPCMAudio with dynaudnorm (the previous default)
+  pcm+gain   FFmpegPCMAudio with a measured static gain
+  pcm        FFmpegPCMAudio, no normalization
+  opus+norm  FFmpegOpusAudio with dynaudnorm (FFmpeg encodes)
+  opus+gain  FFmpegOpusAudio with a measured static gain (FFmpeg encodes)
+  copy       FFmpegOpusAudio passthrough (no decode, no encode; also used
+             when the measured gain is negligible)
+
+CPU is split into the bot process (reading frames plus Opus encoding) and
+FFmpeg (child process). The last column is how many real-time streams the
+1.5-CPU container limit could sustain at that cost.
+
+Requires ffmpeg on PATH and libopus loadable by discord.py.
+
+Usage: python benchmarks/playback_cpu.py [--seconds 120] [--cpus 1.5]
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import discord  # noqa: E402
+from music_manager import create_audio_source  # noqa: E402
+
+MODES = [
+    # name, mode, normalize, measured gain (None: realtime dynaudnorm)
+    ("pcm+norm", "pcm", True, None),
+    ("pcm+gain", "pcm", True, 4.0),
+    ("pcm", "pcm", False, None),
+    ("opus+norm", "opus", True, None),
+    ("opus+gain", "opus", True, 4.0),
+    ("copy", "opus", False, None),
+]
+
+
+def make_input(seconds: int, directory: str) -> str:
+    """Write pink noise as WebM/Opus; noise keeps the encoder honest compared to a pure tone."""
+    path = os.path.join(directory, "input.webm")
+    subprocess.run([
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"anoisesrc=d={seconds}:c=pink:a=0.3",
+        "-ac", "2", "-ar", "48000", "-c:a", "libopus", "-b:a", "128k", path,
+    ], check=True)
+    return path
+
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_mode(path: str, mode: str, normalize: bool, gain_db, encoder: discord.opus.Encoder):
+    """Play a file through one mode; return (frames, bot CPU s, FFmpeg CPU s, wall s)."""
+    ffmpeg_before = children_cpu()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    source, _ = create_audio_source(path, acodec="opus", local=True, mode=mode, normalize=normalize, gain_db=gain_db)
+    frames = 0
+    # The player thread encodes only non-Opus sources (VoiceClient.send_audio_packet)
+    encode = not source.is_opus()
+    while data := source.read():
+        if encode:
+            encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+        frames += 1
+    source.cleanup()  # Reaps FFmpeg so its CPU time is counted
+
+    return (
+        frames,
+        time.process_time() - cpu_before,
+        children_cpu() - ffmpeg_before,
+        time.perf_counter() - wall_before,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=120, help="length of the test track")
+    parser.add_argument("--cpus", type=float, default=1.5, help="CPU limit to size stream capacity against")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg"):
+        raise SystemExit("ffmpeg not found on PATH")
+    discord.opus._load_default()
+    if not discord.opus.is_loaded():
+        raise SystemExit("libopus not found (discord.py can't load it)")
+
+    directory = tempfile.mkdtemp(prefix="playback-cpu-")
+    try:
+        path = make_input(args.seconds, directory)
+        encoder = discord.opus.Encoder()
+
+        print(f"{args.seconds}s track, CPU seconds per minute of audio\n")
+        print(f"{'mode':<11}{'bot':>8}{'ffmpeg':>8}{'total':>8}{'% core':>8}{'streams':>9}{'frames':>8}")
+        for name, mode, normalize, gain_db in MODES:
+            frames, bot, ffmpeg, _ = run_mode(path, mode, normalize, gain_db, encoder)
+            audio_minutes = frames * 0.02 / 60
+            bot_per_min = bot / audio_minutes
+            ffmpeg_per_min = ffmpeg / audio_minutes
+            total = bot_per_min + ffmpeg_per_min
+            core_share = total / 60  # Fraction of one core per real-time stream
+            print(
+                f"{name:<11}{bot_per_min:>8.2f}{ffmpeg_per_min:>8.2f}{total:>8.2f}"
+                f"{core_share * 100:>7.1f}%{args.cpus / core_share:>9.0f}{frames:>8}"
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
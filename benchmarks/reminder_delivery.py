@@ -0,0 +1,122 @@
+"""Benchmark: delivering a burst of reminders that all come due at once.
+
+Compares the old loop (send each reminder in turn, remove_reminder() after
+each one, each removal rewriting the whole reminders file) with batched
+delivery (one message per channel, bounded concurrency, one
+complete_reminders() per tick). Channels are fakes whose send() sleeps for
+--latency-ms to stand in for a Discord round trip.
+
+The per-reminder loop is quadratic in file writes, so it runs on
+--legacy-count reminders rather than the full burst.
+
+Usage: python benchmarks/reminder_delivery.py [--reminders 10000] [--channels 200] [--latency-ms 2]
+                                              [--legacy-count 1000] [--backend json|sqlite]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from persistence_writer import get_persistence_writer  # noqa: E402
+from reminder_delivery import deliver_reminders, format_reminder  # noqa: E402
+from reminder_manager import Reminder, ReminderManager  # noqa: E402
+from sqlite_reminder_manager import SQLiteReminderManager  # noqa: E402
+
+
+class FakeChannel:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.sent = 0
+
+    async def send(self, content: str) -> None:
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+
+
+def make_manager(backend: str, workdir: str, count: int, channels: int):
+    json_file = os.path.join(workdir, "reminders.json")
+    if backend == "sqlite":
+        manager = SQLiteReminderManager(os.path.join(workdir, "reminders.db"), json_file)
+    else:
+        manager = ReminderManager(json_file)
+    rng = random.Random(42)
+    now = time.time()
+    reminders = [
+        Reminder(str(uuid.UUID(int=rng.getrandbits(128))), rng.randrange(10**17, 10**18),
+                 rng.randrange(channels), "event starts", now - 1, now - 3600)
+        for _ in range(count)
+    ]
+    # Bulk-load directly: add_reminder() one at a time is not what is being measured
+    if backend == "sqlite":
+        with manager.db:
+            manager.db.execute("BEGIN")
+            manager.db.executemany(
+                "INSERT INTO reminders (id, user_id, channel_id, message, due_time, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r.id, r.user_id, r.channel_id, r.message, r.due_time, r.created_at) for r in reminders]
+            )
+    else:
+        manager.reminders = {r.id: r for r in reminders}
+        manager._rebuild_schedule()
+        manager.save()
+    get_persistence_writer().flush()
+    return manager
+
+
+async def legacy_delivery(manager, channels, due):
+    for reminder in due:
+        await channels[reminder.channel_id].send(format_reminder(reminder))
+        manager.remove_reminder(reminder.id)
+
+
+def run(label: str, backend: str, count: int, args, batched: bool) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        manager = make_manager(backend, workdir, count, args.channels)
+        channels = {i: FakeChannel(args.latency_ms / 1000) for i in range(args.channels)}
+        due = manager.get_due_reminders()
+        assert len(due) == count
+
+        writer = get_persistence_writer()
+        writes_before = writer.get_stats()["writes"]
+        start = time.perf_counter()
+        if batched:
+            asyncio.run(deliver_reminders(due, channels.get, manager, concurrency=args.concurrency))
+        else:
+            asyncio.run(legacy_delivery(manager, channels, due))
+        writer.flush()
+        elapsed = time.perf_counter() - start
+
+        assert manager.get_reminder_count() == 0
+        messages = sum(c.sent for c in channels.values())
+        writes = writer.get_stats()["writes"] - writes_before
+        print(f"{label:<28}{count:>10}{elapsed:>10.2f}{messages:>10}{writes:>8}")
+        manager.close()
+        writer.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=10000)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--legacy-count", type=int, default=1000)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    args = parser.parse_args()
+
+    print(f"backend={args.backend} channels={args.channels} latency={args.latency_ms}ms\n")
+    print(f"{'strategy':<28}{'reminders':>10}{'seconds':>10}{'messages':>10}{'writes':>8}")
+    run("per-reminder (legacy)", args.backend, args.legacy_count, args, batched=False)
+    run("batched", args.backend, args.legacy_count, args, batched=True)
+    run("batched", args.backend, args.reminders, args, batched=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Benchmark: heap vs timing-wheel reminder scheduling at very large volumes.
+
+Loads --reminders reminders spread uniformly over the next year (the
+REMINDER_MAX_TIME_SECONDS limit) into each backend, then measures:
+  insert   add_reminder() on a full manager
+  cancel   remove_reminder() of random pending reminders
+  tick     get_due_reminders() as a simulated clock advances one second at a
+           time through --tick-hours, including bucket promotions (wheel)
+  memory   resident set growth for holding the reminders
+
+Each backend runs in its own subprocess so memory numbers don't interfere.
+The clock is simulated, so a day of ticks runs in seconds.
+
+Usage: python benchmarks/reminder_wheel.py [--reminders 1000000] [--users 50000] [--channels 5000]
+                                           [--tick-hours 24] [--backend heap|wheel]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import reminder_manager  # noqa: E402
+import wheel_reminder_manager  # noqa: E402
+from persistence_writer import get_persistence_writer  # noqa: E402
+from reminder_manager import Reminder, ReminderManager  # noqa: E402
+from wheel_reminder_manager import WheelReminderManager  # noqa: E402
+
+YEAR = 365 * 86400
+
+
+class FakeClock:
+    """Stands in for the managers' wall clock."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def timestamp(self) -> float:
+        return self.now
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def install_clock(clock: FakeClock) -> None:
+    wheel_reminder_manager._now = clock.timestamp
+
+    class FakeDatetime:
+        @staticmethod
+        def now(tz=None):
+            return clock
+
+    reminder_manager.datetime = FakeDatetime
+
+
+def make_reminders(rng: random.Random, args, start: float):
+    users = [rng.randrange(10**17, 10**18) for _ in range(args.users)]
+    channels = [rng.randrange(10**17, 10**18) for _ in range(args.channels)]
+    for _ in range(args.reminders):
+        yield Reminder(
+            str(uuid.UUID(int=rng.getrandbits(128))), rng.choice(users), rng.choice(channels),
+            "check on the thing", start + rng.uniform(60, YEAR), start
+        )
+
+
+def timed(fn, count: int) -> float:
+    """Microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(backend: str, args) -> None:
+    rng = random.Random(42)
+    clock = FakeClock(1_800_000_000.0)
+    install_clock(clock)
+    workdir = tempfile.mkdtemp(prefix="reminder-wheel-")
+    reminders_file = os.path.join(workdir, "reminders.json")
+    writer = get_persistence_writer()
+
+    base_rss = rss_mib()
+    load_start = time.perf_counter()
+    if backend == "heap":
+        manager = ReminderManager(reminders_file)
+        manager.reminders = {r.id: r for r in make_reminders(rng, args, clock.now)}
+        for reminder in manager.reminders.values():
+            manager._index(reminder)
+        manager._rebuild_schedule()
+    else:
+        manager = WheelReminderManager(reminders_file, os.path.join(workdir, "cold"))
+        for r in make_reminders(rng, args, clock.now):
+            manager.add_reminder(r.user_id, r.channel_id, r.message, r.due_time)
+    load_seconds = time.perf_counter() - load_start
+    memory = rss_mib() - base_rss
+    print(f"[{backend}] loaded {manager.get_reminder_count()} reminders in {load_seconds:.1f}s")
+
+    # Full-file saves make heap inserts and cancels expensive, so sample fewer of them
+    samples = args.samples if backend == "wheel" else max(1, args.samples // 1000)
+
+    inserted = []
+
+    def insert():
+        inserted.append(manager.add_reminder(1, 1, "bench", clock.now + rng.uniform(60, YEAR)))
+
+    insert_us = timed(insert, samples)
+    writer.flush()
+
+    cancelled = iter(inserted)
+
+    def cancel():
+        reminder = next(cancelled)
+        manager.remove_reminder(reminder.id, reminder.due_time)
+
+    cancel_us = timed(cancel, samples)
+    writer.flush()
+
+    delivered = 0
+    worst_tick = 0.0
+    tick_start = time.perf_counter()
+    ticks = int(args.tick_hours * 3600)
+    for _ in range(ticks):
+        clock.now += 1
+        start = time.perf_counter()
+        due = manager.get_due_reminders()
+        worst_tick = max(worst_tick, time.perf_counter() - start)
+        delivered += len(due)
+        for reminder in due:
+            manager._discard(reminder.id)
+    tick_us = (time.perf_counter() - tick_start) / ticks * 1e6
+
+    print(
+        f"{backend:<8}{insert_us:>12.1f}{cancel_us:>12.1f}{tick_us:>12.1f}{worst_tick * 1e3:>14.1f}"
+        f"{memory:>12.0f}{delivered:>11}"
+    )
+    writer.flush()
+    shutil.rmtree(workdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=2000, help="inserts/cancels to time (heap uses 1/1000)")
+    parser.add_argument("--tick-hours", type=float, default=24)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--backend", choices=["heap", "wheel"])
+    args = parser.parse_args()
+
+    if args.backend:
+        run(args.backend, args)
+        return
+
+    print(f"{args.reminders} reminders from {args.users} users in {args.channels} channels over one year, "
+          f"{args.tick_hours}h of 1s ticks\n")
+    print(f"{'backend':<8}{'insert us':>12}{'cancel us':>12}{'tick us':>12}{'worst tick ms':>14}"
+          f"{'RSS MiB':>12}{'delivered':>11}")
+    for backend in ("wheel", "heap"):
+        subprocess.run([sys.executable, __file__, "--backend", backend] + sys.argv[1:], check=True)
+
+
+if __name__ == "__main__":
+    main()
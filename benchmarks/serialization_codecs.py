@@ -0,0 +1,98 @@
+"""Benchmark: persistence codecs on realistic context and reminder files.
+
+Compares every installed codec (stdlib json, orjson, msgspec, MessagePack),
+pretty-printed and compact, on encode time, decode time and file size.
+
+Usage: python benchmarks/serialization_codecs.py [--threads 2000] [--reminders 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from serialization import available_codecs  # noqa: E402
+
+WORDS = (
+    "anna the bot queue play reminder song tonight lol what why how is are was "
+    "music channel server please thanks okay sure maybe later tomorrow meeting"
+).split()
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def make_contexts(rng: random.Random, threads: int) -> dict:
+    """thread_context.json: 12 messages per thread."""
+    return {
+        str(rng.randrange(10**17, 10**18)): [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": sentence(rng, 4, 60)}
+            for i in range(12)
+        ]
+        for _ in range(threads)
+    }
+
+
+def make_reminders(rng: random.Random, count: int) -> list:
+    """reminders.json: one dict per pending reminder."""
+    now = time.time()
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "user_id": rng.randrange(10**17, 10**18),
+            "channel_id": rng.randrange(10**17, 10**18),
+            "message": sentence(rng, 2, 12),
+            "due_time": now + rng.uniform(10, 365 * 86400),
+            "created_at": now,
+        }
+        for _ in range(count)
+    ]
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=2000)
+    parser.add_argument("--reminders", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    datasets = {
+        f"context ({args.threads} threads)": make_contexts(rng, args.threads),
+        f"reminders ({args.reminders})": make_reminders(rng, args.reminders),
+    }
+
+    codecs = []
+    for name, cls in available_codecs().items():
+        if cls.binary:
+            codecs.append((name, cls()))
+        else:
+            codecs.append((f"{name} indent=2", cls(compact=False)))
+            codecs.append((f"{name} compact", cls(compact=True)))
+
+    for label, data in datasets.items():
+        print(f"\n{label}")
+        print(f"{'codec':<22}{'encode ms':>11}{'decode ms':>11}{'size KiB':>11}")
+        for name, codec in codecs:
+            raw = codec.dumps(data)
+            encode = best_of(args.repeat, lambda: codec.dumps(data))
+            decode = best_of(args.repeat, lambda: codec.loads(raw))
+            print(f"{name:<22}{encode * 1000:>11.1f}{decode * 1000:>11.1f}{len(raw) / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
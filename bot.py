@@ -7,9 +7,13 @@ import signal
 from dotenv import load_dotenv
 import os
 from message_handler import MessageHandler
-from reminder_manager import ReminderManager
+from reminder_manager import create_reminder_manager
+from reminder_scheduler import ReminderScheduler
+from reminder_delivery import catch_up_reminders, deliver_reminders
+from reminder_ingest import ReminderIngestServer
 from music_manager import MusicManager
-from config import ANNA_ROLE_IDS, REMINDER_CHECK_INTERVAL_SECONDS
+from persistence_writer import get_persistence_writer
+from config import ANNA_ROLE_IDS, PERSISTENCE_SHUTDOWN_TIMEOUT_SECONDS
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +37,7 @@ client = discord.Client(intents=intents)
 handler = None  # Will be initialized in on_ready
 reminder_manager = None  # Will be initialized in on_ready
 music_manager = None  # Will be initialized in on_ready
+ingest_server = None  # Will be initialized in check_reminders
 
 
 def validate_environment():
@@ -72,14 +77,24 @@ def handle_shutdown(signum, frame):
     """
     logger.info(f"Received signal {signum}, shutting down gracefully...")
 
+    if ingest_server:
+        ingest_server.close()
+
     # Save state before shutting down
     if reminder_manager:
         logger.info("Saving reminders...")
-        reminder_manager.save()
+        reminder_manager.close()
+
+    if music_manager:
+        music_manager.close()
 
     if handler and handler.context_manager:
         logger.info("Saving context...")
-        handler.context_manager.save()
+        handler.context_manager.close()
+
+    # Wait for queued saves to reach disk
+    logger.info("Draining persistence writer...")
+    get_persistence_writer().close(timeout=PERSISTENCE_SHUTDOWN_TIMEOUT_SECONDS)
 
     logger.info("Shutdown complete")
     client.loop.stop()
@@ -101,7 +116,7 @@ async def on_ready():
         return
 
     # Initialize managers (order matters - reminder_manager must exist first)
-    reminder_manager = ReminderManager()
+    reminder_manager = create_reminder_manager()
     music_manager = MusicManager()
     handler = MessageHandler(client.user.id, ANNA_ROLE_IDS, reminder_manager, music_manager)
     logger.info(f"Logged in as {client.user}")
@@ -124,9 +139,8 @@ async def on_message(message):
         return
 
     try:
-        response = await handler.handle_message(message)
-        if response:
-            await message.reply(response)
+        # Replies are sent from inside the channel's lane to preserve order
+        await handler.handle_message(message, respond=message.reply)
     except Exception as e:
         logger.error(f"Failed to handle message: {e}", exc_info=True)
         try:
@@ -135,6 +149,13 @@ async def on_message(message):
             logger.error(f"Failed to send error message to user: {reply_error}")
 
 
+@client.event
+async def on_voice_state_update(member, before, after):
+    """Called when anyone's voice state changes; lets idle music sessions be reclaimed."""
+    if music_manager:
+        await music_manager.on_voice_state_update(member, before, after)
+
+
 @client.event
 async def on_close():
     """Called when bot disconnects from Discord."""
@@ -143,48 +164,40 @@ async def on_close():
         reminder_manager.save()
     if handler:
         handler.context_manager.save()
+    get_persistence_writer().flush(timeout=PERSISTENCE_SHUTDOWN_TIMEOUT_SECONDS)
+
+
+async def deliver_due_reminders(due_reminders):
+    """
+    Deliver a batch of due reminders.
+
+    Args:
+        due_reminders: Reminders claimed from the reminder manager
+    """
+    await deliver_reminders(due_reminders, client.get_channel, reminder_manager)
 
 
 async def check_reminders():
-    """Background task that checks for due reminders periodically."""
+    """Background task that delivers reminders when they come due."""
+    global ingest_server
     await client.wait_until_ready()  # Wait for client to be fully ready
     logger.info("Reminder background task started")
 
-    while not client.is_closed():
-        try:
-            # Reload reminders from disk to pick up any new ones
-            reminder_manager.load()
-
-            # Get all due reminders
-            due_reminders = reminder_manager.get_due_reminders()
-
-            for reminder in due_reminders:
-                try:
-                    # Get the channel where reminder should be sent
-                    channel = client.get_channel(reminder.channel_id)
-
-                    if channel:
-                        # Send reminder with user mention
-                        await channel.send(
-                            f"<@{reminder.user_id}> reminder: {reminder.message}"
-                        )
-                        logger.info(f"Sent reminder {reminder.id} to channel {reminder.channel_id}")
-                    else:
-                        logger.warning(
-                            f"Channel {reminder.channel_id} not found for reminder {reminder.id}"
-                        )
-
-                    # Remove the completed reminder
-                    reminder_manager.remove_reminder(reminder.id)
-
-                except Exception as e:
-                    logger.error(f"Failed to send reminder {reminder.id}: {e}", exc_info=True)
-
-        except Exception as e:
-            logger.error(f"Error in reminder checker loop: {e}", exc_info=True)
-
-        # Check every N seconds (configurable)
-        await asyncio.sleep(REMINDER_CHECK_INTERVAL_SECONDS)
+    # Reminders from other processes are pushed in rather than polled for
+    ingest_server = ReminderIngestServer(reminder_manager)
+    try:
+        await ingest_server.start()
+    except OSError as e:
+        logger.error(f"Failed to start reminder ingest socket: {e}")
+
+    # Reminders missed while offline go out as one summary per channel
+    try:
+        await catch_up_reminders(client.get_channel, reminder_manager)
+    except Exception as e:
+        logger.error(f"Reminder catch-up failed: {e}", exc_info=True)
+
+    scheduler = ReminderScheduler(reminder_manager, deliver_due_reminders)
+    await scheduler.run()
 
 
 # Run the bot
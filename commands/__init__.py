@@ -4,6 +4,8 @@ from .uptime import uptime
 from .roll import roll
 from .help import help_cmd
 from .remind import remind
+from .reminders import reminders
+from .unremind import unremind
 from .speedtest import speedtest
 from .join import join
 from .play import play
@@ -15,6 +17,7 @@ from .queue import queue
 from .skip import skip
 from .clear import clear
 from .nowplaying import nowplaying
+from .stats import stats
 
 registry: Dict[str, Callable[..., Awaitable[str]]] = {
     "ping": ping,
@@ -23,6 +26,8 @@ registry: Dict[str, Callable[..., Awaitable[str]]] = {
     "help": help_cmd,
     "?": help_cmd,
     "remind": remind,
+    "reminders": reminders,
+    "unremind": unremind,
     "speedtest": speedtest,
     "join": join,
     "play": play,
@@ -35,4 +40,5 @@ registry: Dict[str, Callable[..., Awaitable[str]]] = {
     "clear": clear,
     "nowplaying": nowplaying,
     "np": nowplaying,
+    "stats": stats,
 }
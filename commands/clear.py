@@ -20,14 +20,9 @@ async def clear(ctx: 'CommandContext', args: str) -> str:
         Status message
     """
     guild_id = ctx.message.guild.id
-    music_manager = ctx.music_manager
+    count = ctx.music_manager.clear_queue(guild_id)
 
-    queue_items = music_manager.queues.get(guild_id)
-
-    if not queue_items or len(queue_items) == 0:
+    if count == 0:
         return "queue is already empty"
 
-    count = len(queue_items)
-    queue_items.clear()
-
     return f"cleared {count} track(s) from queue"
@@ -19,6 +19,7 @@ async def play(ctx: 'CommandContext', args: str) -> str:
         @Anna >play https://www.youtube.com/watch?v=dQw4w9WgXcQ
         @Anna >play aespa whiplash
         @Anna >play lofi hip hop beats
+        @Anna >play https://www.youtube.com/playlist?list=PL...
 
     Args:
         ctx: Command context
@@ -5,6 +5,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 from config import REMINDER_MIN_TIME_SECONDS, REMINDER_MAX_TIME_SECONDS
+from recurrence import parse_recurrence
 
 if TYPE_CHECKING:
     from message_handler import CommandContext
@@ -75,10 +76,14 @@ async def remind(ctx: 'CommandContext', args: str) -> str:
     Set a reminder.
 
     Usage: @Anna >remind <time> <message>
+           @Anna >remind <rule> <message>
     Examples:
         @Anna >remind 5m check the oven
         @Anna >remind 2h meeting starts
         @Anna >remind 1d dentist appointment
+        @Anna >remind every 2h stretch
+        @Anna >remind weekdays 09:00 standup
+        @Anna >remind cron 0 18 * * fri weekly report
 
     Supported time formats:
         5s, 30s  - seconds
@@ -86,6 +91,11 @@ async def remind(ctx: 'CommandContext', args: str) -> str:
         2h, 12h  - hours
         1d, 7d   - days
 
+    Recurring rules (times of day are in REMINDER_TIMEZONE):
+        every 30m, every 2h, every 1d, every 1w
+        daily 09:00, weekdays 09:00, weekends 10:00, mon,wed,fri 18:30
+        cron <minute> <hour> <day> <month> <weekday>
+
     Args:
         ctx: Command context with message object
         args: Command arguments (time and message)
@@ -93,6 +103,13 @@ async def remind(ctx: 'CommandContext', args: str) -> str:
     Returns:
         Confirmation message or error
     """
+    try:
+        rule, rule_message = parse_recurrence(args.strip())
+    except ValueError as e:
+        return f"invalid recurring reminder: {e}"
+    if rule:
+        return _remind_recurring(ctx, rule, rule_message)
+
     # Parse args: first token is time, rest is message
     parts = args.strip().split(maxsplit=1)
 
@@ -100,7 +117,8 @@ async def remind(ctx: 'CommandContext', args: str) -> str:
         return (
             "usage: `>remind <time> <message>`\n"
             "examples: `>remind 5m check oven`, `>remind 2h meeting`\n"
-            "time formats: `5s`, `30m`, `2h`, `1d`"
+            "time formats: `5s`, `30m`, `2h`, `1d`\n"
+            "recurring: `>remind every 1d ...`, `>remind weekdays 09:00 ...`, `>remind cron 0 9 * * 1-5 ...`"
         )
 
     time_str, message = parts
@@ -140,3 +158,34 @@ async def remind(ctx: 'CommandContext', args: str) -> str:
     )
 
     return f"got it, i'll remind you in {time_display}: \"{message}\""
+
+
+def _remind_recurring(ctx: 'CommandContext', rule, message: str) -> str:
+    """Create a recurring reminder from a parsed rule."""
+    if not message:
+        return f"what should i remind you about {rule.describe()}?"
+
+    now = datetime.now(timezone.utc).timestamp()
+    due_time = rule.next_fire(now, now)
+    if due_time is None:
+        return f"`{rule.spec}` never fires"
+    if due_time - now > REMINDER_MAX_TIME_SECONDS:
+        return "maximum reminder time is 1 year"
+
+    reminder = ctx.reminder_manager.add_reminder(
+        user_id=ctx.message.author.id,
+        channel_id=ctx.message.channel.id,
+        message=message,
+        due_time=due_time,
+        recurrence=rule.spec
+    )
+
+    logger.info(
+        f"Recurring reminder created: {reminder.id} for user {ctx.message.author.id} "
+        f"({rule.spec}), first due in {int(due_time - now)}s"
+    )
+
+    return (
+        f"got it, i'll remind you {rule.describe()} "
+        f"(next in {format_duration(int(due_time - now))}): \"{message}\""
+    )
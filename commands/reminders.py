@@ -0,0 +1,43 @@
+"""Reminder listing command."""
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from .remind import format_duration
+
+if TYPE_CHECKING:
+    from message_handler import CommandContext
+
+SHORT_ID_LENGTH = 8
+"""Characters of a reminder's ID shown to users (any unique prefix works with >unremind)."""
+
+
+async def reminders(ctx: 'CommandContext', args: str) -> str:
+    """
+    List your pending reminders.
+
+    Usage: @Anna >reminders
+
+    Args:
+        ctx: Command context
+        args: Unused
+
+    Returns:
+        Formatted list of the author's reminders, soonest first
+    """
+    pending = ctx.reminder_manager.get_user_reminders(ctx.message.author.id)
+    if not pending:
+        return "you have no pending reminders"
+
+    now = datetime.now(timezone.utc).timestamp()
+    lines = [f"**your reminders:** ({len(pending)})"]
+    for i, reminder in enumerate(pending, 1):
+        # Limit display to first 10 reminders
+        if i > 10:
+            lines.append(f"...and {len(pending) - 10} more")
+            break
+        remaining = format_duration(max(int(reminder.due_time - now), 0))
+        repeat = f" ({reminder.recurrence})" if reminder.recurrence else ""
+        lines.append(f"`{reminder.id[:SHORT_ID_LENGTH]}` in {remaining}{repeat}: {reminder.message}")
+    lines.append("cancel one with `>unremind <id>`")
+
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""Runtime statistics command."""
+
+from typing import TYPE_CHECKING
+from persistence_writer import get_persistence_writer
+
+if TYPE_CHECKING:
+    from message_handler import CommandContext
+
+
+async def stats(ctx: 'CommandContext', args: str) -> str:
+    """
+    Show runtime statistics for the bot's internals.
+
+    Usage: @Anna >stats
+
+    Args:
+        ctx: Command context
+        args: Unused
+
+    Returns:
+        Formatted statistics
+    """
+    lines = []
+
+    if ctx.context_manager:
+        context_stats = ctx.context_manager.get_stats()
+        lines.append(
+            f"**context ({context_stats['mode']}):** {context_stats['resident']} resident thread(s) "
+            f"({context_stats['compressed']} compressed), {context_stats['evicted']} evicted, "
+            f"{context_stats['lazy_loads']} lazy load(s)"
+        )
+
+    if ctx.lanes:
+        lane_stats = ctx.lanes.get_stats()
+        lines.append(
+            f"**channel lanes:** {lane_stats['active_lanes']} active, {lane_stats['queued']} queued, "
+            f"max depth {lane_stats['max_depth']} (peak {lane_stats['max_depth_seen']})"
+        )
+
+    if ctx.reminder_manager and hasattr(ctx.reminder_manager, "get_stats"):
+        reminder_stats = ctx.reminder_manager.get_stats()
+        lines.append(
+            f"**reminders:** {reminder_stats['resident']} resident, {reminder_stats['cold']} cold in "
+            f"{reminder_stats['cold_buckets']} bucket(s), {reminder_stats['promotions']} promotion(s)"
+        )
+
+    if ctx.music_manager:
+        extraction_stats = ctx.music_manager.extractor.get_stats()
+        lines.append(
+            f"**extraction:** {extraction_stats['running']}/{extraction_stats['workers']} running, "
+            f"{extraction_stats['queued']} queued, {extraction_stats['completed']} done, "
+            f"{extraction_stats['failed']} failed, {extraction_stats['timed_out']} timed out, "
+            f"{extraction_stats['rejected']} rejected, p50 {extraction_stats['p50']:.1f}s "
+            f"p95 {extraction_stats['p95']:.1f}s, yt-dlp instances {extraction_stats['ydl_created']} created "
+            f"{extraction_stats['ydl_reused']} reused {extraction_stats['ydl_recycled']} recycled"
+        )
+        transition_stats = ctx.music_manager.get_transition_stats()
+        lines.append(
+            f"**playback:** {transition_stats['copy']} passthrough, {transition_stats['opus']} ffmpeg-encoded, "
+            f"{transition_stats['pcm']} pcm source(s)"
+        )
+        lines.append(
+            f"**track transitions:** {transition_stats['gapless']} gapless, {transition_stats['cold']} cold, "
+            f"gap p50 {transition_stats['gap_p50'] * 1000:.0f}ms max {transition_stats['gap_max'] * 1000:.0f}ms"
+        )
+        voice_stats = ctx.music_manager.get_voice_stats()
+        lines.append(
+            f"**voice:** {voice_stats['connected']} connected, {voice_stats['pending']} idle disconnect(s) pending, "
+            f"reclaimed {voice_stats['alone']} alone, {voice_stats['idle']} idle, {voice_stats['dropped']} dropped"
+        )
+        admission_stats = ctx.music_manager.admission.get_stats()
+        session_usage = ctx.music_manager.get_session_usage()
+        total_share = sum(usage['cpu_share'] for usage in session_usage.values())
+        lines.append(
+            f"**streams:** {admission_stats['active']}/{admission_stats['max_active'] or '∞'} active "
+            f"(peak {admission_stats['peak_active']}), {admission_stats['waiting']} waiting, "
+            f"{admission_stats['refused']} refused, {total_share:.0%} of a core"
+        )
+        usage = session_usage.get(ctx.message.guild.id) if ctx.message.guild else None
+        if usage:
+            lines.append(
+                f"**this server's stream:** {usage['tracks']} track(s) in {usage['seconds'] / 60:.0f}m, "
+                f"ffmpeg {usage['ffmpeg_cpu']:.1f}s + player {usage['player_cpu']:.1f}s CPU "
+                f"({usage['cpu_share']:.1%} of a core), ffmpeg {usage['rss'] / 2**20:.0f} MiB "
+                f"(peak {usage['peak_rss'] / 2**20:.0f} MiB)"
+            )
+        loudness = ctx.music_manager.loudness
+        if loudness:
+            loudness_stats = loudness.get_stats()
+            lines.append(
+                f"**loudness:** {loudness_stats['measured']} track(s) measured, "
+                f"{loudness_stats['static']} play(s) with static gain, "
+                f"{loudness_stats['unmeasured']} with realtime normalization, "
+                f"{loudness_stats['pending']} analyzing, {loudness_stats['failures']} failed"
+            )
+        audio_cache = ctx.music_manager.audio_cache
+        if audio_cache:
+            audio_stats = audio_cache.get_stats()
+            lines.append(
+                f"**audio cache:** {audio_stats['tracks']} track(s), {audio_stats['bytes'] / 2**20:.0f} MiB, "
+                f"{audio_stats['hit_rate']:.0%} hit rate ({audio_stats['hits']} hit(s), {audio_stats['misses']} miss(es)), "
+                f"{audio_stats['bytes_saved'] / 2**20:.0f} MiB saved, {audio_stats['evictions']} evicted, "
+                f"{audio_stats['pending']} caching"
+            )
+        search_stats = ctx.music_manager.search_cache.get_stats()
+        lines.append(
+            f"**search cache:** {search_stats['entries']} search(es), {search_stats['hit_rate']:.0%} hit rate "
+            f"({search_stats['hits']} hit(s), {search_stats['misses']} miss(es), {search_stats['expired']} expired)"
+        )
+        cache_stats = ctx.music_manager.cache.get_stats()
+        lines.append(
+            f"**extraction cache:** {cache_stats['entries']} track(s), {cache_stats['hit_rate']:.0%} hit rate "
+            f"({cache_stats['metadata_hits']} metadata, {cache_stats['stream_hits']} stream, "
+            f"{cache_stats['misses']} miss(es), {cache_stats['stream_expired']} expired), "
+            f"{cache_stats['saved_seconds']:.0f}s of extraction saved"
+        )
+
+    writer_stats = get_persistence_writer().get_stats()
+    lines.append(
+        f"**persistence:** {writer_stats['writes']} write(s), {writer_stats['coalesced']} coalesced, "
+        f"{writer_stats['pending']} pending, {writer_stats['failures']} failed"
+    )
+
+    return "\n".join(lines)
@@ -0,0 +1,46 @@
+"""Reminder cancellation command."""
+
+import logging
+from typing import TYPE_CHECKING
+from .reminders import SHORT_ID_LENGTH
+
+if TYPE_CHECKING:
+    from message_handler import CommandContext
+
+logger = logging.getLogger(__name__)
+
+
+async def unremind(ctx: 'CommandContext', args: str) -> str:
+    """
+    Cancel one of your pending reminders.
+
+    Usage: @Anna >unremind <id>
+    The ID is the short ID shown by >reminders (any unique prefix works).
+    Only the reminder's owner can cancel it.
+
+    Args:
+        ctx: Command context
+        args: Reminder ID or ID prefix
+
+    Returns:
+        Confirmation message or error
+    """
+    id_prefix = args.strip()
+    if not id_prefix:
+        return "usage: `>unremind <id>` - see `>reminders` for your reminder IDs"
+
+    user_id = ctx.message.author.id
+    matches = ctx.reminder_manager.find_user_reminders(user_id, id_prefix)
+
+    if not matches:
+        return f"you have no reminder with id `{id_prefix}`"
+
+    if len(matches) > 1:
+        ids = ", ".join(f"`{r.id[:SHORT_ID_LENGTH]}`" for r in matches[:5])
+        return f"`{id_prefix}` matches {len(matches)} reminders ({ids}) - use more of the id"
+
+    reminder = matches[0]
+    ctx.reminder_manager.remove_reminder(reminder.id, reminder.due_time)
+    logger.info(f"Reminder cancelled: {reminder.id} by user {user_id}")
+
+    return f"cancelled reminder `{reminder.id[:SHORT_ID_LENGTH]}`: \"{reminder.message}\""
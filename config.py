@@ -4,14 +4,12 @@ This module centralizes all configuration values, making it easy to adjust
 bot behavior without searching through multiple files.
 """
 
+import os
+
 # Discord configuration
 ANNA_ROLE_IDS = [1359662416165732464]
 """Discord role IDs that trigger the bot when mentioned."""
 
-# Background task intervals (seconds)
-REMINDER_CHECK_INTERVAL_SECONDS = 10
-"""How often to check for due reminders."""
-
 # Context management
 CONTEXT_MAX_MESSAGES = 12
 """Maximum number of messages to keep in conversation history per thread."""
@@ -19,9 +17,63 @@ CONTEXT_MAX_MESSAGES = 12
 CONTEXT_FILE = "thread_context.json"
 """File path for persisting conversation context."""
 
+CONTEXT_PERSISTENCE_MODE = os.getenv("CONTEXT_PERSISTENCE_MODE", "snapshot")
+"""How context is persisted. Options: snapshot (rewrite whole file), journal (append-only log), sharded (file per thread)"""
+
+DATA_DIR = os.getenv("DATA_DIR", "data")
+"""Directory for persisted state that spans multiple files (journals, shards, caches)."""
+
+PERSISTENCE_CODEC = os.getenv("PERSISTENCE_CODEC", "auto")
+"""Codec for persisted files. Options: auto (fastest installed JSON), json, orjson, msgspec, msgpack (binary)"""
+
+PERSISTENCE_COMPACT = os.getenv("PERSISTENCE_COMPACT", "false").lower() in ("1", "true", "yes")
+"""Write JSON without indentation. Smaller and faster, but harder to read by hand."""
+
+PERSISTENCE_SHUTDOWN_TIMEOUT_SECONDS = 10
+"""Maximum time to wait on shutdown for queued background saves to reach disk."""
+
+CONTEXT_JOURNAL_FILE = os.path.join(DATA_DIR, "thread_context.journal")
+"""File path for the context write-ahead journal (journal mode only)."""
+
+CONTEXT_JOURNAL_FSYNC_INTERVAL_SECONDS = 1.0
+"""Maximum time appended journal records wait before being fsynced as a group."""
+
+CONTEXT_JOURNAL_GROUP_COMMIT_SIZE = 64
+"""Number of pending journal records that triggers an early group commit."""
+
+CONTEXT_JOURNAL_COMPACT_RECORDS = 2000
+"""Number of journal records after which a background snapshot compacts the log."""
+
+CONTEXT_SHARD_DIR = os.path.join(DATA_DIR, "contexts")
+"""Root directory for per-thread context files (sharded mode only)."""
+
+CONTEXT_SHARD_COUNT = 256
+"""Number of shard subdirectories per-thread context files are spread across."""
+
+CONTEXT_MAX_RESIDENT_THREADS = int(os.getenv("CONTEXT_MAX_RESIDENT_THREADS", "1000"))
+"""Maximum threads kept in memory in sharded mode; least recently used threads are evicted."""
+
+CONTEXT_COLD_COMPRESSION = os.getenv("CONTEXT_COLD_COMPRESSION", "none")
+"""Compression for idle threads held in memory. Options: none, zlib, zstd (requires zstandard)"""
+
+CONTEXT_COLD_AFTER_SECONDS = 600
+"""Idle time after which a thread's in-memory history is compressed."""
+
 # Reminder settings
+REMINDER_BACKEND = os.getenv("REMINDER_BACKEND", "json")
+"""Reminder storage backend. Options: json (reminders.json), sqlite (indexed database), wheel (timing wheel with on-disk far-future buckets)"""
+
 REMINDERS_FILE = "reminders.json"
-"""File path for persisting reminders."""
+"""File path for persisting reminders (json backend, and migration source for sqlite)."""
+
+REMINDERS_DB_FILE = os.path.join(DATA_DIR, "reminders.db")
+"""SQLite database path for reminders (sqlite backend only)."""
+
+REMINDER_WHEEL_COLD_DIR = os.path.join(DATA_DIR, "reminder_buckets")
+"""Directory for far-future reminder buckets (wheel backend only)."""
+
+REMINDER_WHEEL_COLD_BUCKET_SECONDS = 3600
+"""Time span of each on-disk reminder bucket (wheel backend only)."""
 
 REMINDER_MIN_TIME_SECONDS = 10
 """Minimum allowed reminder time (10 seconds)."""
@@ -29,9 +81,134 @@ REMINDER_MIN_TIME_SECONDS = 10
 REMINDER_MAX_TIME_SECONDS = 365 * 86400  # 1 year
 """Maximum allowed reminder time (1 year)."""
 
-# LLM/Model settings
-import os
+REMINDER_RETRY_SECONDS = 30
+"""Delay before retrying a reminder whose delivery failed."""
+
+REMINDER_MAX_LATENESS_SECONDS = int(os.getenv("REMINDER_MAX_LATENESS_SECONDS", 7 * 86400))
+"""Reminders missed during downtime by more than this are dropped at startup instead of sent (0 sends all)."""
+
+REMINDER_MIN_RECURRENCE_SECONDS = 60
+"""Shortest allowed interval for recurring reminders."""
+
+REMINDER_TIMEZONE = os.getenv("REMINDER_TIMEZONE", "UTC")
+"""IANA timezone that recurring reminder times of day (e.g. "daily 09:00") are in."""
+
+REMINDER_INGEST_SOCKET = os.getenv("REMINDER_INGEST_SOCKET", os.path.join(DATA_DIR, "reminders.sock"))
+"""Unix socket where scripts and other tools submit reminders (empty to disable)."""
+
+REMINDER_DELIVERY_CONCURRENCY = 8
+"""Maximum channels reminders are sent to at once when a batch comes due."""
+
+# Music settings
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "4"))
+"""Maximum yt-dlp extractions run at once (each on its own worker thread)."""
+
+EXTRACTION_MAX_PENDING = int(os.getenv("EXTRACTION_MAX_PENDING", "32"))
+"""Maximum extractions waiting for a worker; further requests are rejected."""
+
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+"""Time limit for one extraction, including time spent waiting for a worker."""
+
+EXTRACTION_YDL_MAX_USES = 200
+"""Extractions a pooled YoutubeDL instance serves before it is replaced."""
+
+EXTRACTION_YDL_MAX_AGE_SECONDS = 3600
+"""Age at which a pooled YoutubeDL instance is replaced."""
 
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "2048"))
+"""Maximum tracks kept in the extraction cache; least recently used are evicted."""
+
+EXTRACTION_CACHE_METADATA_TTL_SECONDS = 7 * 86400
+"""How long cached track metadata (title, duration) is reused."""
+
+EXTRACTION_STREAM_URL_TTL_SECONDS = 1800
+"""Assumed lifetime of stream URLs that don't carry their own expiry."""
+
+EXTRACTION_STREAM_URL_MARGIN_SECONDS = 300
+"""Cached stream URLs are re-extracted when they would expire within this long after playback ends."""
+
+MUSIC_AUDIO_MODE = os.getenv("MUSIC_AUDIO_MODE", "pcm")
+"""Playback pipeline. Options: pcm (FFmpeg decodes, bot encodes Opus per frame), opus (FFmpeg outputs Opus; Opus sources are copied through)"""
+
+MUSIC_NORMALIZE = os.getenv("MUSIC_NORMALIZE", "true").lower() in ("1", "true", "yes")
+"""Normalize loudness: a measured static gain per track, or realtime dynaudnorm until a track is measured."""
+
+SEARCH_CACHE_FILE = os.path.join(DATA_DIR, "search_cache.json")
+"""File resolved search queries are persisted to."""
+
+SEARCH_CACHE_MAX_ENTRIES = 5000
+"""Maximum search queries remembered; least recently used are forgotten."""
+
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+"""How long a search query keeps resolving to the same track before searching again."""
+
+MUSIC_LOUDNESS_TARGET_LUFS = float(os.getenv("MUSIC_LOUDNESS_TARGET_LUFS", "-16"))
+"""Integrated loudness (EBU R128) tracks are brought to by their measured static gain."""
+
+MUSIC_MAX_GAIN_DB = 12.0
+"""Largest static boost or cut applied to a track."""
+
+MUSIC_TRUE_PEAK_LIMIT_DB = -1.5
+"""Static boosts never push a track's true peak above this (dBTP)."""
+
+MUSIC_GAIN_TOLERANCE_DB = 1.0
+"""Measured gains smaller than this are skipped, so such tracks can use Opus passthrough."""
+
+LOUDNESS_FILE = os.path.join(DATA_DIR, "loudness.json")
+"""File measured per-track gains are persisted to."""
+
+LOUDNESS_MAX_ENTRIES = 50000
+"""Maximum tracks with a remembered gain; least recently played are forgotten."""
+
+LOUDNESS_ANALYSIS_CONCURRENCY = 1
+"""Maximum loudness analysis passes run at once."""
+
+LOUDNESS_MAX_TRACK_SECONDS = 60 * 60
+"""Tracks longer than this (and live streams) are not measured; they use realtime normalization."""
+
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+"""Keep played tracks as local Opus files and play repeats from disk."""
+
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(DATA_DIR, "audio_cache"))
+"""Directory for cached Opus files."""
+
+AUDIO_CACHE_MAX_BYTES = int(float(os.getenv("AUDIO_CACHE_MAX_MB", "2048")) * 2**20)
+"""Total size cap for cached audio; least recently played tracks are evicted."""
+
+AUDIO_CACHE_MAX_TRACK_SECONDS = 20 * 60
+"""Tracks longer than this (and live streams) are not cached."""
+
+AUDIO_CACHE_CONCURRENCY = 2
+"""Maximum tracks transcoded into the cache at once."""
+
+AUDIO_CACHE_BITRATE = "128k"
+"""Opus bitrate for cached tracks whose source isn't Opus already."""
+
+MUSIC_MAX_PLAYLIST_TRACKS = int(os.getenv("MUSIC_MAX_PLAYLIST_TRACKS", "500"))
+"""Maximum tracks queued from one playlist."""
+
+MUSIC_PLAYLIST_FIRST_BATCH = 10
+"""Playlist tracks listed before playback starts; the rest are listed in the background."""
+
+MUSIC_PLAYLIST_TIMEOUT_SECONDS = 120
+"""Time limit for listing the rest of a long playlist."""
+
+MUSIC_PRESPAWN_SECONDS = 3
+"""FFmpeg for the next queued track is started this long before the current track ends."""
+
+MUSIC_IDLE_DISCONNECT_SECONDS = int(os.getenv("MUSIC_IDLE_DISCONNECT_SECONDS", "300"))
+"""Leave voice after the queue has been empty this long (0 to stay connected)."""
+
+MUSIC_ALONE_DISCONNECT_SECONDS = int(os.getenv("MUSIC_ALONE_DISCONNECT_SECONDS", "60"))
+"""Leave voice after nobody else has been in the channel this long, even mid-queue (0 to stay)."""
+
+MUSIC_MAX_ACTIVE_STREAMS = int(os.getenv("MUSIC_MAX_ACTIVE_STREAMS", "6"))
+"""Maximum guilds streaming at once (0 for no limit); size with benchmarks/playback_cpu.py."""
+
+MUSIC_MAX_WAITING_SESSIONS = int(os.getenv("MUSIC_MAX_WAITING_SESSIONS", "10"))
+"""Maximum guilds waiting for a free stream; more are refused."""
+
+# LLM/Model settings
 # Provider selection
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "digitalocean")
 """LLM provider to use. Options: digitalocean, ollama-local, ollama-tailscale"""
@@ -0,0 +1,220 @@
+"""Append-only write-ahead journal for conversation context."""
+
+import glob
+import os
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
+from config import (
+    CONTEXT_JOURNAL_FILE, CONTEXT_JOURNAL_FSYNC_INTERVAL_SECONDS,
+    CONTEXT_JOURNAL_GROUP_COMMIT_SIZE, CONTEXT_JOURNAL_COMPACT_RECORDS
+)
+from serialization import line_codec
+
+logger = logging.getLogger(__name__)
+
+
+class ContextJournal:
+    """
+    Write-ahead log of context mutations.
+
+    Every mutation is appended as one compact JSON line tagged with a sequence
+    number. A background thread fsyncs pending lines as a group, so the cost of
+    a message is one small append regardless of total history size.
+
+    Compaction rotates the live journal into a sealed segment
+    (``<journal>.<last_seq>``) and writes a snapshot in a background thread.
+    Segments covered by a durable snapshot are deleted; a failed snapshot just
+    leaves its segment behind for the next compaction to cover. Records carry
+    their sequence number, so replay after a crash at any point is idempotent.
+    """
+
+    def __init__(
+        self,
+        journal_file: str = CONTEXT_JOURNAL_FILE,
+        fsync_interval: float = CONTEXT_JOURNAL_FSYNC_INTERVAL_SECONDS,
+        group_commit_size: int = CONTEXT_JOURNAL_GROUP_COMMIT_SIZE,
+        compact_records: int = CONTEXT_JOURNAL_COMPACT_RECORDS
+    ):
+        """
+        Initialize the journal (call open() before appending).
+
+        Args:
+            journal_file: Path to the live journal file
+            fsync_interval: Maximum seconds a record waits before fsync
+            group_commit_size: Pending records that trigger an early fsync
+            compact_records: Records since last snapshot that trigger compaction
+        """
+        self.journal_file = journal_file
+        self.fsync_interval = fsync_interval
+        self.group_commit_size = group_commit_size
+        self.compact_records = compact_records
+        self.codec = line_codec()
+
+        self.seq = 0
+        self.records_since_snapshot = 0
+
+        self._file = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._commit_requested = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        self._compactor: Optional[threading.Thread] = None
+
+    def _segment_files(self) -> List[str]:
+        """Return sealed journal segments ordered by their last sequence number."""
+        segments = []
+        for path in glob.glob(f"{glob.escape(self.journal_file)}.*"):
+            suffix = path[len(self.journal_file) + 1:]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return [path for _, path in sorted(segments)]
+
+    def replay(self, after_seq: int) -> Iterator[dict]:
+        """
+        Yield journaled records newer than a snapshot.
+
+        A torn final line (crash mid-append) is skipped with a warning.
+
+        Args:
+            after_seq: Sequence number already covered by the snapshot
+
+        Yields:
+            Record dicts in sequence order
+        """
+        for path in self._segment_files() + [self.journal_file]:
+            try:
+                with open(path, "rb") as f:
+                    for line_no, line in enumerate(f, 1):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = self.codec.loads(line)
+                        except ValueError:
+                            logger.warning(f"Skipping torn journal record at {path}:{line_no}")
+                            continue
+                        if record.get("s", 0) > after_seq:
+                            yield record
+            except FileNotFoundError:
+                continue
+
+    def open(self, seq: int) -> None:
+        """
+        Open the live journal for appending and start the group-commit thread.
+
+        Args:
+            seq: Last sequence number already applied (snapshot plus replay)
+        """
+        self.seq = seq
+        os.makedirs(os.path.dirname(self.journal_file) or ".", exist_ok=True)
+        self._file = open(self.journal_file, "ab")
+        self._flusher = threading.Thread(target=self._flush_loop, name="context-journal", daemon=True)
+        self._flusher.start()
+        logger.info(f"Opened context journal {self.journal_file} at seq {seq}")
+
+    def append(self, record: dict) -> None:
+        """
+        Append a mutation record; it becomes durable at the next group commit.
+
+        Args:
+            record: Record fields (the sequence number is added here)
+        """
+        self.seq += 1
+        record["s"] = self.seq
+        line = self.codec.dumps(record)
+
+        with self._lock:
+            self._file.write(line + b"\n")
+            self._pending += 1
+            pending = self._pending
+
+        self.records_since_snapshot += 1
+        if pending >= self.group_commit_size:
+            self._commit_requested.set()
+
+    def _flush_loop(self) -> None:
+        """Group-commit loop running on the journal thread."""
+        while not self._closed:
+            self._commit_requested.wait(timeout=self.fsync_interval)
+            self._commit_requested.clear()
+            try:
+                self.commit()
+            except Exception as e:
+                logger.error(f"Context journal commit failed: {e}", exc_info=True)
+
+    def commit(self) -> None:
+        """Flush and fsync all pending records as a single group."""
+        with self._lock:
+            if not self._pending or self._file is None:
+                return
+            self._file.flush()
+            # fsync a duplicate descriptor outside the lock so appends never wait on the disk
+            fd = os.dup(self._file.fileno())
+            count = self._pending
+            self._pending = 0
+
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        logger.debug(f"Committed {count} context journal record(s)")
+
+    def needs_compaction(self) -> bool:
+        """Return True if enough records accumulated and no compaction is running."""
+        if self.records_since_snapshot < self.compact_records:
+            return False
+        return self._compactor is None or not self._compactor.is_alive()
+
+    def compact(self, snapshot: Dict[str, List[dict]], save_snapshot: Callable[[dict], bool],
+                background: bool = True) -> None:
+        """
+        Seal the live journal and persist a snapshot that supersedes it.
+
+        Args:
+            snapshot: Copy of all contexts as of the current sequence number
+            save_snapshot: Callable that durably writes the snapshot document,
+                returning True on success
+            background: Write the snapshot on a separate thread
+        """
+        seq = self.seq
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self._file.close()
+            os.replace(self.journal_file, f"{self.journal_file}.{seq}")
+            self._file = open(self.journal_file, "ab")
+        self.records_since_snapshot = 0
+
+        def write_snapshot():
+            if not save_snapshot({"seq": seq, "contexts": snapshot}):
+                logger.warning(f"Context snapshot at seq {seq} failed, keeping journal segments")
+                return
+            for path in self._segment_files():
+                if int(path[len(self.journal_file) + 1:]) <= seq:
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        logger.warning(f"Failed to remove journal segment {path}: {e}")
+            logger.info(f"Compacted context journal at seq {seq}")
+
+        if background:
+            self._compactor = threading.Thread(target=write_snapshot, name="context-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            write_snapshot()
+
+    def close(self) -> None:
+        """Stop the group-commit thread, commit pending records and close the journal."""
+        self._closed = True
+        self._commit_requested.set()
+        if self._flusher:
+            self._flusher.join()
+        if self._compactor:
+            self._compactor.join()
+        if self._file:
+            self.commit()
+            self._file.close()
+            self._file = None
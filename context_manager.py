@@ -1,11 +1,20 @@
 """Thread context management for conversation history."""
 
-import json
 import os
+import time
 import logging
-from typing import List, Dict, Optional
-from config import CONTEXT_FILE, CONTEXT_MAX_MESSAGES
-from utils import atomic_json_save
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Tuple
+from config import (
+    CONTEXT_FILE, CONTEXT_MAX_MESSAGES, CONTEXT_PERSISTENCE_MODE, CONTEXT_MAX_RESIDENT_THREADS,
+    CONTEXT_COLD_COMPRESSION, CONTEXT_COLD_AFTER_SECONDS
+)
+from context_journal import ContextJournal
+from context_shards import ShardedContextStore
+from message_store import ThreadHistory, get_compressor
+from persistence_writer import get_persistence_writer
+from serialization import load_file
 
 logger = logging.getLogger(__name__)
 
@@ -13,41 +22,162 @@ logger = logging.getLogger(__name__)
 class ThreadContextManager:
     """Manages conversation context/history for Discord threads."""
 
-    def __init__(self, context_file: str = CONTEXT_FILE, max_messages: int = CONTEXT_MAX_MESSAGES):
+    def __init__(
+        self,
+        context_file: str = CONTEXT_FILE,
+        max_messages: int = CONTEXT_MAX_MESSAGES,
+        persistence_mode: str = CONTEXT_PERSISTENCE_MODE,
+        journal: Optional[ContextJournal] = None,
+        shards: Optional[ShardedContextStore] = None,
+        max_resident_threads: int = CONTEXT_MAX_RESIDENT_THREADS,
+        cold_compression: str = CONTEXT_COLD_COMPRESSION,
+        cold_after_seconds: float = CONTEXT_COLD_AFTER_SECONDS
+    ):
         """
         Initialize the context manager.
 
         Args:
             context_file: Path to the JSON file for persisting context
             max_messages: Maximum number of messages to keep per thread
+            persistence_mode: "snapshot" to rewrite the whole file on save,
+                "journal" to append each change to a write-ahead log,
+                "sharded" to store each thread in its own file and load it lazily
+            journal: Optional ContextJournal to use in journal mode
+            shards: Optional ShardedContextStore to use in sharded mode
+            max_resident_threads: Threads kept in memory in sharded mode
+            cold_compression: "zlib", "zstd" or "none" for threads idle past cold_after_seconds
+            cold_after_seconds: Idle time after which a thread is compressed
         """
         self.context_file = context_file
         self.max_messages = max_messages
-        self.contexts: Dict[str, List[dict]] = {}
+        self.writer = get_persistence_writer()
+        # Ordered least to most recently used
+        self.contexts: Dict[str, ThreadHistory] = OrderedDict()
         self.dirty = False  # Track if save needed
+
+        self.compressor = get_compressor(cold_compression)
+        self.cold_after_seconds = cold_after_seconds
+        self._last_cold_sweep = time.monotonic()
+
+        # Sharded mode: least recently used threads are evicted past the cap
+        self.max_resident_threads = max(1, max_resident_threads)
+        self.evicted_count = 0
+        self.lazy_load_count = 0
+        self._dirty_threads = set()
+        self._unsaved_messages = 0
+
+        self.journal: Optional[ContextJournal] = None
+        self.shards: Optional[ShardedContextStore] = None
+        if persistence_mode == "journal":
+            self.journal = journal or ContextJournal()
+        elif persistence_mode == "sharded":
+            self.shards = shards or ShardedContextStore()
+        elif persistence_mode != "snapshot":
+            logger.warning(f"Unknown CONTEXT_PERSISTENCE_MODE '{persistence_mode}', using snapshot")
+
         self.load()
 
     def load(self) -> None:
-        """Load context from disk."""
+        """
+        Load context from disk.
+
+        Journal mode replays the journal tail on top of the snapshot. Sharded
+        mode loads nothing up front (threads are read on first access) and
+        migrates the whole-file snapshot into shards the first time it runs.
+        """
+        if self.shards:
+            self.contexts = OrderedDict()
+            if not self.shards.exists():
+                contexts, _ = self._read_context_file()
+                self.shards.import_contexts(contexts)
+            return
+
+        contexts, snapshot_seq = self._read_context_file()
+        self.contexts = OrderedDict(
+            (thread_id, ThreadHistory(self.max_messages, messages))
+            for thread_id, messages in contexts.items()
+        )
+
+        if not self.journal:
+            return
+
+        seq = snapshot_seq
+        replayed = 0
+        for record in self.journal.replay(snapshot_seq):
+            if record.get("op") == "add":
+                self._append(record["t"], record["r"], record["c"])
+            elif record.get("op") == "clear":
+                self._clear(record.get("t"))
+            seq = record["s"]
+            replayed += 1
+
+        self.journal.open(seq)
+        if replayed:
+            logger.info(f"Replayed {replayed} context journal record(s)")
+            # Fold the replayed tail into a fresh snapshot so startup stays fast
+            self.journal.compact(self._snapshot(), self._save_snapshot, background=False)
+
+    def _read_context_file(self) -> Tuple[Dict[str, List[dict]], int]:
+        """
+        Read the whole-file context snapshot.
+
+        Returns:
+            Tuple of (contexts, journal sequence number the snapshot covers)
+        """
         try:
-            with open(self.context_file, "r") as f:
-                self.contexts = json.load(f)
-                logger.info(f"Loaded thread context from {self.context_file}")
+            data = load_file(self.context_file)
+            logger.info(f"Loaded thread context from {self.context_file}")
         except FileNotFoundError:
             logger.info(f"No saved context found at {self.context_file}. Starting fresh.")
-            self.contexts = {}
-        except json.JSONDecodeError as e:
+            return {}, 0
+        except ValueError as e:
             logger.warning(f"Failed to parse context file: {e}. Starting fresh.")
-            self.contexts = {}
+            return {}, 0
+
+        # Journal snapshots wrap contexts with the sequence number they cover
+        if isinstance(data, dict) and "seq" in data and "contexts" in data:
+            return data["contexts"], data["seq"]
+        return data, 0
+
+    def _snapshot(self) -> Dict[str, List[dict]]:
+        """Materialize all contexts as plain dicts so they can be serialized off the event loop."""
+        return {thread_id: history.to_dicts() for thread_id, history in self.contexts.items()}
+
+    def _save_snapshot(self, document: dict) -> bool:
+        """Durably write a journal snapshot document (blocks the calling thread)."""
+        return self.writer.submit(self.context_file, document).result()
+
+    def save(self) -> Optional[Future]:
+        """
+        Save context to disk atomically without blocking on I/O.
+
+        Snapshot and shard writes are handed to the persistence writer thread;
+        journal mode commits the journal instead.
+
+        Returns:
+            Future resolving when the snapshot is durable (snapshot mode only), else None
+        """
+        if self.journal:
+            self.journal.commit()
+            return None
+
+        if self.shards:
+            for thread_id in self._dirty_threads:
+                if thread_id in self.contexts:
+                    self.shards.save_thread(thread_id, self.contexts[thread_id].to_dicts())
+            if self._dirty_threads:
+                logger.debug(f"Saved {len(self._dirty_threads)} context shard(s)")
+            self._dirty_threads.clear()
+            self._unsaved_messages = 0
+            return None
 
-    def save(self) -> None:
-        """Save context to disk atomically."""
         if not self.dirty:
-            return  # Skip if nothing changed
+            return None  # Skip if nothing changed
 
-        atomic_json_save(self.contexts, self.context_file)
+        future = self.writer.submit(self.context_file, self._snapshot())
         self.dirty = False
-        logger.debug(f"Saved thread context to {self.context_file}")
+        logger.debug(f"Queued thread context save to {self.context_file}")
+        return future
 
     def get_context(self, thread_id: str) -> List[dict]:
         """
@@ -59,9 +189,77 @@ class ThreadContextManager:
         Returns:
             List of messages in OpenAI format [{"role": "user/assistant", "content": "..."}]
         """
-        if thread_id not in self.contexts:
-            self.contexts[thread_id] = []
-        return self.contexts[thread_id]
+        return self._history(thread_id).to_dicts()
+
+    def _history(self, thread_id: str) -> ThreadHistory:
+        """Get a thread's history, loading it in sharded mode and marking it recently used."""
+        history = self.contexts.get(thread_id)
+        if history is not None:
+            self.contexts.move_to_end(thread_id)
+            history.touch()
+            return history
+
+        stored = None
+        if self.shards:
+            stored = self.shards.load_thread(thread_id)
+            if stored is not None:
+                self.lazy_load_count += 1
+
+        history = ThreadHistory(self.max_messages, stored or ())
+        self.contexts[thread_id] = history
+        if self.shards:
+            self._evict_idle()
+        return history
+
+    def _evict_idle(self) -> None:
+        """Evict least recently used threads past the residency cap, saving dirty ones."""
+        while len(self.contexts) > self.max_resident_threads:
+            thread_id, history = self.contexts.popitem(last=False)
+            if thread_id in self._dirty_threads:
+                self.shards.save_thread(thread_id, history.to_dicts())
+                self._dirty_threads.discard(thread_id)
+            self.evicted_count += 1
+            logger.debug(f"Evicted idle thread {thread_id} from memory")
+
+    def compress_cold(self) -> int:
+        """
+        Compress threads idle longer than the cold threshold.
+
+        Threads are ordered by recency, so the sweep stops at the first warm one.
+
+        Returns:
+            Number of threads newly compressed
+        """
+        if not self.compressor:
+            return 0
+
+        cutoff = time.monotonic() - self.cold_after_seconds
+        packed = 0
+        for history in self.contexts.values():
+            if history.last_access > cutoff:
+                break
+            if not history.is_packed:
+                history.pack(self.compressor)
+                packed += 1
+
+        if packed:
+            logger.debug(f"Compressed {packed} cold thread(s)")
+        return packed
+
+    def get_stats(self) -> dict:
+        """
+        Get context residency statistics.
+
+        Returns:
+            Dict with resident, compressed and evicted thread counts and lazy loads
+        """
+        return {
+            "mode": "sharded" if self.shards else "journal" if self.journal else "snapshot",
+            "resident": len(self.contexts),
+            "compressed": sum(1 for history in self.contexts.values() if history.is_packed),
+            "evicted": self.evicted_count,
+            "lazy_loads": self.lazy_load_count,
+        }
 
     def add_message(self, thread_id: str, role: str, content: str) -> None:
         """
@@ -72,13 +270,24 @@ class ThreadContextManager:
             role: Either "user" or "assistant"
             content: The message content
         """
-        context = self.get_context(thread_id)
-        context.append({"role": role, "content": content})
+        self._append(thread_id, role, content)
+
+        if self.compressor and time.monotonic() - self._last_cold_sweep >= self.cold_after_seconds / 2:
+            self._last_cold_sweep = time.monotonic()
+            self.compress_cold()
 
-        # Trim to max size
-        if len(context) > self.max_messages:
-            self.contexts[thread_id] = context[-self.max_messages:]
-            logger.debug(f"Trimmed context for thread {thread_id} to {self.max_messages} messages")
+        if self.journal:
+            self.journal.append({"op": "add", "t": thread_id, "r": role, "c": content})
+            if self.journal.needs_compaction():
+                self.journal.compact(self._snapshot(), self._save_snapshot)
+            return
+
+        if self.shards:
+            self._dirty_threads.add(thread_id)
+            self._unsaved_messages += 1
+            if self._unsaved_messages >= 5:
+                self.save()
+            return
 
         self.dirty = True
 
@@ -87,6 +296,10 @@ class ThreadContextManager:
         if total_messages % 5 == 0:
             self.save()
 
+    def _append(self, thread_id: str, role: str, content: str) -> None:
+        """Append a message to a thread in memory (the ring buffer drops the oldest when full)."""
+        self._history(thread_id).append(role, content)
+
     def clear_context(self, thread_id: Optional[str] = None) -> None:
         """
         Clear context for one thread or all threads.
@@ -94,13 +307,39 @@ class ThreadContextManager:
         Args:
             thread_id: Thread to clear, or None to clear all threads
         """
+        self._clear(thread_id)
+
+        if self.journal:
+            self.journal.append({"op": "clear", "t": thread_id})
+            # Resets are rare and user-visible, so make them durable immediately
+            self.journal.commit()
+            return
+
+        if self.shards:
+            if thread_id:
+                self.shards.delete_thread(thread_id)
+                self._dirty_threads.discard(thread_id)
+            else:
+                self.shards.clear_all()
+                self._dirty_threads.clear()
+            return
+
+        self.dirty = True
+        self.save()
+
+    def _clear(self, thread_id: Optional[str]) -> None:
+        """Clear one thread or all threads in memory."""
         if thread_id:
             if thread_id in self.contexts:
                 del self.contexts[thread_id]
                 logger.info(f"Cleared context for thread {thread_id}")
         else:
-            self.contexts = {}
+            self.contexts.clear()
             logger.info("Cleared all thread contexts")
 
-        self.dirty = True
-        self.save()
+    def close(self) -> None:
+        """Flush pending state and release persistence resources."""
+        if self.journal:
+            self.journal.close()
+        else:
+            self.save()
@@ -0,0 +1,108 @@
+"""Sharded per-thread storage for conversation context."""
+
+import os
+import shutil
+import logging
+import zlib
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from config import CONTEXT_SHARD_DIR, CONTEXT_SHARD_COUNT
+from persistence_writer import get_persistence_writer
+from serialization import load_file
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedContextStore:
+    """
+    Stores each thread's history in its own small JSON file.
+
+    Files live under ``<shard_dir>/<shard>/<thread_id>.json`` where the shard is
+    derived from a hash of the thread ID, keeping directories small as the bot
+    joins more guilds. Reading or writing one thread never touches the others.
+    """
+
+    def __init__(self, shard_dir: str = CONTEXT_SHARD_DIR, shard_count: int = CONTEXT_SHARD_COUNT):
+        """
+        Initialize the store.
+
+        Args:
+            shard_dir: Root directory for shard subdirectories
+            shard_count: Number of shard subdirectories to spread threads across
+        """
+        self.shard_dir = shard_dir
+        self.shard_count = shard_count
+        self.writer = get_persistence_writer()
+
+    def exists(self) -> bool:
+        """Return True if the store has been created on disk."""
+        return os.path.isdir(self.shard_dir)
+
+    def _thread_path(self, thread_id: str) -> str:
+        """Return the file path for a thread's history."""
+        shard = zlib.crc32(thread_id.encode()) % self.shard_count
+        return os.path.join(self.shard_dir, f"{shard:02x}", f"{thread_id}.json")
+
+    def load_thread(self, thread_id: str) -> Optional[List[dict]]:
+        """
+        Load one thread's history.
+
+        Args:
+            thread_id: The thread/channel ID
+
+        Returns:
+            List of messages, or None if the thread has no stored history
+        """
+        path = self._thread_path(thread_id)
+        # A recently evicted thread may still be queued for writing
+        self.writer.flush(path)
+        try:
+            return load_file(path)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Failed to parse context shard {path}: {e}. Starting thread fresh.")
+            return None
+
+    def save_thread(self, thread_id: str, messages: List[dict]) -> Future:
+        """
+        Queue an atomic write of one thread's history.
+
+        Args:
+            thread_id: The thread/channel ID
+            messages: Messages in OpenAI format (not mutated afterwards)
+
+        Returns:
+            Future resolving to True once the file is saved
+        """
+        path = self._thread_path(thread_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return self.writer.submit(path, messages)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete one thread's stored history, if any."""
+        path = self._thread_path(thread_id)
+        self.writer.flush(path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear_all(self) -> None:
+        """Delete every stored thread."""
+        self.writer.flush()
+        shutil.rmtree(self.shard_dir, ignore_errors=True)
+        os.makedirs(self.shard_dir, exist_ok=True)
+
+    def import_contexts(self, contexts: Dict[str, List[dict]]) -> None:
+        """
+        One-shot import of a whole-file context snapshot into shards.
+
+        Args:
+            contexts: Mapping of thread ID to messages
+        """
+        os.makedirs(self.shard_dir, exist_ok=True)
+        for thread_id, messages in contexts.items():
+            self.save_thread(thread_id, messages)
+        self.writer.flush()
+        logger.info(f"Migrated {len(contexts)} thread(s) into sharded context storage at {self.shard_dir}")
@@ -0,0 +1,257 @@
+"""LRU cache of yt-dlp extraction results that respects stream URL expiry."""
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from config import (
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_METADATA_TTL_SECONDS,
+    EXTRACTION_STREAM_URL_TTL_SECONDS,
+    EXTRACTION_STREAM_URL_MARGIN_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_ID_REGEX = re.compile(r'^[A-Za-z0-9_-]{11}$')
+YOUTUBE_HOSTS = {'youtube.com', 'm.youtube.com', 'music.youtube.com', 'youtube-nocookie.com'}
+PATH_EXPIRE_REGEX = re.compile(r'/expire/(\d+)')
+
+METADATA_FIELDS = ('id', 'title', 'duration', 'webpage_url', 'extractor_key', 'acodec')
+"""Fields kept from an info dict; the rest (formats, thumbnails, ...) is dropped to bound memory."""
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """
+    Extract the video ID from a YouTube URL.
+
+    Args:
+        url: Any URL
+
+    Returns:
+        11-character video ID, or None if the URL isn't a YouTube video
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = parsed.netloc.lower().removeprefix('www.')
+    video_id = None
+    if host == 'youtu.be':
+        video_id = parsed.path.lstrip('/').split('/')[0]
+    elif host in YOUTUBE_HOSTS:
+        if parsed.path == '/watch':
+            video_id = parse_qs(parsed.query).get('v', [None])[0]
+        elif parsed.path.startswith(('/shorts/', '/embed/', '/live/')):
+            video_id = parsed.path.split('/')[2]
+    return video_id if video_id and YOUTUBE_ID_REGEX.match(video_id) else None
+
+
+def youtube_playlist_id(url: str) -> Optional[str]:
+    """
+    Extract the playlist ID from a YouTube playlist page URL.
+
+    Watch URLs that merely carry a list= parameter (a video opened from a
+    playlist) are not treated as playlists.
+
+    Args:
+        url: Any URL
+
+    Returns:
+        Playlist ID, or None if the URL isn't a YouTube playlist page
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = parsed.netloc.lower().removeprefix('www.')
+    if host not in YOUTUBE_HOSTS or parsed.path != '/playlist':
+        return None
+    return parse_qs(parsed.query).get('list', [None])[0]
+
+
+def canonical_key(url: str) -> Optional[str]:
+    """
+    Get the cache key for a URL.
+
+    YouTube URLs in any form map to their video ID; other http(s) URLs map to
+    themselves without the fragment. Search queries (ytsearch1:...) have no key.
+
+    Args:
+        url: Track URL or search query
+
+    Returns:
+        Cache key, or None if the input can't be keyed before extraction
+    """
+    video_id = youtube_video_id(url)
+    if video_id:
+        return f"youtube:{video_id}"
+    if url.startswith(('http://', 'https://')):
+        return url.split('#', 1)[0]
+    return None
+
+
+def stream_url_expiry(stream_url: str, now: float) -> float:
+    """
+    Get when a stream URL stops working.
+
+    Signed CDN URLs (e.g. googlevideo.com) carry their expiry as an `expire`
+    query parameter or an /expire/<ts>/ path segment.
+
+    Args:
+        stream_url: Direct media URL from yt-dlp
+        now: Current Unix time
+
+    Returns:
+        Unix time the URL expires, or now + EXTRACTION_STREAM_URL_TTL_SECONDS if it doesn't say
+    """
+    try:
+        parsed = urlparse(stream_url)
+        expire = parse_qs(parsed.query).get('expire', [None])[0]
+        if expire is None:
+            match = PATH_EXPIRE_REGEX.search(parsed.path)
+            expire = match.group(1) if match else None
+        if expire is not None:
+            return float(expire)
+    except ValueError:
+        pass
+    return now + EXTRACTION_STREAM_URL_TTL_SECONDS
+
+
+class _Entry:
+    """Cached metadata plus the most recent stream URL for one track."""
+
+    __slots__ = ("metadata", "stream_url", "stream_expires", "cached_at", "cost")
+
+    def __init__(self, metadata: Dict[str, Any], stream_url: Optional[str], stream_expires: float,
+                 cached_at: float, cost: float):
+        self.metadata = metadata
+        self.stream_url = stream_url
+        self.stream_expires = stream_expires
+        self.cached_at = cached_at
+        self.cost = cost  # Seconds the extraction took, i.e. what a hit saves
+
+
+class ExtractionCache:
+    """
+    Caches extraction results by canonical video ID.
+
+    Metadata (title, duration, page URL) is kept for metadata_ttl seconds;
+    stream URLs are kept until shortly before the expiry encoded in them. The
+    cache holds at most max_entries tracks, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+        metadata_ttl: float = EXTRACTION_CACHE_METADATA_TTL_SECONDS,
+        margin: float = EXTRACTION_STREAM_URL_MARGIN_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum tracks cached
+            metadata_ttl: Seconds metadata stays valid
+            margin: Treat stream URLs as expired this many seconds early
+        """
+        self.max_entries = max(1, max_entries)
+        self.metadata_ttl = metadata_ttl
+        self.margin = margin
+        self._entries: OrderedDict = OrderedDict()
+
+        self.metadata_hits = 0
+        self.stream_hits = 0
+        self.misses = 0
+        self.stream_expired = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def get(self, url: str, need_stream: bool = False, duration: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a track.
+
+        Args:
+            url: Track URL (search queries always miss)
+            need_stream: Require a stream URL that will still work
+            duration: Track length; a stream URL must outlive playback by the margin
+
+        Returns:
+            Info dict (metadata fields, plus 'url' if a valid stream URL is cached), or None on a miss
+        """
+        key = canonical_key(url)
+        entry = self._entries.get(key) if key else None
+        now = time.time()
+        if entry is None or now - entry.cached_at > self.metadata_ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        info = dict(entry.metadata)
+        stream_valid = entry.stream_url and entry.stream_expires - self.margin - (duration or 0) > now
+        if stream_valid:
+            info['url'] = entry.stream_url
+        elif need_stream:
+            if entry.stream_url:
+                self.stream_expired += 1
+            self.misses += 1
+            return None
+
+        if need_stream:
+            self.stream_hits += 1
+        else:
+            self.metadata_hits += 1
+        self.saved_seconds += entry.cost
+        return info
+
+    def put(self, info: Dict[str, Any], cost: float = 0.0, url: Optional[str] = None) -> None:
+        """
+        Cache an extraction result.
+
+        Args:
+            info: yt-dlp info dict for a single track
+            cost: Seconds the extraction took
+            url: URL the extraction was for, used as the key if the info has no page URL
+        """
+        key = canonical_key(info.get('webpage_url') or '') or (canonical_key(url) if url else None)
+        if not key:
+            return
+
+        now = time.time()
+        stream_url = info.get('url')
+        self._entries[key] = _Entry(
+            metadata={field: info.get(field) for field in METADATA_FIELDS},
+            stream_url=stream_url,
+            stream_expires=stream_url_expiry(stream_url, now) if stream_url else 0.0,
+            cached_at=now,
+            cost=cost
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with entries, hits by kind, misses, expired stream URLs, evictions,
+            hit rate and estimated extraction seconds saved
+        """
+        hits = self.metadata_hits + self.stream_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "metadata_hits": self.metadata_hits,
+            "stream_hits": self.stream_hits,
+            "misses": self.misses,
+            "stream_expired": self.stream_expired,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
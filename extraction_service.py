@@ -0,0 +1,224 @@
+"""Bounded worker pool that runs yt-dlp extraction off the event loop."""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from config import EXTRACTION_WORKERS, EXTRACTION_MAX_PENDING, EXTRACTION_TIMEOUT_SECONDS
+from youtube_dl_pool import YoutubeDLPool
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 256
+"""Number of recent extractions latency percentiles are computed over."""
+
+
+class ExtractionError(RuntimeError):
+    """Extraction was rejected, timed out or failed; the message is safe to show users."""
+
+
+class _Job:
+    """Start/abandon handshake between a caller and the worker that runs its job."""
+
+    __slots__ = ("started", "abandoned")
+
+    def __init__(self):
+        self.started = False
+        self.abandoned = False
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ExtractionService:
+    """
+    Runs yt-dlp extract_info() calls on a dedicated thread pool.
+
+    At most `workers` extractions run at once; up to `max_pending` more may
+    wait for a worker, and anything beyond that is rejected immediately
+    rather than queued behind a slow backlog. Each call has a timeout: a call
+    that is still queued when it expires or is cancelled never starts, and one
+    that is already running is abandoned (its result discarded) while yt-dlp's
+    own socket timeout bounds how long it keeps the worker.
+
+    Workers borrow YoutubeDL instances from a pool per set of options rather
+    than constructing one per call.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_WORKERS,
+        max_pending: int = EXTRACTION_MAX_PENDING,
+        timeout: float = EXTRACTION_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            workers: Maximum concurrent extractions
+            max_pending: Maximum extractions waiting for a worker
+            timeout: Default per-call timeout in seconds
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extract")
+        self._lock = threading.Lock()  # Counters are updated from worker threads
+        self._queued = 0
+        self._running = 0
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._waits: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._pools: Dict[str, YoutubeDLPool] = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def _run(self, job: _Job, url: str, options: Dict[str, Any], submitted: float) -> Optional[Dict[str, Any]]:
+        """Worker: extract info for a URL (runs on a pool thread)."""
+        with self._lock:
+            if job.abandoned:
+                return None  # Caller gave up while it was queued
+            job.started = True
+            self._queued -= 1
+            self._running += 1
+            self._waits.append(time.monotonic() - submitted)
+        try:
+            with self._pool(options).acquire() as ydl:
+                return ydl.extract_info(url, download=False)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _pool(self, options: Dict[str, Any]) -> YoutubeDLPool:
+        """Get the instance pool for a set of options, creating it on first use."""
+        key = json.dumps(options, sort_keys=True, default=str)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = YoutubeDLPool(options)
+            return pool
+
+    def _with_timeout(self, options: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Options with yt-dlp's socket timeout capped, so a running extraction doesn't outlive its caller by much."""
+        return {**options, 'socket_timeout': min(options.get('socket_timeout', timeout), timeout)}
+
+    def warm(self, options: Dict[str, Any]) -> None:
+        """
+        Create a pool instance per worker in the background, ahead of the first lookups.
+
+        Args:
+            options: yt-dlp options lookups will use (with the default timeout)
+        """
+        self._executor.submit(self._pool(self._with_timeout(options, self.timeout)).warm, self.workers)
+
+    async def extract(self, url: str, options: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Extract info for a URL or search query without blocking the event loop.
+
+        Args:
+            url: URL or yt-dlp search string (e.g. "ytsearch1:...")
+            options: yt-dlp options
+            timeout: Seconds to wait, including time queued (default: service timeout)
+
+        Returns:
+            yt-dlp info dict
+
+        Raises:
+            ExtractionError: If the pool is saturated, the call timed out, or yt-dlp failed
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if self._queued + self._running >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise ExtractionError("too many lookups in progress, try again in a moment")
+            self._queued += 1
+            depth = self._queued
+
+        if depth > 1:
+            logger.debug(f"Extraction queued behind {depth - 1} other(s): {url}")
+
+        options = self._with_timeout(options, timeout)
+        job = _Job()
+        submitted = time.monotonic()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._run, job, url, options, submitted)
+        try:
+            # Cancelling the wrapper also cancels the pool job if it hasn't started
+            info = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(job)
+            with self._lock:
+                self.timed_out += 1
+            logger.warning(f"Extraction timed out after {timeout}s: {url}")
+            raise ExtractionError(f"timed out looking that up after {timeout:.0f}s")
+        except asyncio.CancelledError:
+            self._abandon(job)
+            with self._lock:
+                self.cancelled += 1
+            raise
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            raise ExtractionError(str(e)) from e
+
+        with self._lock:
+            self.completed += 1
+            self._latencies.append(time.monotonic() - submitted)
+        return info
+
+    def _abandon(self, job: _Job) -> None:
+        """Mark a job given up on; if it hasn't started, it never will."""
+        with self._lock:
+            if not job.started and not job.abandoned:
+                self._queued -= 1
+            job.abandoned = True
+
+    def close(self) -> None:
+        """Stop accepting work and cancel queued extractions; running ones finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+
+    def get_stats(self) -> dict:
+        """
+        Get extraction statistics.
+
+        Returns:
+            Dict with running and queued extractions, outcome counts, and p50/p95
+            latency and queue wait in seconds over recent extractions, and YoutubeDL
+            instances created, reused and recycled
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+        pool_stats = [pool.get_stats() for pool in pools]
+        with self._lock:
+            latencies = list(self._latencies)
+            waits = list(self._waits)
+            return {
+                "running": self._running,
+                "queued": self._queued,
+                "workers": self.workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "wait_p95": _percentile(waits, 0.95),
+                "ydl_created": sum(s["created"] for s in pool_stats),
+                "ydl_reused": sum(s["reused"] for s in pool_stats),
+                "ydl_recycled": sum(s["recycled"] for s in pool_stats),
+            }
@@ -0,0 +1,90 @@
+"""Keyed serial execution: ordered per key, concurrent across keys."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Lane:
+    """FIFO lock plus bookkeeping for one key."""
+
+    __slots__ = ("lock", "depth")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # asyncio.Lock wakes waiters in FIFO order
+        self.depth = 0  # running + waiting jobs
+
+
+class KeyedSerialExecutor:
+    """
+    Runs jobs for the same key one at a time, in submission order.
+
+    Jobs for different keys never wait on each other. A lane exists only while
+    it has running or queued work and is dropped as soon as it goes idle, so
+    memory stays proportional to active keys rather than every key ever seen.
+    """
+
+    def __init__(self, name: str = "lanes"):
+        """
+        Initialize the executor.
+
+        Args:
+            name: Label used in log messages
+        """
+        self.name = name
+        self._lanes: Dict[Hashable, _Lane] = {}
+        self.lanes_collected = 0
+        self.max_depth_seen = 0
+
+    async def run(self, key: Hashable, job: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a job in the lane for a key.
+
+        Args:
+            key: Lane key (e.g. channel ID)
+            job: Zero-argument callable returning an awaitable
+
+        Returns:
+            The job's result (exceptions propagate to the caller)
+        """
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+        lane.depth += 1
+        if lane.depth > self.max_depth_seen:
+            self.max_depth_seen = lane.depth
+        if lane.depth > 1:
+            logger.debug(f"{self.name}: key {key} queued behind {lane.depth - 1} job(s)")
+
+        try:
+            async with lane.lock:
+                return await job()
+        finally:
+            lane.depth -= 1
+            if lane.depth == 0:
+                del self._lanes[key]
+                self.lanes_collected += 1
+
+    def depth(self, key: Hashable) -> int:
+        """Return running plus queued jobs for a key."""
+        lane = self._lanes.get(key)
+        return lane.depth if lane else 0
+
+    def get_stats(self) -> dict:
+        """
+        Get lane statistics.
+
+        Returns:
+            Dict with active lanes, queued jobs, deepest current and all-time lane depth,
+            and lanes collected after going idle
+        """
+        depths = [lane.depth for lane in self._lanes.values()]
+        return {
+            "active_lanes": len(depths),
+            "queued": sum(depth - 1 for depth in depths),
+            "max_depth": max(depths, default=0),
+            "max_depth_seen": self.max_depth_seen,
+            "lanes_collected": self.lanes_collected,
+        }
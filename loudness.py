@@ -0,0 +1,234 @@
+"""Per-track loudness measured once (EBU R128) and applied as a static gain."""
+
+import asyncio
+import json
+import logging
+import math
+import os
+from collections import OrderedDict
+from typing import Optional, Set
+from config import (
+    LOUDNESS_FILE,
+    LOUDNESS_MAX_ENTRIES,
+    LOUDNESS_ANALYSIS_CONCURRENCY,
+    LOUDNESS_MAX_TRACK_SECONDS,
+    MUSIC_LOUDNESS_TARGET_LUFS,
+    MUSIC_MAX_GAIN_DB,
+    MUSIC_TRUE_PEAK_LIMIT_DB,
+)
+from extraction_cache import canonical_key
+from persistence_writer import get_persistence_writer
+from serialization import load_file
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_EXECUTABLE = "ffmpeg"
+RECONNECT_OPTIONS = ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5']
+
+
+def compute_gain(integrated_lufs: float, true_peak_db: float,
+                 target: float = MUSIC_LOUDNESS_TARGET_LUFS,
+                 max_gain: float = MUSIC_MAX_GAIN_DB,
+                 peak_limit: float = MUSIC_TRUE_PEAK_LIMIT_DB) -> float:
+    """
+    Compute the static gain that brings a track to the target loudness.
+
+    Args:
+        integrated_lufs: Measured integrated loudness
+        true_peak_db: Measured true peak (dBTP)
+        target: Target integrated loudness
+        max_gain: Largest boost or cut applied
+        peak_limit: Boosts never push the true peak above this
+
+    Returns:
+        Gain in dB (0 for silent or unmeasurable tracks)
+    """
+    if not math.isfinite(integrated_lufs):
+        return 0.0
+    gain = target - integrated_lufs
+    if math.isfinite(true_peak_db):
+        gain = min(gain, peak_limit - true_peak_db)  # A static gain can't limit, so don't clip
+    return round(max(-max_gain, min(max_gain, gain)), 2)
+
+
+def parse_loudnorm_output(stderr: str) -> dict:
+    """
+    Extract the JSON summary FFmpeg's loudnorm filter prints at the end of an analysis pass.
+
+    Args:
+        stderr: FFmpeg's stderr
+
+    Returns:
+        The summary (input_i, input_tp, ... as strings)
+
+    Raises:
+        ValueError: If there is no summary
+    """
+    start = stderr.rfind('{')
+    end = stderr.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("no loudnorm summary in FFmpeg output")
+    return json.loads(stderr[start:end + 1])
+
+
+class LoudnessStore:
+    """
+    Measured gain per track, keyed by canonical video ID and persisted across restarts.
+
+    A track's first play schedules a background analysis pass (FFmpeg's
+    loudnorm filter in measurement mode). Later plays apply the resulting
+    gain as a static volume filter instead of running a realtime normalizer.
+    """
+
+    def __init__(
+        self,
+        file_path: str = LOUDNESS_FILE,
+        max_entries: int = LOUDNESS_MAX_ENTRIES,
+        concurrency: int = LOUDNESS_ANALYSIS_CONCURRENCY,
+        max_track_seconds: int = LOUDNESS_MAX_TRACK_SECONDS
+    ):
+        """
+        Initialize the store and load saved measurements.
+
+        Args:
+            file_path: File measurements are saved to
+            max_entries: Maximum tracks remembered; least recently played are dropped
+            concurrency: Maximum analysis passes run at once
+            max_track_seconds: Longer tracks (and live streams) are not measured
+        """
+        self.file_path = file_path
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.max_track_seconds = max_track_seconds
+        self.writer = get_persistence_writer()
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._gains: OrderedDict = OrderedDict()  # key -> gain in dB, least recently played first
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.static = 0
+        self.unmeasured = 0
+        self.analyzed = 0
+        self.failures = 0
+
+        self.load()
+
+    def load(self) -> None:
+        """Load saved measurements."""
+        try:
+            saved = load_file(self.file_path)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning(f"Failed to parse {self.file_path}: {e}. Starting without loudness data.")
+            return
+        for key, gain in saved.items():
+            self._gains[key] = float(gain)
+        logger.info(f"Loaded loudness for {len(self._gains)} track(s)")
+
+    def save(self) -> None:
+        """Queue a save of all measurements."""
+        self.writer.submit(self.file_path, dict(self._gains))
+
+    def gain_for(self, url: str) -> Optional[float]:
+        """
+        Get a track's measured gain.
+
+        Args:
+            url: Track URL
+
+        Returns:
+            Gain in dB, or None if the track hasn't been measured
+        """
+        key = canonical_key(url)
+        gain = self._gains.get(key) if key else None
+        if gain is None:
+            self.unmeasured += 1
+            return None
+        self._gains.move_to_end(key)
+        self.static += 1
+        return gain
+
+    def analyze(self, url: str, source_input: str, duration: Optional[float], local: bool = False) -> None:
+        """
+        Measure a track in the background if it's eligible and hasn't been measured.
+
+        Args:
+            url: Track URL
+            source_input: Stream URL or local file to read the audio from
+            duration: Track length (None for live streams, which are never measured)
+            local: source_input is a local file
+        """
+        key = canonical_key(url)
+        if not key or key in self._gains or key in self._pending:
+            return
+        if not duration or duration > self.max_track_seconds:
+            return  # Live streams would never finish; very long tracks would hog the analysis slot
+        self._pending.add(key)
+        task = asyncio.create_task(self._analyze(key, source_input, local, duration))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _analyze(self, key: str, source_input: str, local: bool, duration: float) -> None:
+        """Run one analysis pass (FFmpeg runs as a separate process) and store the gain."""
+        args = [
+            FFMPEG_EXECUTABLE, '-nostdin', '-hide_banner',
+            *([] if local else RECONNECT_OPTIONS),
+            '-i', source_input, '-vn',
+            '-af', f'loudnorm=I={MUSIC_LOUDNESS_TARGET_LUFS}:TP={MUSIC_TRUE_PEAK_LIMIT_DB}:print_format=json',
+            '-f', 'null', '-',
+        ]
+        process = None
+        try:
+            async with self._semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+                )
+                # Generous: decoding is normally much faster than real time
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=max(120, duration * 2))
+            if process.returncode != 0:
+                raise RuntimeError(stderr.decode(errors='replace').strip()[-200:] or f"exit {process.returncode}")
+            summary = parse_loudnorm_output(stderr.decode(errors='replace'))
+            gain = compute_gain(float(summary['input_i']), float(summary['input_tp']))
+        except asyncio.CancelledError:
+            if process and process.returncode is None:
+                process.kill()
+            raise
+        except Exception as e:
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.failures += 1
+            logger.warning(f"Loudness analysis failed for {key}: {e!r}")
+            return
+        finally:
+            self._pending.discard(key)
+
+        self._gains[key] = gain
+        while len(self._gains) > self.max_entries:
+            self._gains.popitem(last=False)
+        self.analyzed += 1
+        logger.debug(f"Measured {key}: {summary['input_i']} LUFS, gain {gain:+.2f} dB")
+        self.save()
+
+    def close(self) -> None:
+        """Cancel analysis passes in progress."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def get_stats(self) -> dict:
+        """
+        Get loudness statistics.
+
+        Returns:
+            Dict with measured tracks, plays with a static gain vs unmeasured plays,
+            analysis passes completed, failed and in progress
+        """
+        return {
+            "measured": len(self._gains),
+            "static": self.static,
+            "unmeasured": self.unmeasured,
+            "analyzed": self.analyzed,
+            "failures": self.failures,
+            "pending": len(self._pending),
+        }
@@ -1,10 +1,12 @@
 """Main message handling orchestration."""
 
+import asyncio
 import logging
-from typing import Optional, List
+from typing import Awaitable, Callable, Optional, List
 from message_parser import parse_message, ParsedMessage
 from context_manager import ThreadContextManager
 from command_router import dispatch, CommandResult
+from keyed_executor import KeyedSerialExecutor
 from model_bridge import query_llm
 
 logger = logging.getLogger(__name__)
@@ -13,13 +15,16 @@ logger = logging.getLogger(__name__)
 class CommandContext:
     """Simple context object for command router."""
 
-    def __init__(self, message, bot_user_id: int, role_ids: List[int], reminder_manager=None, music_manager=None):
+    def __init__(self, message, bot_user_id: int, role_ids: List[int], reminder_manager=None, music_manager=None,
+                 context_manager=None, lanes=None):
         self.content = message.content
         self.anna_user_id = bot_user_id
         self.role_ids = role_ids
         self.message = message
         self.reminder_manager = reminder_manager
         self.music_manager = music_manager
+        self.context_manager = context_manager
+        self.lanes = lanes
 
 
 class MessageHandler:
@@ -40,14 +45,22 @@ class MessageHandler:
         self.reminder_manager = reminder_manager
         self.music_manager = music_manager
         self.context_manager = ThreadContextManager()
+        # Per-channel lanes keep replies in order while channels run in parallel
+        self.lanes = KeyedSerialExecutor("channel lanes")
         logger.info("MessageHandler initialized")
 
-    async def handle_message(self, message) -> Optional[str]:
+    async def handle_message(self, message, respond: Optional[Callable[[str], Awaitable]] = None) -> Optional[str]:
         """
         Main entry point for processing Discord messages.
 
+        Messages that need a reaction or response run in their channel's lane,
+        so a channel's messages are handled (and answered) in arrival order
+        while other channels proceed concurrently.
+
         Args:
             message: Discord message object
+            respond: Optional coroutine function called with the response text
+                inside the lane, so replies are sent in order too
 
         Returns:
             Response text or None if no response needed
@@ -67,6 +80,20 @@ class MessageHandler:
         logger.debug(f"Parsed message: mentioned={parsed.is_bot_mentioned}, "
                     f"command={parsed.is_command}, special={parsed.is_special_command}")
 
+        # Most channel traffic needs nothing from us, so skip the lane entirely
+        if not (parsed.is_special_command or parsed.is_passive_mention or parsed.is_bot_mentioned):
+            return None
+
+        async def job():
+            response = await self._process_message(message, parsed)
+            if response and respond:
+                await respond(response)
+            return response
+
+        return await self.lanes.run(message.channel.id, job)
+
+    async def _process_message(self, message, parsed: ParsedMessage) -> Optional[str]:
+        """Process a parsed message that may need a reaction or response."""
         # Handle special commands (reset context)
         if parsed.is_special_command:
             return await self._handle_special_command(parsed, message)
@@ -93,7 +120,8 @@ class MessageHandler:
         if parsed.is_command:
             logger.info(f"Command detected: {parsed.clean_prompt}")
             try:
-                ctx = CommandContext(message, self.bot_user_id, self.bot_role_ids, self.reminder_manager, self.music_manager)
+                ctx = CommandContext(message, self.bot_user_id, self.bot_role_ids, self.reminder_manager,
+                                     self.music_manager, self.context_manager, self.lanes)
                 result = await dispatch(ctx)
 
                 if result.handled:
@@ -128,9 +156,9 @@ class MessageHandler:
         context = self.context_manager.get_context(thread_id)
         logger.info(f"Querying LLM with {len(context)} messages of context")
 
-        # Query LLM
+        # Query LLM in a worker thread so other channels keep flowing
         try:
-            response = query_llm(context)
+            response = await asyncio.get_running_loop().run_in_executor(None, query_llm, context)
         except Exception as e:
             logger.error(f"LLM query failed: {e}", exc_info=True)
             return "brain exploded mid-thought, try again later."
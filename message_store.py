@@ -0,0 +1,156 @@
+"""Compact in-memory storage for conversation history."""
+
+import json
+import sys
+import time
+import logging
+import zlib
+from typing import Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, zlib is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class ContextMessage:
+    """A single history entry with an interned role string."""
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = sys.intern(role)
+        self.content = content
+
+    def to_dict(self) -> dict:
+        """Convert to an OpenAI-format message dict."""
+        return {"role": self.role, "content": self.content}
+
+
+def get_compressor(name: str):
+    """
+    Get (compress, decompress) functions for cold thread compression.
+
+    Args:
+        name: "zlib", "zstd" or "none"
+
+    Returns:
+        Tuple of callables, or None if compression is disabled
+    """
+    name = name.lower()
+    if name == "zstd":
+        if zstandard is not None:
+            return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+        logger.warning("zstandard not installed, compressing cold threads with zlib instead")
+        name = "zlib"
+    if name == "zlib":
+        return zlib.compress, zlib.decompress
+    if name != "none":
+        logger.warning(f"Unknown context compression '{name}', cold threads will not be compressed")
+    return None
+
+
+class ThreadHistory:
+    """
+    Bounded ring buffer of messages for one thread.
+
+    Once full, new messages overwrite the oldest slot in place, so trimming
+    never reallocates. A cold thread can be packed into a compressed blob and
+    is transparently unpacked on next access.
+    """
+
+    __slots__ = ("capacity", "last_access", "_slots", "_head", "_packed")
+
+    def __init__(self, capacity: int, messages: Iterable[dict] = ()):
+        """
+        Initialize the history.
+
+        Args:
+            capacity: Maximum number of messages kept
+            messages: Initial messages in OpenAI format (oldest first)
+        """
+        self.capacity = capacity
+        self.last_access = time.monotonic()
+        self._slots: Optional[List[ContextMessage]] = []
+        self._head = 0
+        # (blob, message count, decompressor) while the thread is cold
+        self._packed: Optional[tuple] = None
+        for message in messages:
+            self.append(message["role"], message["content"])
+
+    def __len__(self) -> int:
+        return self._packed[1] if self._packed is not None else len(self._slots)
+
+    @property
+    def is_packed(self) -> bool:
+        """True if the history is currently compressed."""
+        return self._packed is not None
+
+    def append(self, role: str, content: str) -> None:
+        """
+        Append a message, overwriting the oldest one when full.
+
+        Args:
+            role: Either "user" or "assistant"
+            content: The message content
+        """
+        self._unpack()
+        message = ContextMessage(role, content)
+        if len(self._slots) < self.capacity:
+            self._slots.append(message)
+        else:
+            self._slots[self._head] = message
+            self._head = (self._head + 1) % self.capacity
+        self.last_access = time.monotonic()
+
+    def to_dicts(self) -> List[dict]:
+        """
+        Materialize the history as OpenAI-format dicts (oldest first).
+
+        Returns:
+            List of {"role": ..., "content": ...} dicts
+        """
+        if self._packed is not None:
+            # Serving a read (e.g. a save) does not warm the thread back up
+            blob, _, decompress = self._packed
+            return [{"role": role, "content": content}
+                    for role, content in json.loads(decompress(blob))]
+        slots = self._slots
+        return [m.to_dict() for m in slots[self._head:]] + [m.to_dict() for m in slots[:self._head]]
+
+    def touch(self) -> None:
+        """Mark the history as recently used, unpacking it if needed."""
+        self._unpack()
+        self.last_access = time.monotonic()
+
+    def pack(self, compressor: tuple) -> int:
+        """
+        Compress the history in place.
+
+        Args:
+            compressor: (compress, decompress) pair from get_compressor()
+
+        Returns:
+            Size of the compressed blob in bytes
+        """
+        if self._packed is None:
+            compress, decompress = compressor
+            slots = self._slots
+            ordered = slots[self._head:] + slots[:self._head]
+            payload = json.dumps([[m.role, m.content] for m in ordered], separators=(",", ":"))
+            self._packed = (compress(payload.encode()), len(ordered), decompress)
+            self._slots = None
+            self._head = 0
+        return len(self._packed[0])
+
+    def _unpack(self) -> None:
+        """Restore a packed history to live message slots."""
+        if self._packed is None:
+            return
+        blob, _, decompress = self._packed
+        pairs = json.loads(decompress(blob))
+        self._slots = [ContextMessage(role, content) for role, content in pairs]
+        self._head = 0
+        self._packed = None
@@ -2,11 +2,30 @@
 
 import asyncio
 import logging
-from typing import Optional, Dict
-from collections import deque
+import threading
+import time
+from typing import Any, Callable, Optional, Dict, List, Set, Tuple
+from collections import Counter, deque
 from dataclasses import dataclass
 import discord
-import yt_dlp
+from audio_cache import AudioCache
+from config import (
+    AUDIO_CACHE_ENABLED,
+    MUSIC_ALONE_DISCONNECT_SECONDS,
+    MUSIC_AUDIO_MODE,
+    MUSIC_GAIN_TOLERANCE_DB,
+    MUSIC_IDLE_DISCONNECT_SECONDS,
+    MUSIC_NORMALIZE,
+    MUSIC_PRESPAWN_SECONDS,
+    MUSIC_MAX_PLAYLIST_TRACKS,
+    MUSIC_PLAYLIST_FIRST_BATCH,
+    MUSIC_PLAYLIST_TIMEOUT_SECONDS,
+)
+from extraction_cache import ExtractionCache, youtube_playlist_id
+from extraction_service import ExtractionService
+from loudness import LoudnessStore
+from search_cache import SearchCache
+from voice_sessions import StreamAdmission, read_process_usage, read_thread_cpu
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +46,27 @@ YDL_OPTIONS = {
     'source_address': '0.0.0.0',
 }
 
-# FFmpeg options for Discord streaming
-FFMPEG_OPTIONS = {
-    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-    'options': '-vn -af dynaudnorm',
+# Playlist listing: entries only (URL, title, duration), no per-track extraction
+PLAYLIST_OPTIONS = {
+    **YDL_OPTIONS,
+    'noplaylist': False,
+    'extract_flat': 'in_playlist',
 }
 
+UNAVAILABLE_TITLES = {'[Private video]', '[Deleted video]'}
+"""Placeholder titles of playlist entries that can't be played."""
+
+# FFmpeg options for Discord streaming
+FFMPEG_BEFORE_OPTIONS = '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5'
+NORMALIZE_FILTER = '-af dynaudnorm'
+
+
+FRAME_SECONDS = 0.02
+"""Audio per frame read by the voice client (20ms)."""
+
+GAP_SAMPLES = 256
+"""Number of recent track transitions gap statistics are computed over."""
+
 
 @dataclass
 class QueuedTrack:
@@ -41,13 +75,150 @@ class QueuedTrack:
     title: str
     requester_id: int
     duration: Optional[int] = None
+    stub: bool = False  # Listed from a playlist; title/duration are filled in when resolved
+
+
+def create_audio_source(
+    source_input: str,
+    acodec: Optional[str] = None,
+    local: bool = False,
+    mode: str = MUSIC_AUDIO_MODE,
+    normalize: bool = MUSIC_NORMALIZE,
+    gain_db: Optional[float] = None
+) -> Tuple[discord.AudioSource, str]:
+    """
+    Spawn FFmpeg for a track in the configured playback mode.
+
+    In "pcm" mode FFmpeg decodes to PCM and discord.py Opus-encodes every
+    frame on the player thread. In "opus" mode FFmpeg outputs Opus itself:
+    an Opus source (YouTube's WebM/Opus formats, cached files) with no
+    normalization filter is copied straight through with no decode or
+    encode at all; anything else is encoded by FFmpeg, off the bot process.
+
+    Normalization uses the track's measured gain as a static volume filter
+    (none at all if the gain is negligible), falling back to the realtime
+    dynaudnorm filter for tracks that haven't been measured yet.
+
+    Args:
+        source_input: Stream URL or local file path
+        acodec: Source audio codec reported by yt-dlp ('opus' enables passthrough)
+        local: The input is a local file (no reconnect options)
+        mode: "pcm" or "opus"
+        normalize: Normalize loudness
+        gain_db: Measured gain for the track, if known
+
+    Returns:
+        (audio source, kind) where kind is "copy", "opus" or "pcm"
+    """
+    before_options = None if local else FFMPEG_BEFORE_OPTIONS
+    audio_filter = None
+    if normalize:
+        if gain_db is None:
+            audio_filter = NORMALIZE_FILTER
+        elif abs(gain_db) >= MUSIC_GAIN_TOLERANCE_DB:
+            audio_filter = f'-af volume={gain_db:.2f}dB'
+    options = f'-vn {audio_filter}' if audio_filter else '-vn'
+    if mode == 'opus':
+        # Filters can't be combined with stream copy
+        if acodec == 'opus' and not audio_filter:
+            return discord.FFmpegOpusAudio(
+                source_input, codec='copy', before_options=before_options, options=options
+            ), 'copy'
+        return discord.FFmpegOpusAudio(source_input, before_options=before_options, options=options), 'opus'
+    return discord.FFmpegPCMAudio(source_input, before_options=before_options, options=options), 'pcm'
+
+
+class TrackedSource(discord.AudioSource):
+    """
+    Wraps an audio source to track playback position.
+
+    Position counts frames actually read by the player, so it stays correct
+    across pauses. The first frame is reported to on_first_frame, which is
+    how the gap between tracks is measured. Resource usage of the FFmpeg
+    child and the player thread can be sampled while it plays.
+    """
+
+    def __init__(self, source: discord.AudioSource, on_first_frame: Optional[Callable[[float], None]] = None):
+        self.source = source
+        self.frames = 0
+        self.on_first_frame = on_first_frame
+        self.thread_id: Optional[int] = None  # Player thread, known once it reads
+
+    @property
+    def position(self) -> float:
+        """Seconds of audio played so far."""
+        return self.frames * FRAME_SECONDS
+
+    def read(self) -> bytes:
+        data = self.source.read()
+        if data:
+            if self.frames == 0:
+                self.thread_id = threading.get_native_id()
+                if self.on_first_frame:
+                    self.on_first_frame(time.monotonic())
+            self.frames += 1
+        return data
+
+    def sample(self) -> Tuple[float, float, int]:
+        """
+        Sample resource usage so far.
+
+        Returns:
+            (FFmpeg CPU seconds, player thread CPU seconds, FFmpeg resident bytes); zeros where unavailable
+        """
+        process = getattr(self.source, '_process', None)
+        usage = read_process_usage(process.pid) if process else None
+        ffmpeg_cpu, rss = usage or (0.0, 0)
+        player_cpu = read_thread_cpu(self.thread_id) if self.thread_id else None
+        return ffmpeg_cpu, player_cpu or 0.0, rss
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self) -> None:
+        self.source.cleanup()
+
+
+class _PreparedTrack:
+    """A track resolved for playback, plus its source once spawned."""
+
+    __slots__ = ("track", "source_input", "local", "info", "source", "gain_db")
+
+    def __init__(self, track: QueuedTrack, source_input: str, local: bool = False,
+                 info: Optional[Dict[str, Any]] = None):
+        self.track = track
+        self.source_input = source_input  # Stream URL, or path in the audio cache
+        self.local = local
+        self.info = info
+        self.source: Optional[TrackedSource] = None
+        self.gain_db: Optional[float] = None  # Measured loudness gain, once looked up
 
 
 class MusicManager:
     """Manages voice connections and music playback."""
 
-    def __init__(self):
-        """Initialize music manager."""
+    def __init__(self, extractor: Optional[ExtractionService] = None, cache: Optional[ExtractionCache] = None,
+                 audio_cache: Optional[AudioCache] = None, loudness: Optional[LoudnessStore] = None,
+                 admission: Optional[StreamAdmission] = None, search_cache: Optional[SearchCache] = None):
+        """
+        Initialize music manager.
+
+        Args:
+            extractor: Service that runs yt-dlp lookups off the event loop
+            cache: Cache of extraction results by video ID
+            audio_cache: Local Opus cache (default: created if AUDIO_CACHE_ENABLED)
+            loudness: Measured per-track gains (default: created if MUSIC_NORMALIZE)
+            admission: Concurrent stream limit and per-guild usage (default: created from config)
+            search_cache: Resolved search queries (default: created from config)
+        """
+        self.extractor = extractor or ExtractionService()
+        self.extractor.warm(YDL_OPTIONS)
+        self.cache = cache or ExtractionCache()
+        self.audio_cache = audio_cache or (AudioCache() if AUDIO_CACHE_ENABLED else None)
+        self.loudness = loudness or (LoudnessStore() if MUSIC_NORMALIZE else None)
+        self.admission = admission or StreamAdmission()
+        self.search_cache = search_cache or SearchCache()
+
         self.voice_clients: Dict[int, discord.VoiceClient] = {}
         # guild_id -> VoiceClient mapping
 
@@ -60,6 +231,37 @@ class MusicManager:
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         # Event loop reference for thread-safe callback execution
 
+        self._playing: Dict[int, TrackedSource] = {}
+        # guild_id -> source of the current track
+
+        self._prefetch_tasks: Dict[int, asyncio.Task] = {}
+        # guild_id -> task resolving the head of the queue and pre-spawning its source
+
+        self._prefetch_heads: Dict[int, QueuedTrack] = {}
+        # guild_id -> queue head the prefetch task is (or was) preparing
+
+        self._prefetched: Dict[int, _PreparedTrack] = {}
+        # guild_id -> queue head resolved ahead of time (and its source, once spawned)
+
+        self._finished_at: Dict[int, float] = {}
+        # guild_id -> when the previous track ended (monotonic), until the next one makes sound
+
+        self._playlist_tasks: Dict[int, Set[asyncio.Task]] = {}
+        # guild_id -> tasks listing the rest of long playlists
+
+        self._idle_tasks: Dict[int, Tuple[str, asyncio.Task]] = {}
+        # guild_id -> (reason, task) for a pending idle disconnect
+
+        self.source_kinds: Counter = Counter()
+        # Sources opened per kind: copy (Opus passthrough), opus (FFmpeg-encoded), pcm
+
+        self.reclaimed: Counter = Counter()
+        # Sessions disconnected by the idle reaper, by reason: alone, idle, dropped
+
+        self.transition_gaps: deque = deque(maxlen=GAP_SAMPLES)
+        self.gapless_transitions = 0
+        self.cold_transitions = 0
+
     async def join_channel(self, voice_channel: discord.VoiceChannel) -> discord.VoiceClient:
         """
         Join a voice channel.
@@ -83,6 +285,7 @@ class MusicManager:
             voice_client = await voice_channel.connect()
             self.voice_clients[guild_id] = voice_client
             logger.info(f"Connected to voice channel {voice_channel.name} in guild {guild_id}")
+            self._check_idle(guild_id)
             return voice_client
         except Exception as e:
             logger.error(f"Failed to join voice channel: {e}", exc_info=True)
@@ -104,22 +307,65 @@ class MusicManager:
 
         try:
             await voice_client.disconnect()
-            del self.voice_clients[guild_id]
-
-            # Clear queue and now_playing when leaving
-            self.queues.pop(guild_id, None)
-            self.now_playing.pop(guild_id, None)
-
             logger.info(f"Disconnected from voice in guild {guild_id}")
             return True
         except Exception as e:
             logger.error(f"Error leaving voice channel: {e}", exc_info=True)
             return False
+        finally:
+            # Release everything held for the guild even if disconnecting failed
+            self.voice_clients.pop(guild_id, None)
+            self.queues.pop(guild_id, None)
+            self.now_playing.pop(guild_id, None)
+            self._record_usage(guild_id)
+            self._finished_at.pop(guild_id, None)
+            self._cancel_prefetch(guild_id)
+            for task in self._playlist_tasks.pop(guild_id, ()):
+                task.cancel()
+            self._release_stream(guild_id)
+            self._cancel_idle(guild_id)
 
     def get_voice_client(self, guild_id: int) -> Optional[discord.VoiceClient]:
         """Get the voice client for a guild."""
         return self.voice_clients.get(guild_id)
 
+    async def _extract(self, url: str, need_stream: bool = False, duration: Optional[float] = None) -> dict:
+        """
+        Get info for a track, from the caches when possible.
+
+        A search query seen before resolves to its cached track without
+        searching; unless a stream is needed, that is all the info required.
+
+        Args:
+            url: Track URL or search query
+            need_stream: The caller will play the track, so a valid stream URL is required
+            duration: Track length, so a cached stream URL must stay valid through playback
+
+        Returns:
+            Info dict for a single track ('url' is the stream URL)
+        """
+        query = url
+        resolved = self.search_cache.get(query)
+        if resolved:
+            logger.debug(f"Search cache hit for {query}: {resolved['webpage_url']}")
+            if not need_stream:
+                return resolved
+            url = resolved['webpage_url']
+
+        info = self.cache.get(url, need_stream=need_stream, duration=duration)
+        if info:
+            logger.debug(f"Extraction cache hit for {url}")
+            return info
+
+        start = time.monotonic()
+        info = await self.extractor.extract(url, YDL_OPTIONS)
+        # Search results (ytsearch:) wrap the track in 'entries'
+        if 'entries' in info:
+            info = info['entries'][0]
+            self.search_cache.put(query, info)
+        self.cache.put(info, time.monotonic() - start, url=url)
+        return info
+
     async def add_to_queue(self, guild_id: int, url: str, requester_id: int) -> tuple[bool, str]:
         """
         Add a track to the queue and start playing if nothing is playing.
@@ -136,21 +382,24 @@ class MusicManager:
         if not voice_client:
             return False, "not connected to voice channel"
 
+        if not self.admission.accepts(guild_id):
+            return False, (
+                f"all {self.admission.max_active} music streams are busy and the line is full, "
+                f"try again in a bit"
+            )
+
+        if youtube_playlist_id(url):
+            return await self._add_playlist(guild_id, url, requester_id)
+
         try:
             # Extract track info (title, duration, etc.)
-            with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl:
-                logger.info(f"Extracting info from: {url}")
-                info = ydl.extract_info(url, download=False)
-
-                # Handle search results (ytsearch:) vs direct URLs
-                if 'entries' in info:
-                    # Search result - get first entry
-                    info = info['entries'][0]
+            logger.info(f"Extracting info from: {url}")
+            info = await self._extract(url)
 
-                title = info.get('title', 'Unknown')
-                duration = info.get('duration')  # Can be None
-                # Store the actual video URL, not the search query
-                video_url = info.get('webpage_url') or info.get('url') or url
+            title = info.get('title', 'Unknown')
+            duration = info.get('duration')  # Can be None
+            # Store the actual video URL, not the search query
+            video_url = info.get('webpage_url') or info.get('url') or url
 
             # Create queued track
             track = QueuedTrack(
@@ -171,15 +420,146 @@ class MusicManager:
             # If nothing is playing, start playing
             if not voice_client.is_playing() and not voice_client.is_paused():
                 await self._play_next(guild_id)
+                if guild_id in self.admission.waiting:
+                    return True, f"added to queue: {title}. {self._waiting_message(guild_id)}"
                 return True, f"now playing: {title}"
             else:
                 queue_position = len(self.queues[guild_id])
+                if queue_position == 1:
+                    # New head of the queue: get it ready while the current track plays
+                    self._start_prefetch(guild_id)
                 return True, f"added to queue: {title} (position {queue_position})"
 
         except Exception as e:
             logger.error(f"Failed to add to queue: {e}", exc_info=True)
             return False, f"failed to add to queue: {str(e)}"
 
+    async def _add_playlist(self, guild_id: int, url: str, requester_id: int) -> tuple[bool, str]:
+        """
+        Queue a playlist without extracting every track up front.
+
+        Only the first page of entries is listed before playback starts; each
+        entry becomes a stub resolved just ahead of playing (see _prefetch).
+        The rest of the playlist is listed in the background and inserted
+        after the first page.
+
+        Args:
+            guild_id: Guild ID
+            url: Playlist URL
+            requester_id: Discord user ID who requested
+
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        voice_client = self.get_voice_client(guild_id)
+        first_batch = min(MUSIC_PLAYLIST_FIRST_BATCH, MUSIC_MAX_PLAYLIST_TRACKS)
+        try:
+            logger.info(f"Listing playlist: {url}")
+            info = await self.extractor.extract(url, {**PLAYLIST_OPTIONS, 'playlistend': first_batch})
+        except Exception as e:
+            logger.error(f"Failed to list playlist: {e}", exc_info=True)
+            return False, f"failed to add playlist: {str(e)}"
+
+        entries = list(info.get('entries') or [])
+        tracks = self._playlist_stubs(entries, requester_id)
+        if not tracks:
+            return False, "that playlist is empty or unavailable"
+
+        queue = self.queues.setdefault(guild_id, deque())
+        was_empty = not queue
+        queue.extend(tracks)
+
+        total = min(info.get('playlist_count') or len(entries), MUSIC_MAX_PLAYLIST_TRACKS)
+        if len(entries) >= first_batch and total > first_batch:
+            task = asyncio.create_task(self._list_rest(guild_id, url, requester_id, queue, tracks))
+            tasks = self._playlist_tasks.setdefault(guild_id, set())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        playlist = info.get('title') or 'playlist'
+        logger.info(f"Added playlist to queue in guild {guild_id}: {playlist} ({total} tracks)")
+        if not voice_client.is_playing() and not voice_client.is_paused():
+            await self._play_next(guild_id)
+            if guild_id in self.admission.waiting:
+                return True, f"queued {total} track(s) from {playlist}. {self._waiting_message(guild_id)}"
+            return True, f"queued {total} track(s) from {playlist}, now playing: {tracks[0].title}"
+        if was_empty:
+            self._start_prefetch(guild_id)
+        return True, f"queued {total} track(s) from {playlist}"
+
+    async def _list_rest(self, guild_id: int, url: str, requester_id: int, queue: deque,
+                         first: List[QueuedTrack]) -> None:
+        """
+        List a playlist past its first page and queue those tracks after it.
+
+        Args:
+            guild_id: Guild ID
+            url: Playlist URL
+            requester_id: Discord user ID who requested
+            queue: The guild queue the first page went into
+            first: Stubs queued from the first page
+        """
+        options = {
+            **PLAYLIST_OPTIONS,
+            'playliststart': MUSIC_PLAYLIST_FIRST_BATCH + 1,
+            'playlistend': MUSIC_MAX_PLAYLIST_TRACKS,
+        }
+        try:
+            info = await self.extractor.extract(url, options, timeout=MUSIC_PLAYLIST_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to list rest of playlist {url}: {e}")
+            return
+
+        if self.queues.get(guild_id) is not queue:
+            return  # Left voice meanwhile
+        tracks = self._playlist_stubs(list(info.get('entries') or []), requester_id)
+
+        # Keep the playlist contiguous even if other tracks were queued meanwhile
+        first_ids = {id(track) for track in first}
+        position = None
+        for i, queued in enumerate(queue):
+            if id(queued) in first_ids:
+                position = i + 1
+        if position is None:
+            if id(self.now_playing.get(guild_id)) not in first_ids:
+                return  # First page was cleared or skipped past
+            position = 0
+        for offset, track in enumerate(tracks):
+            queue.insert(position + offset, track)
+        logger.info(f"Queued {len(tracks)} more playlist track(s) in guild {guild_id}")
+        if position == 0 and tracks:
+            self._start_prefetch(guild_id)
+
+    def _playlist_stubs(self, entries: List[Dict[str, Any]], requester_id: int) -> List[QueuedTrack]:
+        """Turn flat playlist entries into queue stubs, skipping unplayable ones."""
+        tracks = []
+        for entry in entries:
+            if not entry or entry.get('title') in UNAVAILABLE_TITLES:
+                continue
+            url = entry.get('url') or entry.get('webpage_url')
+            if not url and entry.get('ie_key') == 'Youtube' and entry.get('id'):
+                url = f"https://www.youtube.com/watch?v={entry['id']}"
+            if not url:
+                continue
+            duration = entry.get('duration')
+            tracks.append(QueuedTrack(
+                url=url,
+                title=entry.get('title') or url,
+                requester_id=requester_id,
+                duration=int(duration) if duration else None,
+                stub=True
+            ))
+        return tracks
+
+    def _resolve_stub(self, track: QueuedTrack, info: Dict[str, Any]) -> None:
+        """Fill in a playlist stub's metadata from its full extraction."""
+        if not track.stub:
+            return
+        track.title = info.get('title') or track.title
+        if info.get('duration'):
+            track.duration = int(info['duration'])
+        track.stub = False
+
     async def _play_next(self, guild_id: int) -> bool:
         """
         Play the next track in queue.
@@ -192,6 +572,10 @@ class MusicManager:
         """
         voice_client = self.get_voice_client(guild_id)
         if not voice_client:
+            # Left voice; the finished track's callback may have run after the state was released
+            self.now_playing.pop(guild_id, None)
+            self._finished_at.pop(guild_id, None)
+            self._release_stream(guild_id)
             return False
 
         # Get next track from queue
@@ -199,19 +583,33 @@ class MusicManager:
         if not queue or len(queue) == 0:
             logger.info(f"Queue empty in guild {guild_id}")
             self.now_playing[guild_id] = None
+            self._finished_at.pop(guild_id, None)
+            self._cancel_prefetch(guild_id)
+            self._release_stream(guild_id)
+            self._check_idle(guild_id)
+            return False
+
+        # A session keeps its slot between tracks; a new one may have to wait for one
+        if not self.admission.admit(guild_id):
+            position = self.admission.wait(guild_id)
+            logger.info(f"All streams busy, guild {guild_id} is #{position} in line")
             return False
 
         track = queue.popleft()
         self.now_playing[guild_id] = track
+        prepared = self._take_prefetched(guild_id, track)
+        audio_source = None
 
         try:
-            # Extract audio URL (need fresh URL each time, they expire)
-            with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl:
-                info = ydl.extract_info(track.url, download=False)
-                audio_url = info['url']
-
-            # Create audio source
-            audio_source = discord.FFmpegPCMAudio(audio_url, **FFMPEG_OPTIONS)
+            if prepared and prepared.source:
+                audio_source = prepared.source
+                self.gapless_transitions += 1
+            else:
+                if not prepared:
+                    prepared = await self._prepare(track, track.duration)
+                audio_source = self._open_source(guild_id, prepared)
+                if guild_id in self._finished_at:
+                    self.cold_transitions += 1
 
             # Store event loop reference if not already stored
             if not self.loop:
@@ -220,20 +618,344 @@ class MusicManager:
             # Start playback with callback
             voice_client.play(
                 audio_source,
-                after=lambda e: self._playback_finished(guild_id, e)
+                after=lambda e: self._playback_finished(guild_id, e, audio_source)
             )
 
-            logger.info(f"Now playing in guild {guild_id}: {track.title}")
+            self._playing[guild_id] = audio_source
+            logger.info(f"Now playing in guild {guild_id}: {track.title}" + (" (cached)" if prepared.local else ""))
+            self._start_prefetch(guild_id)
+            self._check_idle(guild_id)
+            if self.audio_cache and prepared.info:
+                self.audio_cache.populate(track.url, prepared.info)
+            if self.loudness and prepared.gain_db is None:
+                duration = track.duration or (prepared.info or {}).get('duration')
+                self.loudness.analyze(track.url, prepared.source_input, duration, local=prepared.local)
             return True
 
         except Exception as e:
             logger.error(f"Failed to play track: {e}", exc_info=True)
             self.now_playing[guild_id] = None
+            if audio_source:
+                audio_source.cleanup()
             # Try to play next track if this one failed
             if self.loop:
                 asyncio.run_coroutine_threadsafe(self._play_next(guild_id), self.loop)
             return False
 
+    async def _prepare(self, track: QueuedTrack, duration: Optional[float]) -> _PreparedTrack:
+        """
+        Resolve where FFmpeg should read a track from: the local audio cache, or its stream URL.
+
+        Args:
+            track: Track to resolve
+            duration: How long a stream URL has to stay valid for
+
+        Returns:
+            The prepared track (no source spawned yet)
+        """
+        path = self.audio_cache.lookup(track.url) if self.audio_cache else None
+        if path:
+            return _PreparedTrack(track, path, local=True)
+        # Stream URLs expire, so only reuse a cached one that outlives playback
+        info = await self._extract(track.url, need_stream=True, duration=duration)
+        self._resolve_stub(track, info)
+        return _PreparedTrack(track, info['url'], info=info)
+
+    def _open_source(self, guild_id: int, prepared: _PreparedTrack) -> TrackedSource:
+        """Spawn FFmpeg for a prepared track."""
+        # Cached files are always Opus
+        acodec = 'opus' if prepared.local else (prepared.info or {}).get('acodec')
+        if self.loudness:
+            prepared.gain_db = self.loudness.gain_for(prepared.track.url)
+        source, kind = create_audio_source(
+            prepared.source_input, acodec, local=prepared.local, gain_db=prepared.gain_db
+        )
+        self.source_kinds[kind] += 1
+        # The first frame is read in the player thread; the gap is recorded on the loop
+        prepared.source = TrackedSource(
+            source, on_first_frame=lambda t: self.loop.call_soon_threadsafe(self._track_started, guild_id, t)
+        )
+        return prepared.source
+
+    def _record_usage(
+        self,
+        guild_id: int,
+        source: Optional[TrackedSource] = None,
+        usage: Optional[Tuple[float, float, int]] = None
+    ) -> None:
+        """
+        Stop tracking a guild's current source and fold its resource usage into the guild's session.
+
+        Args:
+            guild_id: Guild ID
+            source: Source that finished; nothing is done if it is no longer the current one
+            usage: Its usage sampled when it finished (sampled now if None)
+        """
+        current = self._playing.get(guild_id)
+        if not current or (source and current is not source):
+            return
+        del self._playing[guild_id]
+        session = self.admission.sessions.get(guild_id)
+        if session:
+            # Before the slot is released and before the player's cleanup kills FFmpeg
+            session.add(*(usage or current.sample()))
+
+    def _release_stream(self, guild_id: int) -> None:
+        """Free a guild's streaming slot and start the sessions waiting for one."""
+        for next_guild in self.admission.release(guild_id):
+            logger.info(f"Stream slot freed, starting waiting session in guild {next_guild}")
+            asyncio.create_task(self._play_next(next_guild))
+
+    def _idle_reason(self, guild_id: int) -> Optional[str]:
+        """Why a guild's voice session could be disconnected: "alone", "idle", or None if it's in use."""
+        voice_client = self.voice_clients.get(guild_id)
+        if not voice_client:
+            return None
+        channel = voice_client.channel
+        if channel and not any(not member.bot for member in channel.members):
+            return "alone"
+        if (self.queues.get(guild_id) or voice_client.is_playing() or voice_client.is_paused()
+                or guild_id in self.admission.waiting):
+            return None
+        return "idle"
+
+    def _check_idle(self, guild_id: int) -> None:
+        """Schedule a disconnect for a guild that became idle or alone, or cancel one if it's in use again."""
+        reason = self._idle_reason(guild_id)
+        pending = self._idle_tasks.get(guild_id)
+        if pending and pending[0] == reason:
+            return
+        self._cancel_idle(guild_id)
+        timeout = MUSIC_ALONE_DISCONNECT_SECONDS if reason == "alone" else MUSIC_IDLE_DISCONNECT_SECONDS
+        if reason and timeout > 0:
+            task = asyncio.create_task(self._disconnect_when_idle(guild_id, reason, timeout))
+            self._idle_tasks[guild_id] = (reason, task)
+
+    def _cancel_idle(self, guild_id: int) -> None:
+        pending = self._idle_tasks.pop(guild_id, None)
+        if pending and pending[1] is not asyncio.current_task():
+            pending[1].cancel()
+
+    async def _disconnect_when_idle(self, guild_id: int, reason: str, timeout: float) -> None:
+        """Leave voice once a guild has stayed idle (or alone) for the timeout."""
+        await asyncio.sleep(timeout)
+        self._idle_tasks.pop(guild_id, None)
+        if self._idle_reason(guild_id) != reason:
+            self._check_idle(guild_id)  # State changed without an event; start over
+            return
+        logger.info(f"Leaving voice in guild {guild_id}: {reason} for {timeout}s")
+        await self.leave_channel(guild_id)
+        self.reclaimed[reason] += 1
+
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
+                                    after: discord.VoiceState) -> None:
+        """
+        React to voice state changes in guilds the bot is connected in.
+
+        Someone joining or leaving the bot's channel starts or cancels the idle
+        timer; the bot itself being disconnected (kicked, channel deleted)
+        releases the guild's state right away.
+
+        Args:
+            member: Member whose voice state changed
+            before: Previous voice state
+            after: New voice state
+        """
+        guild_id = member.guild.id
+        voice_client = self.voice_clients.get(guild_id)
+        if not voice_client:
+            return
+        if member.id == member.guild.me.id and after.channel is None:
+            logger.info(f"Disconnected from voice externally in guild {guild_id}")
+            await self.leave_channel(guild_id)
+            self.reclaimed["dropped"] += 1
+            return
+        self._check_idle(guild_id)
+
+    def get_voice_stats(self) -> dict:
+        """
+        Get voice session statistics.
+
+        Returns:
+            Dict with connected sessions, pending idle disconnects, and sessions
+            reclaimed because the bot was alone, idle, or dropped from voice
+        """
+        return {
+            "connected": len(self.voice_clients),
+            "pending": len(self._idle_tasks),
+            "alone": self.reclaimed["alone"],
+            "idle": self.reclaimed["idle"],
+            "dropped": self.reclaimed["dropped"],
+        }
+
+    def _waiting_message(self, guild_id: int) -> str:
+        position = self.admission.waiting.index(guild_id) + 1
+        return (
+            f"all {self.admission.max_active} music streams are busy, you're #{position} in line "
+            f"and will start when one frees up"
+        )
+
+    def get_session_usage(self) -> Dict[int, dict]:
+        """
+        Get resource usage of each active streaming session.
+
+        Returns:
+            Dict of guild ID -> dict with tracks played, FFmpeg and player thread
+            CPU seconds, share of one core over the session, current and peak
+            FFmpeg resident bytes, and session length in seconds
+        """
+        now = time.monotonic()
+        usage = {}
+        for guild_id, session in list(self.admission.sessions.items()):
+            ffmpeg_cpu, player_cpu, rss = 0.0, 0.0, 0
+            source = self._playing.get(guild_id)
+            if source:
+                ffmpeg_cpu, player_cpu, rss = source.sample()
+            ffmpeg_cpu += session.ffmpeg_cpu
+            player_cpu += session.player_cpu
+            seconds = now - session.started_at
+            usage[guild_id] = {
+                "tracks": session.tracks + (1 if source else 0),
+                "ffmpeg_cpu": ffmpeg_cpu,
+                "player_cpu": player_cpu,
+                "cpu_share": (ffmpeg_cpu + player_cpu) / seconds if seconds > 0 else 0.0,
+                "rss": rss,
+                "peak_rss": max(session.peak_rss, rss),
+                "seconds": seconds,
+            }
+        return usage
+
+    def _track_finished(
+        self,
+        guild_id: int,
+        finished_at: float,
+        source: Optional[TrackedSource],
+        usage: Optional[Tuple[float, float, int]]
+    ) -> None:
+        """Record when a track stopped playing, for the gap to the next one, and fold in its usage."""
+        self._finished_at[guild_id] = finished_at
+        self._record_usage(guild_id, source, usage)
+
+    def _track_started(self, guild_id: int, started_at: float) -> None:
+        """Record the silence between the previous track ending and this one's first frame."""
+        finished_at = self._finished_at.pop(guild_id, None)
+        if finished_at is not None:
+            gap = started_at - finished_at
+            self.transition_gaps.append(gap)
+            logger.debug(f"Track transition gap in guild {guild_id}: {gap * 1000:.0f}ms")
+
+    def _start_prefetch(self, guild_id: int) -> None:
+        """Start preparing the head of the queue in the background, restarting if the head changed."""
+        queue = self.queues.get(guild_id)
+        head = queue[0] if queue else None
+        task = self._prefetch_tasks.get(guild_id)
+        if head is not None and self._prefetch_heads.get(guild_id) is head:
+            if (task and not task.done()) or guild_id in self._prefetched:
+                return
+        # Whatever is being prepared is no longer next (e.g. >clear then >play)
+        self._cancel_prefetch(guild_id)
+        track = self.now_playing.get(guild_id)
+        source = self._playing.get(guild_id)
+        if track and source and head is not None:
+            self._prefetch_heads[guild_id] = head
+            self._prefetch_tasks[guild_id] = asyncio.create_task(self._prefetch(guild_id, track, source))
+
+    async def _prefetch(self, guild_id: int, current: QueuedTrack, current_source: TrackedSource) -> None:
+        """
+        Resolve the head of the queue now, and spawn its source shortly before the current track ends.
+
+        Args:
+            guild_id: Guild ID
+            current: Track now playing
+            current_source: Its source, for the playback position
+        """
+        queue = self.queues.get(guild_id)
+        if not queue:
+            return
+        next_track = queue[0]
+
+        try:
+            # The stream URL has to last through the rest of this track and all of the next
+            remaining = (current.duration or 0) + (next_track.duration or 0)
+            prepared = await self._prepare(next_track, remaining)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch next track in guild {guild_id}: {e}")
+            return
+        self._prefetched[guild_id] = prepared
+
+        if not current.duration:
+            return  # Unknown length (e.g. live stream): resolved only, spawned on demand
+
+        # Position only advances while audio is read, so pauses just extend the wait
+        while self.now_playing.get(guild_id) is current:
+            remaining = current.duration - current_source.position
+            if remaining <= MUSIC_PRESPAWN_SECONDS:
+                break
+            await asyncio.sleep(max(remaining - MUSIC_PRESPAWN_SECONDS, 0.5))
+
+        queue = self.queues.get(guild_id)
+        if self.now_playing.get(guild_id) is not current or not queue or queue[0] is not next_track:
+            return
+        if self._prefetched.get(guild_id) is not prepared:
+            return
+
+        self._open_source(guild_id, prepared)
+        logger.debug(f"Pre-spawned next track in guild {guild_id}: {next_track.title}")
+
+    def _take_prefetched(self, guild_id: int, track: QueuedTrack) -> Optional[_PreparedTrack]:
+        """
+        Claim what prefetching prepared for a track about to play.
+
+        Args:
+            guild_id: Guild ID
+            track: Track about to play
+
+        Returns:
+            The prepared track (with its source if already spawned), or None if it wasn't prepared
+        """
+        task = self._prefetch_tasks.pop(guild_id, None)
+        if task and not task.done():
+            task.cancel()
+        self._prefetch_heads.pop(guild_id, None)
+        prepared = self._prefetched.pop(guild_id, None)
+        if prepared is None:
+            return None
+        if prepared.track is not track:
+            # Queue changed since (e.g. cleared); don't leave FFmpeg running
+            if prepared.source:
+                prepared.source.cleanup()
+            return None
+        return prepared
+
+    def _cancel_prefetch(self, guild_id: int) -> None:
+        """Cancel prefetching and stop any pre-spawned source for a guild."""
+        task = self._prefetch_tasks.pop(guild_id, None)
+        if task and not task.done():
+            task.cancel()
+        self._prefetch_heads.pop(guild_id, None)
+        prepared = self._prefetched.pop(guild_id, None)
+        if prepared and prepared.source:
+            prepared.source.cleanup()
+
+    def get_transition_stats(self) -> dict:
+        """
+        Get track transition statistics.
+
+        Returns:
+            Dict with sources opened per kind (copy, opus, pcm), gapless (pre-spawned)
+            and cold transitions, and p50/max gap in seconds over recent transitions
+        """
+        gaps = sorted(self.transition_gaps)
+        return {
+            "copy": self.source_kinds["copy"],
+            "opus": self.source_kinds["opus"],
+            "pcm": self.source_kinds["pcm"],
+            "gapless": self.gapless_transitions,
+            "cold": self.cold_transitions,
+            "gap_p50": gaps[len(gaps) // 2] if gaps else 0.0,
+            "gap_max": gaps[-1] if gaps else 0.0,
+        }
+
     async def play_url(self, guild_id: int, url: str) -> bool:
         """
         Play audio from a URL.
@@ -256,14 +978,15 @@ class MusicManager:
                 voice_client.stop()
 
             # Extract audio info with yt-dlp
-            with yt_dlp.YoutubeDL(YDL_OPTIONS) as ydl:
-                logger.info(f"Extracting audio info from: {url}")
-                info = ydl.extract_info(url, download=False)
-                audio_url = info['url']
-                title = info.get('title', 'Unknown')
+            logger.info(f"Extracting audio info from: {url}")
+            info = await self._extract(url, need_stream=True)
+            audio_url = info['url']
+            title = info.get('title', 'Unknown')
 
             # Create audio source
-            audio_source = discord.FFmpegPCMAudio(audio_url, **FFMPEG_OPTIONS)
+            gain_db = self.loudness.gain_for(url) if self.loudness else None
+            audio_source, kind = create_audio_source(audio_url, info.get('acodec'), gain_db=gain_db)
+            self.source_kinds[kind] += 1
 
             # Start playback
             voice_client.play(audio_source, after=lambda e: self._playback_finished(guild_id, e))
@@ -274,13 +997,16 @@ class MusicManager:
             logger.error(f"Failed to play audio: {e}", exc_info=True)
             return False
 
-    def _playback_finished(self, guild_id: int, error):
+    def _playback_finished(self, guild_id: int, error, source: Optional[TrackedSource] = None):
         """
         Callback when audio playback finishes.
 
         NOTE: This runs in a thread pool, NOT the event loop!
         Must use asyncio.run_coroutine_threadsafe() to call async functions.
         """
+        finished_at = time.monotonic()
+        # Sampled here: the player's cleanup kills FFmpeg as soon as this returns
+        usage = source.sample() if source else None
         if error:
             logger.error(f"Playback error in guild {guild_id}: {error}")
         else:
@@ -291,6 +1017,8 @@ class MusicManager:
 
         # Play next track if available
         if self.loop:
+            # Bookkeeping belongs to the loop; queued ahead of _play_next()
+            self.loop.call_soon_threadsafe(self._track_finished, guild_id, finished_at, source, usage)
             # Schedule _play_next() to run in the event loop
             asyncio.run_coroutine_threadsafe(self._play_next(guild_id), self.loop)
         else:
@@ -319,3 +1047,34 @@ class MusicManager:
             voice_client.stop()
             return True
         return False
+
+    def clear_queue(self, guild_id: int) -> int:
+        """
+        Clear a guild's queue, including playlist tracks still being listed and the prefetched next track.
+
+        Args:
+            guild_id: Guild ID
+
+        Returns:
+            Number of tracks removed
+        """
+        queue = self.queues.get(guild_id)
+        count = len(queue) if queue else 0
+        if queue:
+            queue.clear()
+        for task in self._playlist_tasks.pop(guild_id, ()):
+            task.cancel()
+        self._cancel_prefetch(guild_id)
+        return count
+
+    def close(self) -> None:
+        """Stop pre-spawned sources, idle timers, audio cache transcodes and the extraction workers."""
+        for guild_id in list(self._prefetched):
+            self._cancel_prefetch(guild_id)
+        for guild_id in list(self._idle_tasks):
+            self._cancel_idle(guild_id)
+        if self.audio_cache:
+            self.audio_cache.close()
+        if self.loudness:
+            self.loudness.close()
+        self.extractor.close()
@@ -0,0 +1,166 @@
+"""Background persistence writer that keeps file I/O off the event loop."""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+from utils import atomic_save
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingWrite:
+    """Latest data queued for one file plus every caller waiting on it."""
+
+    __slots__ = ("data", "futures")
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.futures: List[Future] = []
+
+
+class PersistenceWriter:
+    """
+    Serializes and atomically saves files on a dedicated background thread.
+
+    Saves are keyed by file path: if a file is saved again before its previous
+    write started, only the newest data is written and all callers' futures
+    resolve together. Callers must pass data they will not mutate afterwards.
+    """
+
+    def __init__(self):
+        """Initialize the writer and start its thread."""
+        self._pending: Dict[str, _PendingWrite] = OrderedDict()
+        self._in_flight: Optional[str] = None
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+
+        self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path: str, data: Any) -> Future:
+        """
+        Queue data to be saved to a file.
+
+        Args:
+            file_path: Target file path
+            data: JSON-serializable data (not mutated after submission)
+
+        Returns:
+            Future resolving to True once the data is durable, False if the save failed
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                # Late saves after shutdown are written inline so they are not lost
+                future.set_result(atomic_save(data, file_path))
+                return future
+
+            pending = self._pending.get(file_path)
+            if pending:
+                pending.data = data
+                self.coalesced += 1
+            else:
+                pending = self._pending[file_path] = _PendingWrite(data)
+            pending.futures.append(future)
+            self._cond.notify()
+        return future
+
+    def _run(self) -> None:
+        """Writer loop: take the oldest pending file and save its newest data."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                file_path, pending = self._pending.popitem(last=False)
+                self._in_flight = file_path
+
+            try:
+                ok = atomic_save(pending.data, file_path)
+            except Exception as e:
+                logger.error(f"Persistence writer failed to save {file_path}: {e}", exc_info=True)
+                ok = False
+
+            with self._cond:
+                self._in_flight = None
+                self.writes += 1
+                if not ok:
+                    self.failures += 1
+                self._cond.notify_all()
+            for future in pending.futures:
+                future.set_result(ok)
+
+    def flush(self, file_path: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Block until queued saves are written.
+
+        Args:
+            file_path: Only wait for this file, or None to wait for all files
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if everything requested was written before the timeout
+        """
+        def idle():
+            if file_path is None:
+                return not self._pending and self._in_flight is None
+            return file_path not in self._pending and self._in_flight != file_path
+
+        with self._cond:
+            return self._cond.wait_for(idle, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Drain all queued saves and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Persistence writer did not drain within {timeout}s")
+        else:
+            logger.info(f"Persistence writer drained ({self.writes} writes, {self.coalesced} coalesced)")
+
+    def get_stats(self) -> dict:
+        """
+        Get writer statistics.
+
+        Returns:
+            Dict with completed writes, coalesced saves, failures and queue depth
+        """
+        with self._cond:
+            return {
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "failures": self.failures,
+                "pending": len(self._pending),
+            }
+
+
+_writer: Optional[PersistenceWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_persistence_writer() -> PersistenceWriter:
+    """
+    Get the process-wide persistence writer, starting it on first use.
+
+    Returns:
+        Shared PersistenceWriter instance
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PersistenceWriter()
+        return _writer
@@ -0,0 +1,316 @@
+"""Recurring reminder rules and next-fire computation."""
+
+import bisect
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import List, Optional, Sequence, Tuple
+from config import REMINDER_MIN_RECURRENCE_SECONDS, REMINDER_TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+FULL_DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+WEEKDAYS = frozenset(range(5))
+WEEKENDS = frozenset((5, 6))
+ALL_DAYS = frozenset(range(7))
+
+INTERVAL_REGEX = re.compile(r'^(\d+)([mhdw])$', re.I)
+CLOCK_REGEX = re.compile(r'^([01]?\d|2[0-3]):([0-5]\d)$')
+INTERVAL_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+CRON_SEARCH_YEARS = 5
+"""Give up on cron expressions that never match (e.g. Feb 30) after this many years."""
+
+
+def get_timezone(name: str = REMINDER_TIMEZONE) -> tzinfo:
+    """
+    Get the timezone calendar rules are evaluated in.
+
+    Args:
+        name: IANA timezone name
+
+    Returns:
+        tzinfo, falling back to UTC if the name or tz database is unavailable
+    """
+    if name.upper() == "UTC":
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        logger.warning(f"Timezone '{name}' unavailable ({e}), using UTC")
+        return timezone.utc
+
+
+class Recurrence(ABC):
+    """Abstract base class for recurrence rules."""
+
+    @abstractmethod
+    def next_fire(self, previous: float, after: float) -> Optional[float]:
+        """
+        Compute the next fire time.
+
+        Args:
+            previous: The occurrence that just fired (Unix timestamp)
+            after: Only return times strictly after this (usually now)
+
+        Returns:
+            Unix timestamp of the next occurrence, or None if there is none
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def spec(self) -> str:
+        """Canonical text form, as stored on the reminder and accepted by parse_recurrence()."""
+        pass
+
+    def describe(self) -> str:
+        """Short human-readable description."""
+        return self.spec
+
+
+class IntervalRecurrence(Recurrence):
+    """Every N minutes/hours/days/weeks, counted from the previous occurrence."""
+
+    def __init__(self, count: int, unit: str):
+        self.count = count
+        self.unit = unit.lower()
+        self.seconds = count * INTERVAL_UNITS[self.unit]
+
+    def next_fire(self, previous: float, after: float) -> Optional[float]:
+        # Skip occurrences missed while offline without stepping through them
+        steps = max(1, math.floor((after - previous) / self.seconds) + 1)
+        return previous + steps * self.seconds
+
+    @property
+    def spec(self) -> str:
+        return f"every {self.count}{self.unit}"
+
+
+class WeeklyRecurrence(Recurrence):
+    """At a wall-clock time on a set of weekdays (daily is all seven)."""
+
+    def __init__(self, days: frozenset, hour: int, minute: int, tz: Optional[tzinfo] = None):
+        self.days = frozenset(days)
+        self.at = time(hour, minute)
+        self.tz = tz or get_timezone()
+
+    def next_fire(self, previous: float, after: float) -> Optional[float]:
+        today = datetime.fromtimestamp(after, self.tz).date()
+        # At most a week ahead, so this is constant time
+        for offset in range(8):
+            day = today + timedelta(days=offset)
+            if day.weekday() in self.days:
+                fire = datetime.combine(day, self.at, tzinfo=self.tz).timestamp()
+                if fire > after:
+                    return fire
+        return None
+
+    @property
+    def spec(self) -> str:
+        clock = self.at.strftime("%H:%M")
+        if self.days == ALL_DAYS:
+            return f"daily {clock}"
+        if self.days == WEEKDAYS:
+            return f"weekdays {clock}"
+        if self.days == WEEKENDS:
+            return f"weekends {clock}"
+        return f"{','.join(DAY_NAMES[d] for d in sorted(self.days))} {clock}"
+
+    def describe(self) -> str:
+        day_part, clock = self.spec.split(" ", 1)
+        return f"{day_part} at {clock}"
+
+
+def _parse_cron_field(field: str, low: int, high: int, names: Sequence[str] = ()) -> List[int]:
+    """Parse one cron field (*, */n, a-b, a-b/n, lists, names) into sorted values."""
+    values = set()
+    for part in field.lower().split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError(f"invalid step in cron field `{field}`")
+        if rng == "*":
+            start, end = low, high
+        else:
+            bounds = [names.index(b) if b in names else int(b) for b in rng.split("-", 1)]
+            start, end = bounds[0], bounds[-1]
+            if "/" in part and len(bounds) == 1:
+                end = high
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron field `{field}` out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronRecurrence(Recurrence):
+    """Standard five-field cron expression: minute hour day-of-month month day-of-week."""
+
+    def __init__(self, expression: str, tz: Optional[tzinfo] = None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError("cron expressions need 5 fields: minute hour day month weekday")
+        self.expression = " ".join(fields)
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        # Cron weekdays count from Sunday (0 or 7); Python's count from Monday
+        cron_days = _parse_cron_field(fields[4], 0, 7, ["sun"] + DAY_NAMES[:6])
+        self.weekdays = frozenset((d - 1) % 7 for d in cron_days)
+        # Like cron: if both day fields are restricted, either may match
+        self.day_or = fields[2] != "*" and fields[4] != "*"
+        self.tz = tz or get_timezone()
+
+    def _day_matches(self, day: date) -> bool:
+        dom = day.day in self.days
+        dow = day.weekday() in self.weekdays
+        return (dom or dow) if self.day_or else (dom and dow)
+
+    def next_fire(self, previous: float, after: float) -> Optional[float]:
+        t = datetime.fromtimestamp(after, self.tz).replace(second=0, microsecond=0, tzinfo=None)
+        t += timedelta(minutes=1)
+        limit = t.year + CRON_SEARCH_YEARS
+
+        # Each step jumps straight to the next allowed value of one field (bisect),
+        # so this touches at most a few dozen candidates rather than every minute
+        while t.year <= limit:
+            if t.month not in self.months:
+                i = bisect.bisect_left(self.months, t.month)
+                year, month = (t.year, self.months[i]) if i < len(self.months) else (t.year + 1, self.months[0])
+                t = datetime(year, month, 1)
+                continue
+            if not self._day_matches(t.date()):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                i = bisect.bisect_left(self.hours, t.hour)
+                if i == len(self.hours):
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                else:
+                    t = t.replace(hour=self.hours[i], minute=0)
+                continue
+            if t.minute not in self.minutes:
+                i = bisect.bisect_left(self.minutes, t.minute)
+                if i == len(self.minutes):
+                    t = t.replace(minute=0) + timedelta(hours=1)
+                else:
+                    t = t.replace(minute=self.minutes[i])
+                continue
+            fire = t.replace(tzinfo=self.tz).timestamp()
+            if fire > after:
+                return fire
+            t += timedelta(minutes=1)  # Repeated wall-clock time at a DST change
+        return None
+
+    @property
+    def spec(self) -> str:
+        return f"cron {self.expression}"
+
+
+def _parse_clock(text: str) -> Tuple[int, int]:
+    m = CLOCK_REGEX.match(text)
+    if not m:
+        raise ValueError(f"invalid time of day `{text}` - use 24h `HH:MM`, e.g. `09:30`")
+    return int(m.group(1)), int(m.group(2))
+
+
+def _parse_days(text: str) -> Optional[frozenset]:
+    """Parse daily/weekdays/weekends or a comma-separated list of day names."""
+    text = text.lower()
+    if text == "daily":
+        return ALL_DAYS
+    if text == "weekdays":
+        return WEEKDAYS
+    if text == "weekends":
+        return WEEKENDS
+    names = text.split(",")
+    if all(name in DAY_NAMES or name in FULL_DAY_NAMES for name in names):
+        return frozenset(DAY_NAMES.index(name[:3]) for name in names)
+    return None
+
+
+def parse_recurrence(text: str) -> Tuple[Optional[Recurrence], str]:
+    """
+    Parse a recurrence rule from the start of some text.
+
+    Supported rules:
+        every 30m, every 2h, every 1d, every 2w
+        daily 09:00, weekdays 09:00, weekends 10:30, mon,wed,fri 18:00
+        cron 0 9 * * 1-5
+
+    Args:
+        text: Text that may start with a rule (e.g. ">remind" arguments)
+
+    Returns:
+        (rule, rest of the text), or (None, text) if the text doesn't start with a rule
+
+    Raises:
+        ValueError: If the text starts like a rule but is malformed
+    """
+    tokens = text.split()
+    if not tokens:
+        return None, text
+    keyword = tokens[0].lower()
+
+    if keyword == "every":
+        m = INTERVAL_REGEX.match(tokens[1]) if len(tokens) > 1 else None
+        if not m:
+            raise ValueError("use `every <number><m|h|d|w>`, e.g. `every 2h`")
+        rule = IntervalRecurrence(int(m.group(1)), m.group(2))
+        if rule.seconds < REMINDER_MIN_RECURRENCE_SECONDS:
+            raise ValueError(f"recurring reminders can repeat at most every {REMINDER_MIN_RECURRENCE_SECONDS}s")
+        return rule, " ".join(tokens[2:])
+
+    if keyword == "cron":
+        if len(tokens) < 6:
+            raise ValueError("use `cron <minute> <hour> <day> <month> <weekday>`, e.g. `cron 0 9 * * 1-5`")
+        return CronRecurrence(" ".join(tokens[1:6])), " ".join(tokens[6:])
+
+    days = _parse_days(keyword)
+    if days is not None:
+        if len(tokens) < 2:
+            raise ValueError(f"`{keyword}` needs a time of day, e.g. `{keyword} 09:00`")
+        hour, minute = _parse_clock(tokens[1])
+        return WeeklyRecurrence(days, hour, minute), " ".join(tokens[2:])
+
+    return None, text
+
+
+def recurrence_from_spec(spec: str) -> Optional[Recurrence]:
+    """
+    Rebuild a stored recurrence rule.
+
+    Args:
+        spec: Recurrence.spec of a stored reminder
+
+    Returns:
+        The rule, or None if the spec is invalid
+    """
+    try:
+        rule, rest = parse_recurrence(spec)
+    except ValueError as e:
+        logger.warning(f"Invalid stored recurrence `{spec}`: {e}")
+        return None
+    return rule if rule and not rest else None
+
+
+def next_occurrence(spec: str, previous: float, after: float) -> Optional[float]:
+    """
+    Compute when a recurring reminder fires next.
+
+    Args:
+        spec: Stored recurrence rule
+        previous: The occurrence that just fired
+        after: Only return times strictly after this (usually now)
+
+    Returns:
+        Unix timestamp of the next occurrence, or None if the rule is invalid or exhausted
+    """
+    rule = recurrence_from_spec(spec)
+    return rule.next_fire(previous, after) if rule else None
+
@@ -0,0 +1,190 @@
+"""Batched, concurrent delivery of due reminders."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from config import REMINDER_DELIVERY_CONCURRENCY, REMINDER_RETRY_SECONDS, REMINDER_MAX_LATENESS_SECONDS
+from reminder_manager import Reminder
+from commands.remind import format_duration
+
+logger = logging.getLogger(__name__)
+
+DISCORD_MESSAGE_LIMIT = 2000
+"""Maximum characters in a single Discord message."""
+
+
+def format_reminder(reminder: Reminder) -> str:
+    """Format a reminder as a single line mentioning its owner."""
+    return f"<@{reminder.user_id}> reminder: {reminder.message}"
+
+
+def format_missed_reminder(reminder: Reminder, now: float) -> str:
+    """Format a reminder that fired late, saying how late."""
+    late = format_duration(max(int(now - reminder.due_time), 0))
+    return f"{format_reminder(reminder)} (due {late} ago)"
+
+
+def chunk_lines(lines: List[str], limit: int = DISCORD_MESSAGE_LIMIT, reserved: int = 0) -> List[List[int]]:
+    """
+    Group lines into as few messages as fit within the message limit.
+
+    Args:
+        lines: Lines for a single channel, in order
+        limit: Maximum characters per message
+        reserved: Characters reserved at the start of the first message (e.g. a header line)
+
+    Returns:
+        List of line index groups, each small enough to send as one message
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    length = reserved
+    for i, line in enumerate(lines):
+        # +1 for the newline joining it to the previous line
+        if current and length + 1 + len(line) > limit:
+            chunks.append(current)
+            current, length = [], 0
+        length += len(line) + (1 if current or length else 0)
+        current.append(i)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def deliver_reminders(
+    due_reminders: List[Reminder],
+    get_channel: Callable[[int], Optional[Any]],
+    reminder_manager,
+    concurrency: int = REMINDER_DELIVERY_CONCURRENCY,
+    retry_seconds: float = REMINDER_RETRY_SECONDS,
+    catch_up: bool = False,
+    max_lateness: float = REMINDER_MAX_LATENESS_SECONDS
+) -> Dict[str, int]:
+    """
+    Deliver a batch of due reminders.
+
+    Reminders are grouped by channel and sent as combined messages, with up to
+    `concurrency` channels being sent to at once. Messages within a channel
+    are sent in due order. Delivered reminders are completed with a single
+    complete_reminders() call (recurring ones move to their next
+    occurrence); reminders for channels that no longer exist are removed;
+    reminders in a message that failed to send are rescheduled with
+    retry_later().
+
+    In catch-up mode (reminders missed while the bot was offline), each
+    channel's first message starts with a summary line, every reminder says
+    how late it is, and reminders more than max_lateness overdue are
+    completed without being sent.
+
+    Args:
+        due_reminders: Reminders claimed from the reminder manager
+        get_channel: Returns the channel for a channel ID, or None if unknown
+        reminder_manager: Manager the reminders were claimed from
+        concurrency: Maximum channels sent to concurrently
+        retry_seconds: Delay before retrying a failed delivery
+        catch_up: Deliver as a summary of missed reminders
+        max_lateness: In catch-up mode, skip reminders overdue by more than this (0 to send all)
+
+    Returns:
+        Dict with counts of delivered, dropped (channel not found), stale (skipped), failed and messages sent
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    done: List[str] = []
+    dropped: List[str] = []
+    failed: List[str] = []
+    stats = {"delivered": 0, "dropped": 0, "stale": 0, "failed": 0, "messages": 0}
+
+    by_channel: Dict[int, List[Reminder]] = defaultdict(list)
+    for reminder in due_reminders:
+        if catch_up and max_lateness > 0 and now - reminder.due_time > max_lateness:
+            # Completed in the same write as the delivered ones; recurring ones move on
+            done.append(reminder.id)
+            stats["stale"] += 1
+        else:
+            by_channel[reminder.channel_id].append(reminder)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def send_channel(channel_id: int, reminders: List[Reminder]) -> None:
+        channel = get_channel(channel_id)
+        if not channel:
+            logger.warning(f"Channel {channel_id} not found for {len(reminders)} reminder(s)")
+            dropped.extend(r.id for r in reminders)
+            stats["dropped"] += len(reminders)
+            return
+
+        if catch_up:
+            header = f"**{len(reminders)} reminder(s) you missed while i was offline:**"
+            lines = [format_missed_reminder(r, now) for r in reminders]
+        else:
+            header = ""
+            lines = [format_reminder(r) for r in reminders]
+
+        async with semaphore:
+            for n, indexes in enumerate(chunk_lines(lines, reserved=len(header))):
+                chunk = [reminders[i] for i in indexes]
+                body = "\n".join(lines[i] for i in indexes)
+                try:
+                    await channel.send(f"{header}\n{body}" if header and n == 0 else body)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to send {len(chunk)} reminder(s) to channel {channel_id}: {e}",
+                        exc_info=True
+                    )
+                    failed.extend(r.id for r in chunk)
+                    stats["failed"] += len(chunk)
+                    continue
+                done.extend(r.id for r in chunk)
+                stats["delivered"] += len(chunk)
+                stats["messages"] += 1
+
+    await asyncio.gather(*(
+        send_channel(channel_id, reminders) for channel_id, reminders in by_channel.items()
+    ))
+
+    # One persistence write for the whole tick
+    reminder_manager.complete_reminders(done)
+    if dropped:
+        reminder_manager.remove_reminders(dropped)
+    for reminder_id in failed:
+        reminder_manager.retry_later(reminder_id, retry_seconds)
+
+    logger.info(
+        f"Delivered {stats['delivered']} reminder(s) in {stats['messages']} message(s) "
+        f"across {len(by_channel)} channel(s)"
+        + (f", {stats['failed']} failed" if stats["failed"] else "")
+        + (f", {stats['dropped']} dropped" if stats["dropped"] else "")
+        + (f", {stats['stale']} too late to send" if stats["stale"] else "")
+    )
+    return stats
+
+
+async def catch_up_reminders(
+    get_channel: Callable[[int], Optional[Any]],
+    reminder_manager,
+    max_lateness: float = REMINDER_MAX_LATENESS_SECONDS
+) -> Dict[str, int]:
+    """
+    Deliver everything that came due while the bot was offline, before normal scheduling starts.
+
+    All overdue reminders are claimed in one pass and delivered as per-channel
+    summaries with bounded concurrency and a single completing write.
+
+    Args:
+        get_channel: Returns the channel for a channel ID, or None if unknown
+        reminder_manager: Reminder manager to claim overdue reminders from
+        max_lateness: Skip reminders overdue by more than this many seconds (0 to send all)
+
+    Returns:
+        Delivery stats (see deliver_reminders)
+    """
+    overdue = reminder_manager.get_due_reminders()
+    if not overdue:
+        return {"delivered": 0, "dropped": 0, "stale": 0, "failed": 0, "messages": 0}
+
+    logger.info(f"Catching up on {len(overdue)} reminder(s) that came due while offline")
+    return await deliver_reminders(
+        overdue, get_channel, reminder_manager, catch_up=True, max_lateness=max_lateness
+    )
@@ -0,0 +1,228 @@
+"""Local Unix socket for submitting reminders from other processes.
+
+Protocol: one JSON object per line, answered with one JSON object per line.
+
+    -> {"user_id": 123, "channel_id": 456, "message": "stand up", "in_seconds": 300}
+    <- {"ok": true, "id": "3f6c..."}
+
+Either "due_time" (Unix timestamp) or "in_seconds" sets when the reminder
+fires. An optional "recurrence" rule (as accepted by >remind, e.g.
+"weekdays 09:00") makes it repeat; without a time it first fires at the
+rule's next occurrence. Errors are answered with {"ok": false, "error": "..."}.
+
+Usage from scripts: python reminder_ingest.py --user 123 --channel 456 --in 5m stand up
+                    python reminder_ingest.py --user 123 --channel 456 --repeat "weekdays 09:00" stand up
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import socket
+from datetime import datetime, timezone
+from typing import List, Optional
+from config import REMINDER_INGEST_SOCKET, REMINDER_MAX_TIME_SECONDS, REMINDER_MIN_TIME_SECONDS
+from recurrence import parse_recurrence
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> float:
+    return datetime.now(timezone.utc).timestamp()
+
+
+class ReminderIngestServer:
+    """
+    Accepts reminders pushed over a Unix socket and adds them to the reminder manager.
+
+    Each accepted reminder goes through add_reminder(), which updates the
+    schedule incrementally and re-arms the scheduler's timer if needed.
+    """
+
+    def __init__(self, reminder_manager, socket_path: str = REMINDER_INGEST_SOCKET):
+        """
+        Initialize the ingest server.
+
+        Args:
+            reminder_manager: Manager to add reminders to
+            socket_path: Filesystem path of the Unix socket
+        """
+        self.reminder_manager = reminder_manager
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.accepted = 0
+        self.rejected = 0
+
+    async def start(self) -> bool:
+        """
+        Start listening.
+
+        Returns:
+            True if the socket is listening
+        """
+        if not self.socket_path:
+            logger.info("Reminder ingest socket disabled")
+            return False
+        if not hasattr(asyncio, "start_unix_server"):
+            logger.warning("Unix sockets are not supported on this platform, reminder ingest disabled")
+            return False
+
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        # A socket file left behind by a crash would make bind() fail
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        # Bound under a umask that leaves it owner-only, so it is never connectable by others
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(old_umask)
+        self._server = await asyncio.start_unix_server(self._handle_client, sock=sock)
+        logger.info(f"Accepting reminders on {self.socket_path}")
+        return True
+
+    def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._server is None:
+            return
+        self._server.close()
+        self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        logger.info(f"Reminder ingest closed ({self.accepted} accepted, {self.rejected} rejected)")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer each request line from one connection."""
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                writer.write(json.dumps(self._ingest(line)).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            logger.warning(f"Reminder ingest connection error: {e}")
+        finally:
+            writer.close()
+
+    def _ingest(self, line: bytes) -> dict:
+        """
+        Validate one request and add its reminder.
+
+        Args:
+            line: One JSON request
+
+        Returns:
+            Response object
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            user_id = int(request["user_id"])
+            channel_id = int(request["channel_id"])
+            message = str(request["message"]).strip()
+            if not message:
+                raise ValueError("message is empty")
+
+            now = _now()
+            recurrence = None
+            if request.get("recurrence"):
+                rule, rest = parse_recurrence(str(request["recurrence"]))
+                if not rule or rest:
+                    raise ValueError(f"invalid recurrence `{request['recurrence']}`")
+                recurrence = rule.spec
+
+            if "due_time" in request:
+                due_time = float(request["due_time"])
+            elif "in_seconds" in request or not recurrence:
+                in_seconds = float(request["in_seconds"])
+                if in_seconds < REMINDER_MIN_TIME_SECONDS:
+                    raise ValueError(f"minimum reminder time is {REMINDER_MIN_TIME_SECONDS} seconds")
+                due_time = now + in_seconds
+            else:
+                due_time = rule.next_fire(now, now)
+                if due_time is None:
+                    raise ValueError(f"`{recurrence}` never fires")
+            if not math.isfinite(due_time):
+                raise ValueError("due time must be a finite number")  # json.loads accepts NaN and Infinity
+            if due_time > now + REMINDER_MAX_TIME_SECONDS:
+                raise ValueError("due time is more than a year away")
+        except KeyError as e:
+            return self._reject(f"missing field {e}")
+        except (TypeError, ValueError) as e:
+            return self._reject(str(e))
+
+        reminder = self.reminder_manager.add_reminder(
+            user_id=user_id,
+            channel_id=channel_id,
+            message=message,
+            due_time=due_time,
+            recurrence=recurrence
+        )
+        self.accepted += 1
+        return {"ok": True, "id": reminder.id}
+
+    def _reject(self, error: str) -> dict:
+        self.rejected += 1
+        logger.warning(f"Rejected ingested reminder: {error}")
+        return {"ok": False, "error": error}
+
+
+def send_reminders(requests: List[dict], socket_path: str = REMINDER_INGEST_SOCKET) -> List[dict]:
+    """
+    Submit reminders to a running bot.
+
+    Args:
+        requests: Request objects (see module docstring)
+        socket_path: Filesystem path of the bot's ingest socket
+
+    Returns:
+        One response object per request
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(b"".join(json.dumps(r).encode() + b"\n" for r in requests))
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as f:
+            return [json.loads(line) for line in f]
+
+
+def main():
+    from commands.remind import parse_time
+
+    parser = argparse.ArgumentParser(description="Submit a reminder to a running bot.")
+    parser.add_argument("--user", type=int, required=True, help="Discord user ID to mention")
+    parser.add_argument("--channel", type=int, required=True, help="Discord channel ID to post in")
+    parser.add_argument("--in", dest="delay", help="When to fire, e.g. 30s, 5m, 2h, 1d")
+    parser.add_argument("--repeat", help="Recurrence rule, e.g. 'every 1d' or 'weekdays 09:00'")
+    parser.add_argument("--socket", default=REMINDER_INGEST_SOCKET)
+    parser.add_argument("message", nargs="+")
+    args = parser.parse_args()
+
+    request = {"user_id": args.user, "channel_id": args.channel, "message": " ".join(args.message)}
+    if args.delay:
+        request["in_seconds"] = parse_time(args.delay)
+        if request["in_seconds"] is None:
+            parser.error(f"invalid time format: {args.delay}")
+    elif not args.repeat:
+        parser.error("one of --in or --repeat is required")
+    if args.repeat:
+        request["recurrence"] = args.repeat
+
+    response = send_reminders([request], args.socket)[0]
+    if not response["ok"]:
+        raise SystemExit(f"rejected: {response['error']}")
+    print(response["id"])
+
+
+if __name__ == "__main__":
+    main()
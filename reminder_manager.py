@@ -1,14 +1,16 @@
 """Reminder management and persistence."""
 
-import json
-import os
+import heapq
 import logging
 import uuid
 from datetime import datetime, timezone
+from concurrent.futures import Future
 from dataclasses import dataclass, asdict
-from typing import List, Optional
-from config import REMINDERS_FILE
-from utils import atomic_json_save
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config import REMINDERS_FILE, REMINDER_BACKEND
+from persistence_writer import get_persistence_writer
+from recurrence import next_occurrence
+from serialization import load_file
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,7 @@ class Reminder:
     message: str
     due_time: float  # Unix timestamp
     created_at: float  # Unix timestamp
+    recurrence: Optional[str] = None  # Recurrence rule spec, None for one-shot reminders
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -35,7 +38,16 @@ class Reminder:
 
 
 class ReminderManager:
-    """Manages reminder storage and retrieval."""
+    """
+    Manages reminder storage and retrieval.
+
+    Pending reminders are indexed by ID and scheduled on a min-heap of
+    (fire_time, id), so finding the next due reminder is O(1) and claiming due
+    ones is O(log n) each. Heap entries are invalidated lazily: an entry is
+    live only while it matches the reminder's current entry in _scheduled.
+    Secondary indexes by user and by channel are kept in sync on every add
+    and remove, so per-user queries never scan all reminders.
+    """
 
     def __init__(self, reminders_file: str = REMINDERS_FILE):
         """
@@ -45,38 +57,118 @@ class ReminderManager:
             reminders_file: Path to the JSON file for persisting reminders
         """
         self.reminders_file = reminders_file
-        self.reminders: List[Reminder] = []
+        self.reminders: Dict[str, Reminder] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._scheduled: Dict[str, float] = {}  # reminder_id -> live fire time
+        self._by_user: Dict[int, Dict[str, Reminder]] = {}
+        self._by_channel: Dict[int, Dict[str, Reminder]] = {}
+
+        self.on_schedule_changed: Optional[Callable[[], None]] = None
+        """Called when a reminder becomes due earlier than anything scheduled before it."""
+
+        self.writer = get_persistence_writer()
         self.load()
 
     def load(self) -> None:
-        """Load reminders from disk."""
+        """Load reminders from disk and rebuild the schedule."""
+        # Don't read back an older file while our own save is still queued
+        self.writer.flush(self.reminders_file)
         try:
-            with open(self.reminders_file, "r") as f:
-                data = json.load(f)
-                self.reminders = [Reminder.from_dict(r) for r in data]
-                logger.info(f"Loaded {len(self.reminders)} reminders from {self.reminders_file}")
+            data = load_file(self.reminders_file)
+            reminders = [Reminder.from_dict(r) for r in data]
+            logger.info(f"Loaded {len(reminders)} reminders from {self.reminders_file}")
         except FileNotFoundError:
             logger.info(f"No saved reminders found at {self.reminders_file}. Starting fresh.")
-            self.reminders = []
-        except json.JSONDecodeError as e:
+            reminders = []
+        except ValueError as e:
             logger.warning(f"Failed to parse reminders file: {e}. Starting fresh.")
-            self.reminders = []
+            reminders = []
         except Exception as e:
             logger.error(f"Error loading reminders: {e}", exc_info=True)
-            self.reminders = []
+            reminders = []
+
+        self.reminders = {r.id: r for r in reminders}
+        self._by_user = {}
+        self._by_channel = {}
+        for reminder in reminders:
+            self._index(reminder)
+        self._rebuild_schedule()
+
+    def save(self) -> Future:
+        """
+        Save reminders to disk atomically on the persistence writer thread.
+
+        Returns:
+            Future resolving to True once the reminders are durable
+        """
+        data = [r.to_dict() for r in self.reminders.values()]
+        future = self.writer.submit(self.reminders_file, data)
+        logger.debug(f"Queued save of {len(data)} reminders to {self.reminders_file}")
+        return future
 
-    def save(self) -> None:
-        """Save reminders to disk atomically."""
-        data = [r.to_dict() for r in self.reminders]
-        atomic_json_save(data, self.reminders_file)
-        logger.debug(f"Saved {len(self.reminders)} reminders to {self.reminders_file}")
+    def close(self) -> None:
+        """Queue a final save (drain the persistence writer to make it durable)."""
+        self.save()
+
+    def _index(self, reminder: Reminder) -> None:
+        """Add a reminder to the per-user and per-channel indexes."""
+        self._by_user.setdefault(reminder.user_id, {})[reminder.id] = reminder
+        self._by_channel.setdefault(reminder.channel_id, {})[reminder.id] = reminder
+
+    def _unindex(self, reminder: Reminder) -> None:
+        """Remove a reminder from the per-user and per-channel indexes."""
+        for index, key in ((self._by_user, reminder.user_id), (self._by_channel, reminder.channel_id)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(reminder.id, None)
+                if not bucket:
+                    del index[key]
+
+    def _rebuild_schedule(self) -> None:
+        """Rebuild the heap from all pending reminders, dropping stale entries."""
+        self._scheduled = {r.id: r.due_time for r in self.reminders.values()}
+        self._heap = [(due_time, reminder_id) for reminder_id, due_time in self._scheduled.items()]
+        heapq.heapify(self._heap)
+
+    def _schedule(self, reminder_id: str, fire_time: float) -> None:
+        """Schedule (or reschedule) a reminder to fire at a time."""
+        earliest = self.next_due_time()
+        self._scheduled[reminder_id] = fire_time
+        heapq.heappush(self._heap, (fire_time, reminder_id))
+
+        # Keep lazily-deleted entries from piling up
+        if len(self._heap) > 2 * len(self._scheduled) + 64:
+            self._rebuild_schedule()
+
+        if (earliest is None or fire_time < earliest) and self.on_schedule_changed:
+            self.on_schedule_changed()
+
+    def _unschedule(self, reminder_id: str) -> None:
+        """Take a reminder off the schedule (its heap entry goes stale)."""
+        self._scheduled.pop(reminder_id, None)
+
+    def next_due_time(self) -> Optional[float]:
+        """
+        Get the time the next reminder fires.
+
+        Returns:
+            Unix timestamp of the earliest scheduled reminder, or None if none
+        """
+        heap = self._heap
+        while heap:
+            fire_time, reminder_id = heap[0]
+            if self._scheduled.get(reminder_id) == fire_time:
+                return fire_time
+            heapq.heappop(heap)
+        return None
 
     def add_reminder(
         self,
         user_id: int,
         channel_id: int,
         message: str,
-        due_time: float
+        due_time: float,
+        recurrence: Optional[str] = None
     ) -> Reminder:
         """
         Create and save a new reminder.
@@ -85,7 +177,8 @@ class ReminderManager:
             user_id: Discord user ID to mention
             channel_id: Discord channel ID where to send reminder
             message: Reminder message text
-            due_time: Unix timestamp when reminder is due
+            due_time: Unix timestamp when reminder is (first) due
+            recurrence: Recurrence rule spec for repeating reminders
 
         Returns:
             The created Reminder object
@@ -96,10 +189,13 @@ class ReminderManager:
             channel_id=channel_id,
             message=message,
             due_time=due_time,
-            created_at=datetime.now(timezone.utc).timestamp()
+            created_at=datetime.now(timezone.utc).timestamp(),
+            recurrence=recurrence
         )
 
-        self.reminders.append(reminder)
+        self.reminders[reminder.id] = reminder
+        self._index(reminder)
+        self._schedule(reminder.id, due_time)
         self.save()
 
         logger.info(f"Created reminder {reminder.id} for user {user_id} due at {due_time}")
@@ -107,35 +203,113 @@ class ReminderManager:
 
     def get_due_reminders(self) -> List[Reminder]:
         """
-        Get all reminders that are due now.
+        Claim all reminders that are due now.
+
+        Claimed reminders leave the schedule but stay stored until
+        complete_reminders() is called, so a crash before delivery
+        re-delivers them on restart. Use retry_later() if delivery fails.
 
         Returns:
             List of reminders whose due_time is <= current time
         """
         now = datetime.now(timezone.utc).timestamp()
-        due = [r for r in self.reminders if r.due_time <= now]
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            fire_time, reminder_id = heapq.heappop(heap)
+            if self._scheduled.get(reminder_id) == fire_time:
+                del self._scheduled[reminder_id]
+                due.append(self.reminders[reminder_id])
 
         if due:
             logger.debug(f"Found {len(due)} due reminders")
 
         return due
 
-    def remove_reminder(self, reminder_id: str) -> None:
+    def retry_later(self, reminder_id: str, delay_seconds: float) -> None:
+        """
+        Put a claimed reminder back on the schedule after a failed delivery.
+
+        Args:
+            reminder_id: The reminder ID
+            delay_seconds: Seconds from now to retry
+        """
+        if reminder_id in self.reminders:
+            self._schedule(reminder_id, datetime.now(timezone.utc).timestamp() + delay_seconds)
+
+    def _discard(self, reminder_id: str) -> bool:
+        """Drop a reminder from memory without saving. Returns True if it existed."""
+        reminder = self.reminders.pop(reminder_id, None)
+        if not reminder:
+            return False
+        self._unschedule(reminder_id)
+        self._unindex(reminder)
+        return True
+
+    def remove_reminder(self, reminder_id: str, due_time: Optional[float] = None) -> None:
         """
         Remove a reminder by ID.
 
         Args:
             reminder_id: The reminder ID to remove
+            due_time: The reminder's due time (only needed by WheelReminderManager)
         """
-        original_count = len(self.reminders)
-        self.reminders = [r for r in self.reminders if r.id != reminder_id]
-
-        if len(self.reminders) < original_count:
+        if self._discard(reminder_id):
             self.save()
             logger.debug(f"Removed reminder {reminder_id}")
         else:
             logger.warning(f"Reminder {reminder_id} not found for removal")
 
+    def remove_reminders(self, reminder_ids: Iterable[str]) -> int:
+        """
+        Remove many reminders with a single save.
+
+        Args:
+            reminder_ids: Reminder IDs to remove
+
+        Returns:
+            Number of reminders removed
+        """
+        removed = sum(1 for reminder_id in reminder_ids if self._discard(reminder_id))
+        if removed:
+            self.save()
+            logger.debug(f"Removed {removed} reminders")
+        return removed
+
+    def _reschedule(self, reminder: Reminder, due_time: float) -> None:
+        """Move a resident reminder to its next occurrence."""
+        reminder.due_time = due_time
+        self._schedule(reminder.id, due_time)
+
+    def complete_reminders(self, reminder_ids: Iterable[str]) -> int:
+        """
+        Finish delivered reminders with a single save.
+
+        One-shot reminders are removed; recurring ones are rescheduled at
+        their next occurrence.
+
+        Args:
+            reminder_ids: IDs of delivered reminders
+
+        Returns:
+            Number of reminders completed
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        completed = 0
+        for reminder_id in reminder_ids:
+            reminder = self.reminders.get(reminder_id)
+            if not reminder:
+                continue
+            next_due = next_occurrence(reminder.recurrence, reminder.due_time, now) if reminder.recurrence else None
+            if next_due is None:
+                self._discard(reminder_id)
+            else:
+                self._reschedule(reminder, next_due)
+            completed += 1
+        if completed:
+            self.save()
+        return completed
+
     def get_user_reminders(self, user_id: int) -> List[Reminder]:
         """
         Get all pending reminders for a specific user.
@@ -144,10 +318,65 @@ class ReminderManager:
             user_id: Discord user ID
 
         Returns:
-            List of pending reminders for the user
+            List of pending reminders for the user, soonest first
+        """
+        return sorted(self._by_user.get(user_id, {}).values(), key=lambda r: r.due_time)
+
+    def get_channel_reminders(self, channel_id: int) -> List[Reminder]:
+        """
+        Get all pending reminders for a specific channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            List of pending reminders for the channel, soonest first
         """
-        return [r for r in self.reminders if r.user_id == user_id]
+        return sorted(self._by_channel.get(channel_id, {}).values(), key=lambda r: r.due_time)
+
+    def find_user_reminders(self, user_id: int, id_prefix: str) -> List[Reminder]:
+        """
+        Find a user's reminders whose ID starts with a prefix.
+
+        Args:
+            user_id: Discord user ID (only this user's reminders are searched)
+            id_prefix: Full reminder ID or a leading part of it
+
+        Returns:
+            Matching reminders (more than one means the prefix is ambiguous)
+        """
+        id_prefix = id_prefix.lower()
+        return [r for r in self._by_user.get(user_id, {}).values() if r.id.startswith(id_prefix)]
 
     def get_reminder_count(self) -> int:
         """Get total number of pending reminders."""
         return len(self.reminders)
+
+
+def create_reminder_manager(backend: str = REMINDER_BACKEND):
+    """
+    Create a reminder manager for the configured storage backend.
+
+    Args:
+        backend: "json" (whole-file JSON), "sqlite" (indexed SQLite database) or
+            "wheel" (timing wheel with far-future reminders on disk)
+
+    Returns:
+        ReminderManager, SQLiteReminderManager or WheelReminderManager instance
+    """
+    backend = backend.lower()
+    if backend == "sqlite":
+        # Import here to avoid a circular import (it reuses Reminder from this module)
+        from sqlite_reminder_manager import SQLiteReminderManager
+        logger.info("Using reminder backend: sqlite")
+        return SQLiteReminderManager()
+
+    if backend == "wheel":
+        from wheel_reminder_manager import WheelReminderManager
+        logger.info("Using reminder backend: wheel")
+        return WheelReminderManager()
+
+    if backend != "json":
+        logger.warning(f"Unknown REMINDER_BACKEND '{backend}', defaulting to json")
+    logger.info("Using reminder backend: json")
+    return ReminderManager()
@@ -0,0 +1,73 @@
+"""Timer-driven reminder delivery."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+from reminder_manager import Reminder, ReminderManager
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    """
+    Sleeps until the earliest pending reminder is due, then delivers it.
+
+    A single timer is armed for the head of the ReminderManager's heap and is
+    re-armed whenever a reminder is added ahead of it (from a command or the
+    ingest socket), so reminders fire on time without scanning or polling.
+    With nothing scheduled it sleeps until notified.
+    """
+
+    def __init__(
+        self,
+        reminder_manager: ReminderManager,
+        deliver: Callable[[List[Reminder]], Awaitable[None]]
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            reminder_manager: Source of scheduled reminders
+            deliver: Coroutine function that delivers a batch of due reminders
+        """
+        self.reminder_manager = reminder_manager
+        self.deliver = deliver
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+        reminder_manager.on_schedule_changed = self.notify
+
+    def notify(self) -> None:
+        """Re-arm the timer because an earlier reminder was scheduled."""
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Stop the scheduler loop."""
+        self._stopped = True
+        self._wakeup.set()
+
+    def _sleep_seconds(self) -> Optional[float]:
+        """Seconds until the next reminder is due, or None if nothing is scheduled."""
+        next_due: Optional[float] = self.reminder_manager.next_due_time()
+        if next_due is None:
+            return None
+        return max(next_due - datetime.now(timezone.utc).timestamp(), 0.0)
+
+    async def run(self) -> None:
+        """Deliver reminders as they come due until stopped."""
+        logger.info("Reminder scheduler started")
+        while not self._stopped:
+            # Clear first so a notify() during delivery still re-arms the timer
+            self._wakeup.clear()
+            try:
+                due = self.reminder_manager.get_due_reminders()
+                if due:
+                    await self.deliver(due)
+            except Exception as e:
+                logger.error(f"Error in reminder scheduler loop: {e}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._sleep_seconds())
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Reminder scheduler stopped")
@@ -0,0 +1,173 @@
+"""Persistent cache of YouTube search queries resolved to a track."""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from config import SEARCH_CACHE_FILE, SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL_SECONDS
+from persistence_writer import get_persistence_writer
+from serialization import load_file
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PREFIX = "ytsearch1:"
+
+LOG_EVERY_LOOKUPS = 50
+"""Hit rate is logged after this many lookups."""
+
+
+def normalize_query(query: str) -> Optional[str]:
+    """
+    Normalize a search query so trivially different spellings share an entry.
+
+    Args:
+        query: ytsearch1: query as built by >play
+
+    Returns:
+        Case-folded query with collapsed whitespace, or None if it isn't a search query
+    """
+    if not query.startswith(SEARCH_PREFIX):
+        return None
+    terms = " ".join(query[len(SEARCH_PREFIX):].casefold().split())
+    return terms or None
+
+
+class SearchCache:
+    """
+    Maps search queries to the track they resolved to, persisted across restarts.
+
+    Entries hold the track's page URL, title and duration, which is all
+    queueing needs, so a repeated search skips YouTube entirely; playback
+    then extracts the page URL (itself cached by ExtractionCache). Entries
+    expire after ttl seconds, since search results drift, and at most
+    max_entries are kept, dropping the least recently used.
+    """
+
+    def __init__(
+        self,
+        file_path: str = SEARCH_CACHE_FILE,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        ttl: float = SEARCH_CACHE_TTL_SECONDS
+    ):
+        """
+        Initialize the cache and load saved entries.
+
+        Args:
+            file_path: File entries are saved to
+            max_entries: Maximum queries remembered
+            ttl: Seconds a resolution stays valid
+        """
+        self.file_path = file_path
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.writer = get_persistence_writer()
+        self._entries: OrderedDict = OrderedDict()  # query -> entry dict, least recently used first
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        self.load()
+
+    def load(self) -> None:
+        """Load saved entries, skipping expired ones."""
+        try:
+            saved = load_file(self.file_path)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning(f"Failed to parse {self.file_path}: {e}. Starting with an empty search cache.")
+            return
+        now = time.time()
+        entries = sorted(saved.items(), key=lambda item: item[1].get('used_at', 0))
+        for query, entry in entries[-self.max_entries:]:
+            if now - entry.get('resolved_at', 0) <= self.ttl:
+                self._entries[query] = entry
+        logger.info(f"Loaded {len(self._entries)} cached search(es)")
+
+    def save(self) -> None:
+        """Queue a save of all entries."""
+        self.writer.submit(self.file_path, dict(self._entries))
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up what a search query resolved to.
+
+        Args:
+            query: ytsearch1: query (anything else always misses without counting)
+
+        Returns:
+            Info dict with webpage_url, title and duration, or None on a miss
+        """
+        key = normalize_query(query)
+        if not key:
+            return None
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None and now - entry['resolved_at'] > self.ttl:
+            del self._entries[key]
+            self.expired += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            # A new dict, as the last save may still be serializing the old one
+            self._entries[key] = {**entry, 'used_at': now}  # Saved with the next write
+            self._entries.move_to_end(key)
+            self.hits += 1
+        self._log_hit_rate()
+        if entry is None:
+            return None
+        return {'webpage_url': entry['url'], 'title': entry['title'], 'duration': entry['duration']}
+
+    def put(self, query: str, info: Dict[str, Any]) -> None:
+        """
+        Remember the track a search query resolved to.
+
+        Args:
+            query: ytsearch1: query
+            info: yt-dlp info dict for the top result
+        """
+        key = normalize_query(query)
+        url = info.get('webpage_url')
+        if not key or not url:
+            return
+        now = time.time()
+        self._entries[key] = {
+            'url': url,
+            'title': info.get('title'),
+            'duration': info.get('duration'),
+            'resolved_at': now,
+            'used_at': now,
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.save()
+
+    def _log_hit_rate(self) -> None:
+        lookups = self.hits + self.misses
+        if lookups % LOG_EVERY_LOOKUPS == 0:
+            logger.info(
+                f"Search cache: {self.hits / lookups:.0%} hit rate over {lookups} lookup(s), "
+                f"{len(self._entries)} cached search(es)"
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with cached searches, hits, misses, expired entries and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
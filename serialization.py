@@ -0,0 +1,228 @@
+"""Pluggable serialization codecs for persisted state."""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from config import PERSISTENCE_CODEC, PERSISTENCE_COMPACT
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+
+class Codec(ABC):
+    """Abstract base class for persistence codecs."""
+
+    name: str = ""
+    binary: bool = False
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serialize data.
+
+        Args:
+            data: JSON-compatible data (dicts with str keys, lists, scalars)
+
+        Returns:
+            Encoded bytes
+        """
+        pass
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any:
+        """
+        Deserialize data.
+
+        Args:
+            raw: Encoded bytes
+
+        Returns:
+            Decoded data
+
+        Raises:
+            ValueError: If the input is malformed
+        """
+        pass
+
+
+class StdlibJsonCodec(Codec):
+    """Standard library json (always available)."""
+
+    name = "json"
+
+    def __init__(self, compact: bool = False):
+        self.indent = None if compact else 2
+        self.separators = (",", ":") if compact else None
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, indent=self.indent, separators=self.separators).encode()
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec(Codec):
+    """orjson (Rust JSON library, requires orjson)."""
+
+    name = "orjson"
+
+    def __init__(self, compact: bool = False):
+        self.option = 0 if compact else orjson.OPT_INDENT_2
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, option=self.option)
+
+    def loads(self, raw: bytes) -> Any:
+        return orjson.loads(raw)  # orjson.JSONDecodeError subclasses ValueError
+
+
+class MsgspecJsonCodec(Codec):
+    """msgspec JSON (requires msgspec)."""
+
+    name = "msgspec"
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.encoder = msgspec.json.Encoder()
+        self.decoder = msgspec.json.Decoder()
+
+    def dumps(self, data: Any) -> bytes:
+        raw = self.encoder.encode(data)
+        return raw if self.compact else msgspec.json.format(raw, indent=2)
+
+    def loads(self, raw: bytes) -> Any:
+        try:
+            return self.decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+class MsgpackCodec(Codec):
+    """MessagePack binary format (requires msgspec or msgpack)."""
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self, compact: bool = True):
+        if msgspec is not None:
+            self._dumps = msgspec.msgpack.Encoder().encode
+            self._loads = msgspec.msgpack.Decoder().decode
+        else:
+            self._dumps = msgpack.packb
+            self._loads = msgpack.unpackb
+
+    def dumps(self, data: Any) -> bytes:
+        return self._dumps(data)
+
+    def loads(self, raw: bytes) -> Any:
+        try:
+            return self._loads(raw)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(str(e)) from e
+
+
+def available_codecs() -> Dict[str, type]:
+    """Return codec classes whose libraries are installed, fastest JSON codec first."""
+    codecs = {}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec
+    if msgspec is not None:
+        codecs["msgspec"] = MsgspecJsonCodec
+    codecs["json"] = StdlibJsonCodec
+    if msgspec is not None or msgpack is not None:
+        codecs["msgpack"] = MsgpackCodec
+    return codecs
+
+
+def get_codec(name: str = PERSISTENCE_CODEC, compact: bool = PERSISTENCE_COMPACT) -> Codec:
+    """
+    Get a codec by name.
+
+    Args:
+        name: auto (fastest installed JSON codec), json, orjson, msgspec or msgpack
+        compact: Omit indentation (JSON codecs only)
+
+    Returns:
+        Codec instance, falling back to stdlib json if the library is missing
+    """
+    codecs = available_codecs()
+    name = name.lower()
+    if name == "auto":
+        name = next(iter(codecs))
+    if name not in codecs:
+        logger.warning(f"Persistence codec '{name}' unavailable, falling back to stdlib json")
+        name = "json"
+    return codecs[name](compact=compact)
+
+
+_default_codec: Optional[Codec] = None
+_json_codec: Optional[Codec] = None
+
+
+def default_codec() -> Codec:
+    """Return the configured codec used for whole-file saves."""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = get_codec()
+        logger.info(f"Using persistence codec: {_default_codec.name}")
+    return _default_codec
+
+
+def line_codec() -> Codec:
+    """Return the fastest compact JSON codec, for line-oriented logs."""
+    global _json_codec
+    if _json_codec is None:
+        _json_codec = get_codec("auto", compact=True)
+    return _json_codec
+
+
+def _is_msgpack(raw: bytes) -> bool:
+    """True if raw data starts with a MessagePack map or array marker (never valid JSON text)."""
+    if not raw:
+        return False
+    first = raw[0]
+    return 0x80 <= first <= 0x9f or 0xdc <= first <= 0xdf
+
+
+def load_file(file_path: str) -> Any:
+    """
+    Read and decode a persisted file written by any codec.
+
+    The format is detected from the content, so switching PERSISTENCE_CODEC
+    never strands existing files.
+
+    Args:
+        file_path: File to read
+
+    Returns:
+        Decoded data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is malformed
+    """
+    with open(file_path, "rb") as f:
+        raw = f.read()
+
+    if _is_msgpack(raw):
+        if msgspec is None and msgpack is None:
+            raise ValueError(f"{file_path} is MessagePack but neither msgspec nor msgpack is installed")
+        return MsgpackCodec().loads(raw)
+    return line_codec().loads(raw)
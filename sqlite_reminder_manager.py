@@ -0,0 +1,365 @@
+"""SQLite-backed reminder storage."""
+
+import os
+import sqlite3
+import logging
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional
+from config import REMINDERS_DB_FILE, REMINDERS_FILE
+from reminder_manager import Reminder
+from recurrence import next_occurrence
+from serialization import load_file
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    due_time REAL NOT NULL,
+    created_at REAL NOT NULL,
+    claimed INTEGER NOT NULL DEFAULT 0,
+    retry_at REAL,
+    recurrence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_due_time ON reminders(due_time);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_id ON reminders(user_id, due_time);
+CREATE INDEX IF NOT EXISTS idx_reminders_channel_id ON reminders(channel_id, due_time);
+CREATE INDEX IF NOT EXISTS idx_reminders_retry_at ON reminders(retry_at) WHERE retry_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+REMINDER_COLUMNS = "id, user_id, channel_id, message, due_time, created_at, recurrence"
+
+
+def _row_to_reminder(row: tuple) -> Reminder:
+    """Convert a SELECT of REMINDER_COLUMNS to a Reminder."""
+    return Reminder(*row)
+
+
+def _now() -> float:
+    return datetime.now(timezone.utc).timestamp()
+
+
+class SQLiteReminderManager:
+    """
+    Reminder storage on SQLite in WAL mode.
+
+    Drop-in alternative to ReminderManager: every add, delivery and per-user
+    query is a single indexed statement instead of a full-file rewrite or
+    scan. Reminders move through three states: pending (scheduled at
+    due_time), claimed (handed to the scheduler for delivery) and retrying
+    (scheduled at retry_at after a failed delivery). Claims left over from a
+    crash are released on startup so those reminders are re-delivered.
+    """
+
+    def __init__(self, db_file: str = REMINDERS_DB_FILE, json_file: str = REMINDERS_FILE):
+        """
+        Initialize the reminder manager.
+
+        Args:
+            db_file: Path to the SQLite database
+            json_file: Legacy JSON reminders file to migrate from on first run
+        """
+        self.db_file = db_file
+        self.reminders_file = json_file
+
+        self.on_schedule_changed: Optional[Callable[[], None]] = None
+        """Called when a reminder becomes due earlier than anything scheduled before it."""
+
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        # Only ever used from the event loop thread
+        self.db = sqlite3.connect(db_file, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._upgrade_schema()
+        self.load()
+
+    def _upgrade_schema(self) -> None:
+        """Add columns introduced after a database was created."""
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(reminders)")}
+        if "recurrence" not in columns:
+            self.db.execute("ALTER TABLE reminders ADD COLUMN recurrence TEXT")
+            logger.info("Added recurrence column to reminders table")
+
+    def load(self) -> None:
+        """Release stale claims and run the one-shot JSON migration if needed."""
+        released = self.db.execute("UPDATE reminders SET claimed = 0 WHERE claimed = 1").rowcount
+        if released:
+            logger.info(f"Released {released} reminder(s) claimed before the last shutdown")
+        self._migrate_json()
+        logger.info(f"Opened {self.get_reminder_count()} reminders from {self.db_file}")
+
+    def _migrate_json(self) -> None:
+        """Import the legacy JSON reminders file once."""
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+
+        try:
+            data = load_file(self.reminders_file)
+        except FileNotFoundError:
+            data = []
+        except ValueError as e:
+            logger.warning(f"Failed to parse {self.reminders_file} for migration: {e}. Skipping.")
+            data = []
+
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                f"INSERT OR IGNORE INTO reminders ({REMINDER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(r["id"], r["user_id"], r["channel_id"], r["message"], r["due_time"], r["created_at"],
+                  r.get("recurrence")) for r in data]
+            )
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(_now()),))
+
+        if data:
+            logger.info(f"Migrated {len(data)} reminder(s) from {self.reminders_file} to {self.db_file}")
+
+    def save(self) -> Future:
+        """
+        Persist reminders (a no-op: every change is committed as it happens).
+
+        Returns:
+            Already-resolved Future, for interface compatibility with ReminderManager
+        """
+        future = Future()
+        future.set_result(True)
+        return future
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close the database."""
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.db.close()
+
+    def next_due_time(self) -> Optional[float]:
+        """
+        Get the time the next reminder fires.
+
+        Returns:
+            Unix timestamp of the earliest scheduled reminder, or None if none
+        """
+        pending = self.db.execute(
+            "SELECT due_time FROM reminders WHERE claimed = 0 AND retry_at IS NULL "
+            "ORDER BY due_time LIMIT 1"
+        ).fetchone()
+        retrying = self.db.execute(
+            "SELECT MIN(retry_at) FROM reminders WHERE retry_at IS NOT NULL AND claimed = 0"
+        ).fetchone()
+        times = [t for t in (pending and pending[0], retrying[0]) if t is not None]
+        return min(times) if times else None
+
+    def add_reminder(
+        self,
+        user_id: int,
+        channel_id: int,
+        message: str,
+        due_time: float,
+        recurrence: Optional[str] = None
+    ) -> Reminder:
+        """
+        Create and save a new reminder.
+
+        Args:
+            user_id: Discord user ID to mention
+            channel_id: Discord channel ID where to send reminder
+            message: Reminder message text
+            due_time: Unix timestamp when reminder is (first) due
+            recurrence: Recurrence rule spec for repeating reminders
+
+        Returns:
+            The created Reminder object
+        """
+        reminder = Reminder(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            channel_id=channel_id,
+            message=message,
+            due_time=due_time,
+            created_at=_now(),
+            recurrence=recurrence
+        )
+
+        earliest = self.next_due_time()
+        self.db.execute(
+            f"INSERT INTO reminders ({REMINDER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (reminder.id, user_id, channel_id, message, due_time, reminder.created_at, recurrence)
+        )
+        if (earliest is None or due_time < earliest) and self.on_schedule_changed:
+            self.on_schedule_changed()
+
+        logger.info(f"Created reminder {reminder.id} for user {user_id} due at {due_time}")
+        return reminder
+
+    def get_due_reminders(self) -> List[Reminder]:
+        """
+        Claim all reminders that are due now.
+
+        Claimed reminders stay stored until complete_reminders() is called.
+        Use retry_later() if delivery fails.
+
+        Returns:
+            List of reminders whose due_time (or retry time) is <= current time
+        """
+        now = _now()
+        rows = self.db.execute(
+            f"SELECT {REMINDER_COLUMNS} FROM reminders "
+            "WHERE due_time <= ? AND claimed = 0 AND retry_at IS NULL ORDER BY due_time",
+            (now,)
+        ).fetchall()
+        rows += self.db.execute(
+            f"SELECT {REMINDER_COLUMNS} FROM reminders WHERE retry_at <= ? AND claimed = 0",
+            (now,)
+        ).fetchall()
+        if not rows:
+            return []
+
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "UPDATE reminders SET claimed = 1, retry_at = NULL WHERE id = ?",
+                [(row[0],) for row in rows]
+            )
+
+        logger.debug(f"Found {len(rows)} due reminders")
+        return [_row_to_reminder(row) for row in rows]
+
+    def retry_later(self, reminder_id: str, delay_seconds: float) -> None:
+        """
+        Put a claimed reminder back on the schedule after a failed delivery.
+
+        Args:
+            reminder_id: The reminder ID
+            delay_seconds: Seconds from now to retry
+        """
+        self.db.execute(
+            "UPDATE reminders SET claimed = 0, retry_at = ? WHERE id = ?",
+            (_now() + delay_seconds, reminder_id)
+        )
+
+    def remove_reminder(self, reminder_id: str, due_time: Optional[float] = None) -> None:
+        """
+        Remove a reminder by ID.
+
+        Args:
+            reminder_id: The reminder ID to remove
+            due_time: The reminder's due time (only needed by WheelReminderManager)
+        """
+        if self.db.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,)).rowcount:
+            logger.debug(f"Removed reminder {reminder_id}")
+        else:
+            logger.warning(f"Reminder {reminder_id} not found for removal")
+
+    def remove_reminders(self, reminder_ids: Iterable[str]) -> int:
+        """
+        Remove many reminders in a single transaction.
+
+        Args:
+            reminder_ids: Reminder IDs to remove
+
+        Returns:
+            Number of reminders removed
+        """
+        with self.db:
+            self.db.execute("BEGIN")
+            removed = self.db.executemany(
+                "DELETE FROM reminders WHERE id = ?", [(reminder_id,) for reminder_id in reminder_ids]
+            ).rowcount
+        if removed:
+            logger.debug(f"Removed {removed} reminders")
+        return removed
+
+    def complete_reminders(self, reminder_ids: Iterable[str]) -> int:
+        """
+        Finish delivered reminders in a single transaction.
+
+        One-shot reminders are deleted; recurring ones are rescheduled at
+        their next occurrence.
+
+        Args:
+            reminder_ids: IDs of delivered reminders
+
+        Returns:
+            Number of reminders completed
+        """
+        now = _now()
+        completed = 0
+        with self.db:
+            self.db.execute("BEGIN")
+            for reminder_id in reminder_ids:
+                row = self.db.execute(
+                    "SELECT due_time, recurrence FROM reminders WHERE id = ?", (reminder_id,)
+                ).fetchone()
+                if not row:
+                    continue
+                due_time, recurrence = row
+                next_due = next_occurrence(recurrence, due_time, now) if recurrence else None
+                if next_due is None:
+                    self.db.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+                else:
+                    self.db.execute(
+                        "UPDATE reminders SET due_time = ?, claimed = 0, retry_at = NULL WHERE id = ?",
+                        (next_due, reminder_id)
+                    )
+                completed += 1
+        return completed
+
+    def get_user_reminders(self, user_id: int) -> List[Reminder]:
+        """
+        Get all pending reminders for a specific user.
+
+        Args:
+            user_id: Discord user ID
+
+        Returns:
+            List of pending reminders for the user, soonest first
+        """
+        rows = self.db.execute(
+            f"SELECT {REMINDER_COLUMNS} FROM reminders WHERE user_id = ? ORDER BY due_time",
+            (user_id,)
+        ).fetchall()
+        return [_row_to_reminder(row) for row in rows]
+
+    def get_channel_reminders(self, channel_id: int) -> List[Reminder]:
+        """
+        Get all pending reminders for a specific channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            List of pending reminders for the channel, soonest first
+        """
+        rows = self.db.execute(
+            f"SELECT {REMINDER_COLUMNS} FROM reminders WHERE channel_id = ? ORDER BY due_time",
+            (channel_id,)
+        ).fetchall()
+        return [_row_to_reminder(row) for row in rows]
+
+    def find_user_reminders(self, user_id: int, id_prefix: str) -> List[Reminder]:
+        """
+        Find a user's reminders whose ID starts with a prefix.
+
+        Args:
+            user_id: Discord user ID (only this user's reminders are searched)
+            id_prefix: Full reminder ID or a leading part of it
+
+        Returns:
+            Matching reminders (more than one means the prefix is ambiguous)
+        """
+        rows = self.db.execute(
+            f"SELECT {REMINDER_COLUMNS} FROM reminders WHERE user_id = ? AND substr(id, 1, ?) = ?",
+            (user_id, len(id_prefix), id_prefix.lower())
+        ).fetchall()
+        return [_row_to_reminder(row) for row in rows]
+
+    def get_reminder_count(self) -> int:
+        """Get total number of pending reminders."""
+        return self.db.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
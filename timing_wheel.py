@@ -0,0 +1,151 @@
+"""Hierarchical timing wheel."""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LEVELS: Sequence[Tuple[int, int]] = ((1, 60), (60, 60), (3600, 24))
+"""(slot seconds, slot count) per level: 1s slots for a minute, 1m slots for an hour, 1h slots for a day."""
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel.
+
+    Each level has a fixed number of slots of a fixed width. A timer goes into
+    the finest level that can hold it and cascades down a level once its slot
+    starts, so insert and cancel are O(1) and advancing costs O(slots passed +
+    timers cascaded) no matter how many timers are scheduled. Slots are keyed
+    by absolute slot number (fire_time // slot width) rather than a rotating
+    cursor, so long gaps between advance() calls need no special handling.
+
+    Timers at or beyond horizon_end() are rejected; callers keep those
+    elsewhere and add them as the horizon approaches.
+    """
+
+    def __init__(self, now: float, levels: Sequence[Tuple[int, int]] = DEFAULT_LEVELS):
+        """
+        Initialize the wheel.
+
+        Args:
+            now: Current Unix timestamp
+            levels: (slot seconds, slot count) for each level, finest first
+        """
+        self.levels = tuple(levels)
+        self._slots: List[Dict[int, Dict[str, float]]] = [{} for _ in self.levels]
+        self._where: Dict[str, Tuple[int, int]] = {}  # timer_id -> (level, slot)
+        self._now = now
+        self._next: Optional[float] = None
+        self._next_valid = True
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, timer_id: str) -> bool:
+        return timer_id in self._where
+
+    def horizon_end(self, now: Optional[float] = None) -> float:
+        """
+        Get the first fire time the wheel cannot hold.
+
+        Args:
+            now: Time to compute the horizon for (defaults to the last advance)
+
+        Returns:
+            Unix timestamp at the end of the coarsest level's range
+        """
+        seconds, count = self.levels[-1]
+        return (math.floor((self._now if now is None else now) / seconds) + count) * seconds
+
+    def add(self, timer_id: str, fire_time: float) -> bool:
+        """
+        Schedule (or reschedule) a timer.
+
+        Args:
+            timer_id: Unique timer ID
+            fire_time: Unix timestamp to fire at
+
+        Returns:
+            False if fire_time is beyond the horizon (the timer is not added)
+        """
+        if fire_time >= self.horizon_end():
+            return False
+        self.remove(timer_id)
+        self._place(timer_id, fire_time)
+        if self._next_valid and (self._next is None or fire_time < self._next):
+            self._next = fire_time
+        return True
+
+    def _place(self, timer_id: str, fire_time: float) -> None:
+        """Put a timer in the finest level whose range covers it."""
+        for level, (seconds, count) in enumerate(self.levels):
+            slot = math.floor(fire_time / seconds)
+            if slot - math.floor(self._now / seconds) < count:
+                break
+        self._slots[level].setdefault(slot, {})[timer_id] = fire_time
+        self._where[timer_id] = (level, slot)
+
+    def remove(self, timer_id: str) -> bool:
+        """
+        Cancel a timer.
+
+        Args:
+            timer_id: Timer ID
+
+        Returns:
+            True if the timer was scheduled
+        """
+        where = self._where.pop(timer_id, None)
+        if where is None:
+            return False
+        level, slot = where
+        timers = self._slots[level][slot]
+        fire_time = timers.pop(timer_id)
+        if not timers:
+            del self._slots[level][slot]
+        if fire_time == self._next:
+            self._next_valid = False
+        return True
+
+    def advance(self, now: float) -> List[Tuple[float, str]]:
+        """
+        Move the wheel to the current time and collect expired timers.
+
+        Args:
+            now: Current Unix timestamp
+
+        Returns:
+            (fire_time, timer_id) for every timer due at or before now, earliest first
+        """
+        self._now = max(self._now, now)
+        expired = []
+        # Coarsest level first, so a timer can fall through several levels in one call
+        for level in range(len(self.levels) - 1, -1, -1):
+            seconds, _ = self.levels[level]
+            current = math.floor(self._now / seconds)
+            slots = self._slots[level]
+            for slot in [s for s in slots if s <= current]:
+                for timer_id, fire_time in slots.pop(slot).items():
+                    if fire_time <= now:
+                        del self._where[timer_id]
+                        expired.append((fire_time, timer_id))
+                    else:
+                        self._place(timer_id, fire_time)
+
+        if expired:
+            self._next_valid = False
+            expired.sort()
+        return expired
+
+    def next_fire_time(self) -> Optional[float]:
+        """
+        Get the earliest scheduled fire time.
+
+        Returns:
+            Unix timestamp of the earliest timer, or None if the wheel is empty
+        """
+        if not self._next_valid:
+            # Within a level the lowest-numbered slot holds that level's earliest timer
+            earliest = [min(slots[min(slots)].values()) for slots in self._slots if slots]
+            self._next = min(earliest) if earliest else None
+            self._next_valid = True
+        return self._next
@@ -2,41 +2,43 @@
 
 import tempfile
 import shutil
-import json
 import os
 import logging
-from typing import Any
+from typing import Any, Optional
+from serialization import Codec, default_codec
 
 logger = logging.getLogger(__name__)
 
 
-def atomic_json_save(data: Any, file_path: str) -> None:
+def atomic_save(data: Any, file_path: str, codec: Optional[Codec] = None) -> bool:
     """
-    Save JSON data atomically to prevent corruption.
+    Save data atomically to prevent corruption.
 
     This function writes to a temporary file first, then atomically moves it
     to the target location. This ensures the file is never partially written,
     preventing corruption if the process crashes during save.
 
     Args:
-        data: Data to serialize to JSON (dict, list, etc.)
+        data: Data to serialize (dict, list, etc.)
         file_path: Target file path
+        codec: Codec to encode with (defaults to the configured PERSISTENCE_CODEC)
 
-    Raises:
-        Exception: If save fails (logged but not raised)
+    Returns:
+        True if the file was saved, False if the save failed (error is logged)
     """
     try:
+        payload = (codec or default_codec()).dumps(data)
         dir_path = os.path.dirname(file_path) or '.'
 
         # Write to temp file in same directory
         with tempfile.NamedTemporaryFile(
-            mode='w',
+            mode='wb',
             dir=dir_path,
             delete=False,
             suffix='.tmp',
             prefix='.tmp_'
         ) as tmp:
-            json.dump(data, tmp, indent=2)
+            tmp.write(payload)
             tmp.flush()
             os.fsync(tmp.fileno())  # Ensure written to disk
             tmp_name = tmp.name
@@ -44,6 +46,7 @@ def atomic_json_save(data: Any, file_path: str) -> None:
         # Atomic move (replaces target file)
         shutil.move(tmp_name, file_path)
         logger.debug(f"Atomically saved {file_path}")
+        return True
 
     except Exception as e:
         logger.error(f"Failed to save {file_path}: {e}", exc_info=True)
@@ -53,3 +56,4 @@ def atomic_json_save(data: Any, file_path: str) -> None:
                 os.remove(tmp_name)
         except Exception:
             pass  # Best effort cleanup
+        return False
@@ -0,0 +1,225 @@
+"""Admission control and resource accounting for concurrent music streams."""
+
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from config import MUSIC_MAX_ACTIVE_STREAMS, MUSIC_MAX_WAITING_SESSIONS
+
+logger = logging.getLogger(__name__)
+
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):  # Not a POSIX system
+    CLOCK_TICKS = PAGE_SIZE = 0
+
+
+def _stat_cpu(path: str) -> Optional[float]:
+    """CPU seconds (user + system) from a /proc stat file, or None if unavailable."""
+    if not CLOCK_TICKS:
+        return None
+    try:
+        with open(path) as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name in parentheses may contain spaces; fields resume after it
+    fields = stat[stat.rfind(')') + 2:].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def read_process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """
+    Read a process's resource usage from /proc.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        (CPU seconds, resident bytes), or None if the process is gone or /proc is unavailable
+    """
+    cpu = _stat_cpu(f'/proc/{pid}/stat')
+    if cpu is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return cpu, resident_pages * PAGE_SIZE
+
+
+def read_thread_cpu(thread_id: int) -> Optional[float]:
+    """
+    Read the CPU time of one of this process's threads from /proc.
+
+    Args:
+        thread_id: Native thread ID (threading.get_native_id())
+
+    Returns:
+        CPU seconds, or None if the thread is gone or /proc is unavailable
+    """
+    return _stat_cpu(f'/proc/self/task/{thread_id}/stat')
+
+
+class SessionUsage:
+    """
+    Resources used by one guild's streaming session.
+
+    Each played track's FFmpeg child and player thread (which reads frames
+    and, for PCM sources, encodes them to Opus) are sampled when it stops
+    playing; the track playing right now is added by the caller from a live
+    sample.
+    """
+
+    __slots__ = ("guild_id", "started_at", "tracks", "ffmpeg_cpu", "player_cpu", "peak_rss")
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.started_at = time.monotonic()
+        self.tracks = 0
+        self.ffmpeg_cpu = 0.0
+        self.player_cpu = 0.0
+        self.peak_rss = 0
+
+    def add(self, ffmpeg_cpu: float, player_cpu: float, rss: int) -> None:
+        """Fold in a finished track's usage (called on the event loop when a track ends or the guild leaves voice)."""
+        self.tracks += 1
+        self.ffmpeg_cpu += ffmpeg_cpu
+        self.player_cpu += player_cpu
+        self.peak_rss = max(self.peak_rss, rss)
+
+
+class StreamAdmission:
+    """
+    Caps how many guilds stream at once.
+
+    A guild holds a slot from its first track until its queue runs dry or it
+    leaves voice, so sessions are never cut off mid-queue. Guilds past the
+    limit wait in line (first come, first served) up to max_waiting, and are
+    refused after that.
+    """
+
+    def __init__(self, max_active: int = MUSIC_MAX_ACTIVE_STREAMS, max_waiting: int = MUSIC_MAX_WAITING_SESSIONS):
+        """
+        Initialize admission control.
+
+        Args:
+            max_active: Maximum guilds streaming at once (0 for no limit)
+            max_waiting: Maximum guilds waiting for a slot
+        """
+        self.max_active = max_active
+        self.max_waiting = max_waiting
+        self.sessions: Dict[int, SessionUsage] = {}
+        self.waiting: deque = deque()
+
+        self.admitted = 0
+        self.queued = 0
+        self.refused = 0
+        self.peak_active = 0
+
+    def _has_room(self) -> bool:
+        return not self.max_active or len(self.sessions) < self.max_active
+
+    def _activate(self, guild_id: int) -> None:
+        self.sessions[guild_id] = SessionUsage(guild_id)
+        self.admitted += 1
+        self.peak_active = max(self.peak_active, len(self.sessions))
+
+    def accepts(self, guild_id: int) -> bool:
+        """
+        Check whether a guild can stream now or wait in line (counts refusals).
+
+        Args:
+            guild_id: Guild ID
+
+        Returns:
+            False if all slots are taken and the line is full
+        """
+        if guild_id in self.sessions or guild_id in self.waiting:
+            return True
+        if (self._has_room() and not self.waiting) or len(self.waiting) < self.max_waiting:
+            return True
+        self.refused += 1
+        return False
+
+    def admit(self, guild_id: int) -> bool:
+        """
+        Give a guild a streaming slot if one is free and nobody is waiting ahead of it.
+
+        Args:
+            guild_id: Guild ID
+
+        Returns:
+            True if the guild holds a slot (already or now)
+        """
+        if guild_id in self.sessions:
+            return True
+        if not self._has_room() or (self.waiting and self.waiting[0] != guild_id):
+            return False
+        if self.waiting:
+            self.waiting.popleft()
+        self._activate(guild_id)
+        return True
+
+    def wait(self, guild_id: int) -> int:
+        """
+        Put a guild in line for a slot (callers check accepts() first).
+
+        Args:
+            guild_id: Guild ID
+
+        Returns:
+            Its position in line (1 = next)
+        """
+        if guild_id in self.waiting:
+            return self.waiting.index(guild_id) + 1
+        self.waiting.append(guild_id)
+        self.queued += 1
+        return len(self.waiting)
+
+    def release(self, guild_id: int) -> List[int]:
+        """
+        Free a guild's slot (or drop it from the line) and admit whoever is waiting.
+
+        Args:
+            guild_id: Guild ID
+
+        Returns:
+            Guilds admitted as a result, which should start playing now
+        """
+        session = self.sessions.pop(guild_id, None)
+        if session:
+            logger.info(
+                f"Streaming session ended in guild {guild_id}: {session.tracks} track(s), "
+                f"ffmpeg {session.ffmpeg_cpu:.1f}s CPU, player {session.player_cpu:.1f}s CPU"
+            )
+        elif guild_id in self.waiting:
+            self.waiting.remove(guild_id)
+
+        admitted = []
+        while self.waiting and self._has_room():
+            next_guild = self.waiting.popleft()
+            self._activate(next_guild)
+            admitted.append(next_guild)
+        return admitted
+
+    def get_stats(self) -> dict:
+        """
+        Get admission statistics.
+
+        Returns:
+            Dict with active and waiting sessions, the limit, peak active, and
+            sessions admitted, made to wait and refused
+        """
+        return {
+            "active": len(self.sessions),
+            "waiting": len(self.waiting),
+            "max_active": self.max_active,
+            "peak_active": self.peak_active,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "refused": self.refused,
+        }
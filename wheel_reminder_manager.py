@@ -0,0 +1,464 @@
+"""Timing-wheel reminder scheduling with far-future reminders kept on disk."""
+
+import heapq
+import logging
+import math
+import os
+import re
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, List, Optional, Set
+from config import REMINDERS_FILE, REMINDER_WHEEL_COLD_DIR, REMINDER_WHEEL_COLD_BUCKET_SECONDS
+from reminder_manager import Reminder, ReminderManager
+from serialization import line_codec
+from timing_wheel import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+BUCKET_FILE_REGEX = re.compile(r'^(\d+)\.jsonl$')
+
+TOMBSTONE_KEY = "cancelled"
+"""Key of the line appended to a cold bucket when one of its reminders is cancelled."""
+
+MAX_OPEN_BUCKETS = 64
+"""Cold bucket files kept open for appending."""
+
+
+def _now() -> float:
+    return datetime.now(timezone.utc).timestamp()
+
+
+class WheelReminderManager(ReminderManager):
+    """
+    ReminderManager for very large numbers of mostly far-future reminders.
+
+    Only reminders inside the timing wheel's horizon (the next day) are held
+    in memory, scheduled on a hierarchical TimingWheel and saved to the
+    reminders file like ReminderManager does. Everything further out is
+    appended to a cold bucket file per REMINDER_WHEEL_COLD_BUCKET_SECONDS of
+    due time and is not resident. In memory, cold reminders cost only a
+    count per bucket and the set of buckets each user and channel has
+    reminders in. A bucket is promoted into the wheel in one read once its
+    whole time span is inside the horizon.
+
+    A cold reminder is found through the bucket of its due time, so
+    cancelling one needs that due time (as listed by get_user_reminders()).
+    The cancellation is appended to the bucket as a tombstone line, and
+    only applied when that bucket is read. Cold appends are flushed to the
+    OS on every add but only fsynced on promotion and close.
+    """
+
+    def __init__(
+        self,
+        reminders_file: str = REMINDERS_FILE,
+        cold_dir: str = REMINDER_WHEEL_COLD_DIR,
+        cold_bucket_seconds: int = REMINDER_WHEEL_COLD_BUCKET_SECONDS
+    ):
+        """
+        Initialize the reminder manager.
+
+        Args:
+            reminders_file: Path to the file for persisting near-term reminders
+            cold_dir: Directory for far-future reminder buckets
+            cold_bucket_seconds: Time span of each cold bucket
+        """
+        self.cold_dir = cold_dir
+        self.cold_bucket_seconds = cold_bucket_seconds
+        os.makedirs(cold_dir, exist_ok=True)
+
+        self.wheel = TimingWheel(_now())
+        self._cold_buckets: Dict[int, int] = {}  # bucket -> reminders in it, excluding cancelled
+        self._cold_heap: List[int] = []  # bucket numbers, may contain promoted ones
+        self._cold_by_user: Dict[int, Set[int]] = {}
+        self._cold_by_channel: Dict[int, Set[int]] = {}
+        self._cold_count = 0
+        self._handles: Dict[int, BinaryIO] = OrderedDict()
+        self.promotions = 0
+
+        super().__init__(reminders_file)
+
+    def load(self) -> None:
+        """Index the cold buckets, then load near-term reminders and rebuild the wheel."""
+        self._close_handles(fsync=False)
+        self._load_cold()
+        super().load()
+
+    def _bucket_path(self, bucket: int) -> str:
+        return os.path.join(self.cold_dir, f"{bucket}.jsonl")
+
+    def _read_bucket(self, bucket: int) -> List[Reminder]:
+        """Read the reminders in a cold bucket, leaving out cancelled ones."""
+        handle = self._handles.get(bucket)
+        if handle:
+            handle.flush()
+        codec = line_codec()
+        reminders = []
+        cancelled = set()
+        try:
+            with open(self._bucket_path(bucket), "rb") as f:
+                for line in f:
+                    try:
+                        data = codec.loads(line)
+                        if TOMBSTONE_KEY in data:
+                            cancelled.add(data[TOMBSTONE_KEY])
+                        else:
+                            reminders.append(Reminder.from_dict(data))
+                    except (ValueError, TypeError) as e:
+                        # A torn final line from a crash mid-append
+                        logger.warning(f"Skipping unreadable line in reminder bucket {bucket}: {e}")
+        except FileNotFoundError:
+            pass
+        return [r for r in reminders if r.id not in cancelled]
+
+    def _load_cold(self) -> None:
+        """Rebuild the in-memory cold bucket counts and indexes from disk."""
+        self._cold_buckets = {}
+        self._cold_by_user = {}
+        self._cold_by_channel = {}
+        self._cold_count = 0
+        for name in os.listdir(self.cold_dir):
+            m = BUCKET_FILE_REGEX.match(name)
+            if not m:
+                continue
+            bucket = int(m.group(1))
+            self._cold_buckets[bucket] = 0
+            for reminder in self._read_bucket(bucket):
+                self._index_cold(bucket, reminder)
+        self._cold_heap = list(self._cold_buckets)
+        heapq.heapify(self._cold_heap)
+
+        if self._cold_count:
+            logger.info(f"Indexed {self._cold_count} far-future reminders in {len(self._cold_buckets)} bucket(s)")
+
+    def _index_cold(self, bucket: int, reminder: Reminder) -> None:
+        """Count a cold reminder and record its bucket for its user and channel."""
+        self._cold_buckets[bucket] += 1
+        self._cold_by_user.setdefault(reminder.user_id, set()).add(bucket)
+        self._cold_by_channel.setdefault(reminder.channel_id, set()).add(bucket)
+        self._cold_count += 1
+
+    @staticmethod
+    def _unindex_cold(index: Dict[int, Set[int]], key: int, bucket: int) -> None:
+        """Forget that a user or channel has reminders in a cold bucket."""
+        buckets = index.get(key)
+        if buckets is not None:
+            buckets.discard(bucket)
+            if not buckets:
+                del index[key]
+
+    def _handle(self, bucket: int) -> BinaryIO:
+        """Get an append handle for a cold bucket, closing the least recently used."""
+        handle = self._handles.get(bucket)
+        if handle:
+            self._handles.move_to_end(bucket)
+            return handle
+        if len(self._handles) >= MAX_OPEN_BUCKETS:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        handle = self._handles[bucket] = open(self._bucket_path(bucket), "ab")
+        return handle
+
+    def _close_handles(self, fsync: bool) -> None:
+        """Close all cold bucket handles."""
+        for handle in self._handles.values():
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+            handle.close()
+        self._handles.clear()
+
+    def _append_cold(self, reminder: Reminder) -> None:
+        """Store a reminder in its cold bucket on disk."""
+        bucket = math.floor(reminder.due_time / self.cold_bucket_seconds)
+        handle = self._handle(bucket)
+        handle.write(line_codec().dumps(reminder.to_dict()) + b"\n")
+        handle.flush()
+
+        if bucket not in self._cold_buckets:
+            self._cold_buckets[bucket] = 0
+            earliest = self.next_due_time()
+            heapq.heappush(self._cold_heap, bucket)
+            if self.on_schedule_changed and self.next_due_time() != earliest:
+                self.on_schedule_changed()
+        self._index_cold(bucket, reminder)
+
+    def _promote(self) -> int:
+        """
+        Move cold buckets whose whole span is now inside the wheel's horizon into memory.
+
+        Returns:
+            Number of reminders promoted
+        """
+        horizon_end = self.wheel.horizon_end()
+        promoted = 0
+        while self._cold_heap and (self._cold_heap[0] + 1) * self.cold_bucket_seconds <= horizon_end:
+            bucket = heapq.heappop(self._cold_heap)
+            if bucket in self._cold_buckets:
+                promoted += self._promote_bucket(bucket)
+        return promoted
+
+    def _promote_bucket(self, bucket: int) -> int:
+        """Load one cold bucket into the wheel, then delete it from disk."""
+        handle = self._handles.pop(bucket, None)
+        if handle:
+            handle.close()
+
+        promoted = 0
+        for reminder in self._read_bucket(bucket):
+            self._unindex_cold(self._cold_by_user, reminder.user_id, bucket)
+            self._unindex_cold(self._cold_by_channel, reminder.channel_id, bucket)
+            # Already resident if we crashed between saving and deleting the bucket last time
+            if reminder.id not in self.reminders:
+                self.reminders[reminder.id] = reminder
+                self._index(reminder)
+                self._schedule(reminder.id, reminder.due_time)
+            promoted += 1
+
+        self._cold_count -= self._cold_buckets.pop(bucket)
+
+        # The reminders file must hold them before the bucket goes away
+        self.save().add_done_callback(lambda saved: self._remove_bucket(bucket, saved.result()))
+
+        self.promotions += 1
+        logger.info(f"Promoted {promoted} reminder(s) from bucket {bucket}")
+        return promoted
+
+    def _remove_bucket(self, bucket: int, saved: bool) -> None:
+        """Delete a promoted bucket's file once the reminders file holds its reminders (writer thread)."""
+        if not saved:
+            # Promoted again on the next start; reminders already resident are skipped
+            logger.warning(f"Keeping reminder bucket {bucket} on disk: saving its promoted reminders failed")
+            return
+        try:
+            os.remove(self._bucket_path(bucket))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Fsync and close cold buckets, then queue a final save."""
+        self._close_handles(fsync=True)
+        super().close()
+
+    def _rebuild_schedule(self) -> None:
+        """Rebuild the wheel from resident reminders, moving any beyond its horizon to cold buckets."""
+        self.wheel = TimingWheel(_now())
+        demoted = [r for r in self.reminders.values() if not self.wheel.add(r.id, r.due_time)]
+        for reminder in demoted:
+            del self.reminders[reminder.id]
+            self._unindex(reminder)
+            self._append_cold(reminder)
+        if demoted:
+            logger.info(f"Moved {len(demoted)} far-future reminder(s) to cold buckets")
+            self.save()
+        self._promote()
+
+    def _schedule(self, reminder_id: str, fire_time: float) -> None:
+        """Schedule (or reschedule) a resident reminder on the wheel."""
+        earliest = self.next_due_time()
+        if not self.wheel.add(reminder_id, fire_time):
+            # Only reachable if the clock jumped backwards; deliver it at the horizon instead
+            logger.warning(f"Reminder {reminder_id} is beyond the wheel horizon, clamping")
+            fire_time = self.wheel.horizon_end() - 1
+            self.wheel.add(reminder_id, fire_time)
+        if (earliest is None or fire_time < earliest) and self.on_schedule_changed:
+            self.on_schedule_changed()
+
+    def _unschedule(self, reminder_id: str) -> None:
+        self.wheel.remove(reminder_id)
+
+    def _next_promotion_time(self) -> Optional[float]:
+        """Time at which the earliest cold bucket falls entirely inside the horizon."""
+        if not self._cold_heap:
+            return None
+        seconds, count = self.wheel.levels[-1]
+        bucket_end = (self._cold_heap[0] + 1) * self.cold_bucket_seconds
+        return (math.ceil(bucket_end / seconds) - count) * seconds
+
+    def next_due_time(self) -> Optional[float]:
+        """
+        Get the time the scheduler next needs to run.
+
+        Returns:
+            Earliest of the next reminder and the next bucket promotion, or None if neither
+        """
+        times = [t for t in (self.wheel.next_fire_time(), self._next_promotion_time()) if t is not None]
+        return min(times) if times else None
+
+    def add_reminder(
+        self,
+        user_id: int,
+        channel_id: int,
+        message: str,
+        due_time: float,
+        recurrence: Optional[str] = None
+    ) -> Reminder:
+        """
+        Create and save a new reminder.
+
+        Args:
+            user_id: Discord user ID to mention
+            channel_id: Discord channel ID where to send reminder
+            message: Reminder message text
+            due_time: Unix timestamp when reminder is (first) due
+            recurrence: Recurrence rule spec for repeating reminders
+
+        Returns:
+            The created Reminder object
+        """
+        reminder = Reminder(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            channel_id=channel_id,
+            message=message,
+            due_time=due_time,
+            created_at=_now(),
+            recurrence=recurrence
+        )
+
+        if due_time < self.wheel.horizon_end():
+            self.reminders[reminder.id] = reminder
+            self._index(reminder)
+            self._schedule(reminder.id, due_time)
+            self.save()
+        else:
+            self._append_cold(reminder)
+
+        logger.info(f"Created reminder {reminder.id} for user {user_id} due at {due_time}")
+        return reminder
+
+    def get_due_reminders(self) -> List[Reminder]:
+        """
+        Claim all reminders that are due now, promoting cold buckets as the horizon moves.
+
+        Returns:
+            List of reminders whose due_time is <= current time
+        """
+        now = _now()
+        expired = self.wheel.advance(now)
+        if self._promote():
+            expired += self.wheel.advance(now)
+
+        due = [self.reminders[reminder_id] for _, reminder_id in expired]
+        if due:
+            logger.debug(f"Found {len(due)} due reminders")
+        return due
+
+    def _cancel_cold(self, reminder_id: str, due_time: float) -> bool:
+        """Append a tombstone to the cold bucket of a due time if the reminder is in it."""
+        bucket = math.floor(due_time / self.cold_bucket_seconds)
+        if not self._cold_buckets.get(bucket):
+            return False
+        reminders = self._read_bucket(bucket)
+        reminder = next((r for r in reminders if r.id == reminder_id), None)
+        if not reminder:
+            return False
+
+        handle = self._handle(bucket)
+        handle.write(line_codec().dumps({TOMBSTONE_KEY: reminder_id}) + b"\n")
+        handle.flush()
+        self._cold_buckets[bucket] -= 1
+        self._cold_count -= 1
+
+        others = [r for r in reminders if r is not reminder]
+        if not any(r.user_id == reminder.user_id for r in others):
+            self._unindex_cold(self._cold_by_user, reminder.user_id, bucket)
+        if not any(r.channel_id == reminder.channel_id for r in others):
+            self._unindex_cold(self._cold_by_channel, reminder.channel_id, bucket)
+        return True
+
+    def _reschedule(self, reminder: Reminder, due_time: float) -> None:
+        """Move a resident reminder to its next occurrence, out to a cold bucket if beyond the horizon."""
+        if due_time < self.wheel.horizon_end():
+            super()._reschedule(reminder, due_time)
+            return
+        super()._discard(reminder.id)
+        reminder.due_time = due_time
+        self._append_cold(reminder)
+
+    def remove_reminder(self, reminder_id: str, due_time: Optional[float] = None) -> None:
+        """
+        Remove a reminder by ID.
+
+        Cold reminders are looked up in the bucket of their due time, so
+        without due_time only resident ones can be removed.
+
+        Args:
+            reminder_id: The reminder ID to remove
+            due_time: The reminder's due time
+        """
+        if reminder_id in self.reminders:
+            super().remove_reminder(reminder_id)
+        elif due_time is not None and self._cancel_cold(reminder_id, due_time):
+            # Cold: the tombstone went to its bucket, the reminders file is untouched
+            logger.debug(f"Cancelled cold reminder {reminder_id}")
+        else:
+            logger.warning(f"Reminder {reminder_id} not found for removal")
+
+    def _cold_reminders(self, buckets: Set[int], keep) -> List[Reminder]:
+        """Read matching, non-cancelled reminders from the given cold buckets."""
+        return [r for bucket in sorted(buckets) for r in self._read_bucket(bucket) if keep(r)]
+
+    def get_user_reminders(self, user_id: int) -> List[Reminder]:
+        """
+        Get all pending reminders for a specific user.
+
+        Only the cold buckets this user has reminders in are read.
+
+        Args:
+            user_id: Discord user ID
+
+        Returns:
+            List of pending reminders for the user, soonest first
+        """
+        cold = self._cold_reminders(self._cold_by_user.get(user_id, set()), lambda r: r.user_id == user_id)
+        return super().get_user_reminders(user_id) + sorted(cold, key=lambda r: r.due_time)
+
+    def get_channel_reminders(self, channel_id: int) -> List[Reminder]:
+        """
+        Get all pending reminders for a specific channel.
+
+        Only the cold buckets this channel has reminders in are read.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            List of pending reminders for the channel, soonest first
+        """
+        cold = self._cold_reminders(
+            self._cold_by_channel.get(channel_id, set()), lambda r: r.channel_id == channel_id
+        )
+        return super().get_channel_reminders(channel_id) + sorted(cold, key=lambda r: r.due_time)
+
+    def find_user_reminders(self, user_id: int, id_prefix: str) -> List[Reminder]:
+        """
+        Find a user's reminders whose ID starts with a prefix.
+
+        Args:
+            user_id: Discord user ID (only this user's reminders are searched)
+            id_prefix: Full reminder ID or a leading part of it
+
+        Returns:
+            Matching reminders (more than one means the prefix is ambiguous)
+        """
+        id_prefix = id_prefix.lower()
+        return [r for r in self.get_user_reminders(user_id) if r.id.startswith(id_prefix)]
+
+    def get_reminder_count(self) -> int:
+        """Get total number of pending reminders, resident and cold."""
+        return len(self.reminders) + self._cold_count
+
+    def get_stats(self) -> dict:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dict with resident, cold, cold bucket and promotion counts
+        """
+        return {
+            "resident": len(self.reminders),
+            "cold": self._cold_count,
+            "cold_buckets": len(self._cold_buckets),
+            "promotions": self.promotions,
+        }
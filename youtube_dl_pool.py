@@ -0,0 +1,146 @@
+"""Pool of long-lived, pre-initialized YoutubeDL instances."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+import yt_dlp
+from config import EXTRACTION_YDL_MAX_USES, EXTRACTION_YDL_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+WARM_EXTRACTORS = ('Youtube', 'YoutubeSearch', 'YoutubeTab', 'Generic')
+"""Extractors instantiated up front so the first lookup doesn't pay for them."""
+
+
+class _PooledInstance:
+    """A YoutubeDL instance plus what recycling is decided on."""
+
+    __slots__ = ("ydl", "created_at", "uses")
+
+    def __init__(self, ydl: yt_dlp.YoutubeDL):
+        self.ydl = ydl
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class YoutubeDLPool:
+    """
+    Reusable YoutubeDL instances sharing one set of options.
+
+    Constructing a YoutubeDL parses options, sets up extractors and opens a
+    fresh HTTP session, which costs more than many extractions themselves.
+    Instances here are reused instead, one caller at a time, so extractor
+    state and keep-alive connections carry over. The pool grows to the
+    number of concurrent callers and no further. An instance is closed and
+    replaced after max_uses extractions or max_age seconds, which bounds
+    memory growth from the caches yt-dlp keeps per instance.
+    """
+
+    def __init__(
+        self,
+        options: Dict[str, Any],
+        max_uses: int = EXTRACTION_YDL_MAX_USES,
+        max_age: float = EXTRACTION_YDL_MAX_AGE_SECONDS
+    ):
+        """
+        Initialize the pool (instances are created on demand or by warm()).
+
+        Args:
+            options: yt-dlp options for every instance
+            max_uses: Extractions before an instance is replaced
+            max_age: Seconds before an instance is replaced
+        """
+        self.options = dict(options)
+        self.max_uses = max(1, max_uses)
+        self.max_age = max_age
+        self._idle: List[_PooledInstance] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def _create(self) -> _PooledInstance:
+        """Construct an instance with its common extractors already set up."""
+        ydl = yt_dlp.YoutubeDL(self.options)
+        for name in WARM_EXTRACTORS:
+            try:
+                ydl.get_info_extractor(name)
+            except Exception as e:
+                logger.debug(f"Couldn't pre-initialize extractor {name}: {e}")
+        with self._lock:
+            self.created += 1
+        return _PooledInstance(ydl)
+
+    def warm(self, count: int) -> None:
+        """
+        Create instances ahead of the first lookups (blocking; run off the event loop).
+
+        Args:
+            count: Number of idle instances to have ready
+        """
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= count:
+                    return
+            instance = self._create()
+            with self._lock:
+                self._idle.append(instance)
+
+    @contextmanager
+    def acquire(self) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Borrow an instance for one extraction.
+
+        Yields:
+            A YoutubeDL instance no other caller is using
+        """
+        with self._lock:
+            instance = self._idle.pop() if self._idle else None
+            if instance:
+                self.reused += 1
+        if instance is None:
+            instance = self._create()
+
+        try:
+            yield instance.ydl
+        finally:
+            instance.uses += 1
+            expired = (
+                instance.uses >= self.max_uses
+                or time.monotonic() - instance.created_at >= self.max_age
+            )
+            with self._lock:
+                keep = not expired and not self._closed
+                if keep:
+                    self._idle.append(instance)
+                elif expired:
+                    self.recycled += 1
+            if not keep:
+                instance.ydl.close()
+
+    def close(self) -> None:
+        """Close idle instances; borrowed ones are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for instance in idle:
+            instance.ydl.close()
+
+    def get_stats(self) -> dict:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict with idle instances and counts of instances created, reuses and recycled instances
+        """
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "recycled": self.recycled,
+            }